@@ -206,6 +206,9 @@ class Ui_MainWindow(object):
         self.verticalLayout.addWidget(self.damaged_info_group)
         self.save_button_layout = QtWidgets.QHBoxLayout()
         self.save_button_layout.setObjectName("save_button_layout")
+        self.queue_label = QtWidgets.QLabel(self.centralwidget)
+        self.queue_label.setObjectName("queue_label")
+        self.save_button_layout.addWidget(self.queue_label)
         self.save_button = QtWidgets.QPushButton(self.centralwidget)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
@@ -243,6 +246,8 @@ class Ui_MainWindow(object):
         self.actionOpenFile.setObjectName("actionOpenFile")
         self.actionExitApp = QtWidgets.QAction(MainWindow)
         self.actionExitApp.setObjectName("actionExitApp")
+        self.actionReportPdf = QtWidgets.QAction(MainWindow)
+        self.actionReportPdf.setObjectName("actionReportPdf")
         self.actionOpenDatabase = QtWidgets.QAction(MainWindow)
         self.actionOpenDatabase.setObjectName("actionOpenDatabase")
         self.actionExportData = QtWidgets.QAction(MainWindow)
@@ -256,6 +261,7 @@ class Ui_MainWindow(object):
         self.actionInstructions = QtWidgets.QAction(MainWindow)
         self.actionInstructions.setObjectName("actionInstructions")
         self.file_menu.addAction(self.actionOpenFile)
+        self.file_menu.addAction(self.actionReportPdf)
         self.file_menu.addAction(self.actionExitApp)
         self.database_menu.addAction(self.actionOpenDatabase)
         self.database_menu.addAction(self.actionExportData)
@@ -300,6 +306,7 @@ class Ui_MainWindow(object):
         self.grade_label.setText(_translate("MainWindow", "Grade: "))
         self.stain_label.setText(_translate("MainWindow", "Stain: "))
         self.stratch_label.setText(_translate("MainWindow", "Scratches: "))
+        self.queue_label.setText(_translate("MainWindow", "Queue: empty"))
         self.save_button.setText(_translate("MainWindow", "Save"))
         self.clear_button.setText(_translate("MainWindow", "Clear"))
         self.file_menu.setTitle(_translate("MainWindow", "File"))
@@ -308,6 +315,7 @@ class Ui_MainWindow(object):
         self.help_menu.setTitle(_translate("MainWindow", "Help"))
         self.actionOpenFile.setText(_translate("MainWindow", "Open"))
         self.actionExitApp.setText(_translate("MainWindow", "Exit"))
+        self.actionReportPdf.setText(_translate("MainWindow", "Report as PDF"))
         self.actionOpenDatabase.setText(_translate("MainWindow", "Open"))
         self.actionExportData.setText(_translate("MainWindow", "Export"))
         self.actionProfile.setText(_translate("MainWindow", "Profile"))
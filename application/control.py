@@ -11,7 +11,7 @@ Classes:
 Functions:
 - get_app(): Retrieves the current QApplication instance.
 - init_models(): Loads machine learning models for detection tasks.
-- check_dataset(): Ensures the dataset directory and file structure exist.
+- check_dataset(): Ensures the dataset directory and the inspection store exist.
 
 Author: Kun
 Last Modified: 18 Nov 2024
@@ -24,13 +24,17 @@ _APP_DIR = os.path.dirname(os.path.abspath(__file__))
 from widgets.video_window import VideoBase
 from widgets.panel import PanelBase
 from widgets.menubar import BarBase
+from widgets.debug_viewer import DebugViewer
+from interfaces.debug_sink import get_debug_sink, QtDebugSink
+from interfaces.executors import shutdown_executors
+from interfaces.inspection_store import InspectionStore, close_inspection_store
+from interfaces.settings import get_settings
 from PyQt5.QtWidgets import QApplication, QMainWindow
 from PyQt5.QtCore import QCoreApplication, QObject, pyqtSlot
 from UI.UI import Ui_MainWindow
 import sys
 from ultralytics import YOLO
 from typing import Optional
-import csv
 
 
 def get_app() -> Optional[QCoreApplication]:
@@ -92,18 +96,16 @@ def init_models():
 
 def check_dataset():
     """
-    Ensure that the dataset directory and CSV file exist. Create them if they do not.
+    Ensure that the dataset directory and the inspection store exist. Create them if they do not.
     """
     root_path = os.path.abspath(os.path.join(_APP_DIR, '..'))
     dataset_dir_path = os.path.join(root_path, 'dataset')
     if not os.path.exists(dataset_dir_path):
         os.makedirs(dataset_dir_path)
-        dataset_file = os.path.join(dataset_dir_path, 'dataset.csv')
-        fieldnames = ['model', 'serial number', 'lot number', 'grade', 'stain', 'scratch']
-        # Create and initialize the CSV file with headers
-        with open(dataset_file, 'a', newline='', encoding='utf-8') as dataset:
-            writer = csv.DictWriter(dataset, fieldnames=fieldnames)
-            writer.writeheader()
+    # the schema of the store is created on opening, at the path of the settings, see interfaces.inspection_store
+    store_path = os.path.join(root_path, get_settings()['inspection_store']['path'])
+    if not os.path.exists(store_path):
+        InspectionStore(store_path).close()
 
 
 class Controller(QObject):
@@ -122,6 +124,7 @@ class Controller(QObject):
         panel_widget (PanelBase): Panel widget instance.
         actionDict (dict): Dictionary of menu actions.
         menuBar (BarBase): Custom menu bar instance.
+        debug_viewer (DebugViewer): Viewer of the debug images, only created in 'qt' debug mode.
     """
     def __init__(self, UI):
         super().__init__()
@@ -143,6 +146,8 @@ class Controller(QObject):
 
         self.models = init_models()
         self.init_video_base()
+        self.debug_viewer = None
+        self.init_debug_sink()
 
         self.handle_signal()
 
@@ -160,6 +165,9 @@ class Controller(QObject):
         #     actionExitApp.setParent(self.ui.main_window)
         self.actionDict['exitApp'] = actionExitApp
 
+        actionReportPdf = getattr(self.ui, 'actionReportPdf')
+        self.actionDict['reportPdf'] = actionReportPdf
+
         actionOpenDatabase = getattr(self.ui, 'actionOpenDatabase')
         self.actionDict['openDatabase'] = actionOpenDatabase
 
@@ -196,6 +204,25 @@ class Controller(QObject):
 
         self.video_widget = VideoBase(thread_labels=self.thread_labels,
                                       buttons=self.video_buttons, models=self.models)
+        self.video_widget.start_camera_monitor()
+        if get_app() is not None:
+            get_app().aboutToQuit.connect(self.video_widget.camera_discovery.stop)
+            get_app().aboutToQuit.connect(self.video_widget.release_cameras)
+            get_app().aboutToQuit.connect(self.video_widget.inspection_queue.stop)
+            get_app().aboutToQuit.connect(self.video_widget.async_runner.stop)
+            get_app().aboutToQuit.connect(shutdown_executors)
+            get_app().aboutToQuit.connect(close_inspection_store)
+
+    def init_debug_sink(self):
+        """
+        Set up the sink receiving the intermediate images of the detection pipeline.
+        """
+        sink = get_debug_sink()
+        if isinstance(sink, QtDebugSink):
+            self.debug_viewer = DebugViewer()
+            sink.image_recorded.connect(self.debug_viewer.show_image)
+        if get_app() is not None:
+            get_app().aboutToQuit.connect(sink.close)
 
     @pyqtSlot(list)
     def init_panel_base(self, input_lines):
@@ -217,9 +244,10 @@ class Controller(QObject):
         clear_button = getattr(self.ui, 'clear_button')
         self.panel_buttons['clear_button'] = clear_button
 
-        self.panel_widget = PanelBase(self.input_lines, self.panel_buttons)
+        self.panel_widget = PanelBase(self.input_lines, self.panel_buttons, queue_label=getattr(self.ui, 'queue_label'))
         # Connect detected features from video widget to the panel
         self.video_widget.laptop_info.connect(self.panel_widget.set_detected_features)
+        self.video_widget.queue_changed.connect(self.panel_widget.set_queue_status)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,95 @@
+"""
+Benchmark of GUI responsiveness with all cameras active during inference: camera threads in the application process
+versus camera processes writing into shared-memory rings.
+
+The cameras are synthetic sources decoding a JPEG per frame like MJPG cameras (``--backend auto`` measures the real
+devices). While a background thread simulates inference holding the GIL, a 60 Hz Qt timer in the GUI thread records
+how late it fires and the age of the newest frame of every camera.
+
+Usage:
+    python -m benchmarks.bench_camera_process --cameras 6 --seconds 10 --resolution 1920x1080
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import argparse
+import threading
+import time
+
+from PyQt5.QtCore import QCoreApplication, QTimer
+
+from interfaces.settings import get_settings
+from widgets.camera_sessions import CameraSessionManager
+from benchmarks.utils import print_summary
+
+
+def simulated_inference(stop):
+    """Pure Python work holding the GIL, like the pre/post-processing of the detection."""
+    while not stop.is_set():
+        sum(i * i for i in range(20000))
+
+
+def run(app, ports, seconds):
+    manager = CameraSessionManager()
+    threads = [manager.acquire(port)[0] for port in ports]
+    deadline = time.monotonic() + 30.0
+    # the frame buffer of a thread is replaced by the shared ring once its camera process is started
+    while any(thread.frame_buffer.latest() is None for thread in threads) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    stop = threading.Event()
+    inference = threading.Thread(target=simulated_inference, args=(stop,), daemon=True)
+    inference.start()
+
+    lateness, ages = [], []
+    period = 1 / 60
+    expected = [time.monotonic() + period]
+
+    def tick():
+        now = time.monotonic()
+        lateness.append(max(0.0, now - expected[0]) * 1000)
+        expected[0] = now + period
+        for thread in threads:
+            frame = thread.frame_buffer.latest()
+            if frame is not None:
+                ages.append((now - frame.timestamp) * 1000)
+
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(int(period * 1000))
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec_()
+    timer.stop()
+
+    stop.set()
+    inference.join()
+    manager.release_all()
+    return lateness, ages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cameras', type=int, default=6)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--backend', default='synthetic')
+    parser.add_argument('--resolution', default='1920x1080')
+    parser.add_argument('--fps', type=int, default=30)
+    args = parser.parse_args()
+
+    app = QCoreApplication([])
+    width, height = map(int, args.resolution.split('x'))
+    default = get_settings()['cameras']['default']
+    default.update(backend=args.backend, width=width, height=height, fps=args.fps, mjpeg=True,
+                   max_resolution=[width, height])
+    get_settings()['preview']['max_fps'] = 0
+    ports = list(range(1, args.cameras + 1))
+
+    for name, process in (('threads', False), ('processes', True)):
+        default['process'] = process
+        lateness, ages = run(app, ports, args.seconds)
+        print_summary(f'{name}: GUI timer lateness', lateness)
+        print_summary(f'{name}: age of newest frame', ages)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark of the start/stop latency of the camera threads (tearing the devices down on stop versus parking the
+camera sessions and resuming them) and of the still capture latency with a preview/still profile switch.
+
+Start latency is measured from the start request until every camera has delivered a new frame. By default the
+cameras are synthetic sources with an ``open_delay`` mimicking the format negotiation of a real device, so the
+benchmark runs on machines without cameras; pass ``--backend auto`` to measure the real devices.
+
+Usage:
+    python -m benchmarks.bench_cameras --cameras 6 --cycles 10 --open-delay 0.3 --switch-delay 0.1
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import argparse
+import time
+
+from interfaces.settings import get_settings
+from widgets.camera_sessions import CameraSessionManager
+from benchmarks.utils import timed, print_summary
+
+
+def wait_first_frames(threads, since, timeout=10.0):
+    for thread in threads:
+        if thread.frame_buffer.wait_newer(since, timeout) is None:
+            raise RuntimeError(f'Camera {thread.camera_port} delivered no frame')
+
+
+def start(manager, ports):
+    since = time.monotonic()
+    threads = [manager.acquire(port)[0] for port in ports]
+    wait_first_frames(threads, since)
+
+
+def bench(ports, cycles, park):
+    manager = CameraSessionManager()
+    if park:  # the first start always opens the devices
+        start(manager, ports)
+        manager.park_all()
+    start_samples, stop_samples = [], []
+    for _ in range(cycles):
+        start_samples.append(timed(start, manager, ports)[1])
+        stop = manager.park_all if park else manager.release_all
+        stop_samples.append(timed(stop)[1])
+    manager.release_all()
+    return start_samples, stop_samples
+
+
+def bench_still(ports, cycles):
+    manager = CameraSessionManager()
+    start(manager, ports)
+    samples = []
+    for _ in range(cycles):
+        threads = list(manager.sessions.values())
+        _, ms = timed(lambda: [future.result(10.0) for future in [thread.request_still() for thread in threads]])
+        samples.append(ms)
+    switch_ms = [thread.last_switch_ms for thread in manager.sessions.values()]
+    manager.release_all()
+    return samples, switch_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cameras', type=int, default=6)
+    parser.add_argument('--cycles', type=int, default=10)
+    parser.add_argument('--backend', default='synthetic')
+    parser.add_argument('--open-delay', type=float, default=0.3)
+    parser.add_argument('--switch-delay', type=float, default=0.1)
+    parser.add_argument('--preview', default='640x360', help='preview profile WIDTHxHEIGHT')
+    parser.add_argument('--still', default='1920x1080', help='still profile WIDTHxHEIGHT')
+    args = parser.parse_args()
+
+    default = get_settings()['cameras']['default']
+    default.update(backend=args.backend, open_delay=args.open_delay, switch_delay=args.switch_delay)
+    get_settings()['preview']['max_fps'] = 0
+    ports = list(range(1, args.cameras + 1))
+
+    for name, park in (('release', False), ('park', True)):
+        start_samples, stop_samples = bench(ports, args.cycles, park)
+        print_summary(f'{name}: start {len(ports)} cameras', start_samples)
+        print_summary(f'{name}: stop {len(ports)} cameras', stop_samples)
+
+    to_profile = lambda size: dict(zip(('width', 'height'), map(int, size.split('x'))))
+    default['profiles'] = {'preview': to_profile(args.preview), 'still': to_profile(args.still)}
+    samples, switch_ms = bench_still(ports, args.cycles)
+    print_summary(f'still of {len(ports)} cameras (parallel)', samples)
+    print_summary('profile switch per camera', switch_ms)
+
+
+if __name__ == '__main__':
+    main()
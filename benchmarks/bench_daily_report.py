@@ -0,0 +1,86 @@
+"""
+Benchmark of the daily report over months of synthetic inspections: time to stream and aggregate the inspection log
+and peak memory of the aggregation, compared with loading every record in memory first.
+
+Usage:
+    python -m benchmarks.bench_daily_report --days 90 --per-day 2000 --chunk-size 10000
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import argparse
+import json
+import os
+import tempfile
+import tracemalloc
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+
+from interfaces.daily_report import aggregate, write_html
+from interfaces.inspection_log import IDENTIFICATION_FIELDS, InspectionLog
+from benchmarks.utils import timed
+
+STAGES = ('identify_top', 'identify_serial', 'segment')
+CLASSES = ('scratch', 'stain', 'dent')
+
+
+def synthetic_log(path, start, days, per_day):
+    """Write the records of per_day inspections a day, as InspectionLog.append() does."""
+    rng = np.random.default_rng(0)
+    with open(path, 'w', encoding='utf-8') as f:
+        for offset in range(days):
+            day = datetime.combine(start + timedelta(days=offset), time(8))
+            durations = rng.lognormal(7, 0.4, (per_day, len(STAGES)))
+            defects = rng.poisson(3, (per_day, len(CLASSES)))
+            for i in range(per_day):
+                f.write(json.dumps({
+                    'time': (day + timedelta(seconds=10 * i)).isoformat(timespec='seconds'), 'job': i,
+                    'model': 'Apple', 'lot': f'LOT{i}', 'serial': f'SERIAL{i}',
+                    'grade': 'C' if defects[i, 0] > 6 else 'A',
+                    'defects': {cls: int(n) for cls, n in zip(CLASSES, defects[i]) if n},
+                    'ocr_failed': [field for field in IDENTIFICATION_FIELDS if rng.random() < 0.05],
+                    'stage_ms': {stage: round(float(ms), 1) for stage, ms in zip(STAGES, durations[i])},
+                    'mode': 'full'}) + '\n')
+    return InspectionLog(path)
+
+
+def measured(fn, *args):
+    tracemalloc.start()
+    result, ms = timed(fn, *args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, ms, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--per-day', type=int, default=2000)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    start = date(2026, 1, 1)
+    end = start + timedelta(days=args.days - 1)
+    with tempfile.TemporaryDirectory() as directory:
+        log, ms = timed(synthetic_log, os.path.join(directory, 'inspections.jsonl'), start, args.days, args.per_day)
+        print(f'log of {args.days * args.per_day} inspections: {os.path.getsize(log.path) / 1e6:.1f} MB '
+              f'written in {ms / 1000:.1f}s')
+
+        summary, ms, peak = measured(lambda: aggregate(log.iter_records(), start, end, args.chunk_size))
+        print(f'streamed, chunks of {args.chunk_size}: {ms / 1000:.2f}s, peak memory {peak / 1e6:.1f} MB')
+        summary, ms, peak = measured(lambda: aggregate(list(log.iter_records()), start, end,
+                                                       args.days * args.per_day))
+        print(f'loaded in memory first:   {ms / 1000:.2f}s, peak memory {peak / 1e6:.1f} MB')
+
+        middle = (start + timedelta(days=args.days // 2)).isoformat()
+        summary, ms, peak = measured(lambda: aggregate(log.iter_records(middle, end.isoformat()),
+                                                       date.fromisoformat(middle), end, args.chunk_size))
+        print(f'second half of the range:  {ms / 1000:.2f}s, {int(summary.inspections.sum())} inspections')
+
+        _, ms = timed(write_html, summary, os.path.join(directory, 'daily.html'))
+        print(f'html summary written in {ms:.0f}ms')
+
+
+if __name__ == '__main__':
+    main()
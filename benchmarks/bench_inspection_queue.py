@@ -0,0 +1,68 @@
+"""
+Benchmark of the station throughput with and without the inspection queue.
+
+A simulated operator places a laptop, captures it and, with the queue, swaps to the next laptop as soon as the
+capture has been queued; without it, they wait for the detection and the report first. Stage durations are
+simulated with sleeps (seconds, scaled by ``--scale`` to keep the run short) and the result is extrapolated to
+laptops per hour at full scale.
+
+Usage:
+    python -m benchmarks.bench_inspection_queue --laptops 20 --swap 8 --capture 0.5 --process 12 --scale 0.01
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import argparse
+import time
+
+from interfaces.inspection_queue import InspectionJob, InspectionQueue
+from benchmarks.utils import print_summary
+
+
+def run(laptops, swap, capture, process, max_depth, workers, queued):
+    """
+    Returns:
+        tuple: (float, list[float]) total time in seconds and the waiting time of the operator before each capture,
+        in milliseconds.
+    """
+    waits = []
+    jobs = InspectionQueue(lambda job: time.sleep(process), max_depth=max_depth, workers=workers)
+    start = time.perf_counter()
+    for _ in range(laptops):
+        time.sleep(swap)
+        time.sleep(capture)
+        job = InspectionJob([])
+        if queued:
+            wait_start = time.perf_counter()
+            jobs.submit(job, timeout=3600)
+            waits.append((time.perf_counter() - wait_start) * 1000)
+        else:
+            time.sleep(process)
+            waits.append(process * 1000)
+    jobs.join()
+    total = time.perf_counter() - start
+    jobs.stop()
+    return total, waits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--laptops', type=int, default=20)
+    parser.add_argument('--swap', type=float, default=8.0, help='seconds to remove a laptop and place the next one')
+    parser.add_argument('--capture', type=float, default=0.5)
+    parser.add_argument('--process', type=float, default=12.0, help='seconds of detection, report and saving')
+    parser.add_argument('--max-depth', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--scale', type=float, default=0.01, help='factor applied to every duration')
+    args = parser.parse_args()
+
+    swap, capture, process = (value * args.scale for value in (args.swap, args.capture, args.process))
+    for name, queued in (('queue off', False), ('queue on', True)):
+        total, waits = run(args.laptops, swap, capture, process, args.max_depth, args.workers, queued)
+        per_hour = args.laptops / (total / args.scale) * 3600
+        print(f'{name}: {per_hour:.0f} laptops/hour ({args.laptops} laptops in {total / args.scale:.0f}s)')
+        print_summary(f'{name}: operator wait after capture', [wait / args.scale for wait in waits])
+
+
+if __name__ == '__main__':
+    main()
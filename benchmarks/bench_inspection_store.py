@@ -0,0 +1,97 @@
+"""
+Benchmark of the inspection store against the legacy dataset.csv: latency of a save (open, getsize and append of the
+CSV file per laptop, queued add() of the store) and of the lookups by serial, lot and day over a dataset of synthetic
+laptops (full scan of the CSV file, indexed query of the store).
+
+Usage:
+    python -m benchmarks.bench_inspection_store --laptops 300000 --saves 1000 --lookups 200
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from interfaces.inspection_store import CSV_COLUMNS, InspectionStore
+from benchmarks.utils import print_summary, timed
+
+
+def synthetic_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    grades = rng.choice(['A', 'C'], n, p=[0.8, 0.2])
+    models = rng.choice(['Apple', 'Dell', 'HP', 'Lenovo'], n)
+    for i in range(n):
+        yield {'model': models[i], 'serial number': f'SERIAL{i:08d}', 'lot number': f'LOT{i // 50:06d}',
+               'grade': grades[i], 'stain': int(rng.integers(0, 15)), 'scratch': int(rng.integers(0, 15))}
+
+
+def legacy_save(path, row):
+    """Save of the original PanelBase.save_to_dataset."""
+    with open(path, 'a', newline='', encoding='utf-8') as dataset:
+        writer = csv.DictWriter(dataset, fieldnames=list(CSV_COLUMNS))
+        if os.path.getsize(filename=path) == 0:
+            writer.writeheader()
+        writer.writerow(row)
+
+
+def legacy_lookup(path, column, value):
+    with open(path, 'r', newline='', encoding='utf-8') as dataset:
+        return [row for row in csv.DictReader(dataset) if row[column] == value]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--laptops', type=int, default=300000)
+    parser.add_argument('--saves', type=int, default=1000)
+    parser.add_argument('--lookups', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'dataset.csv')
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(CSV_COLUMNS))
+            writer.writeheader()
+            writer.writerows(synthetic_rows(args.laptops))
+        print(f'dataset of {args.laptops} laptops: {os.path.getsize(csv_path) / 1e6:.1f} MB')
+
+        store = InspectionStore(os.path.join(directory, 'inspections.db'))
+        _, ms = timed(store.import_csv, csv_path)
+        print(f'imported into the store in {ms / 1000:.2f}s')
+
+        rows = list(synthetic_rows(args.saves, seed=3))
+        print_summary('save: legacy CSV append', [timed(legacy_save, csv_path, row)[1] for row in rows])
+        laptops = [{'model': r['model'], 'serial': r['serial number'], 'lot': r['lot number'], 'grade': r['grade'],
+                    'stain': r['stain'], 'scratch': r['scratch']} for r in rows]
+        images = [('report', os.path.join(directory, 'LOT.pdf'))]
+        defects = [('top', 'scratch', (10, 20, 300, 400))] * 3
+        print_summary('save: store add (queued)', [timed(store.add, laptop, images, defects)[1]
+                                                   for laptop in laptops])
+        start = time.perf_counter()
+        store.flush()
+        print(f'store: {args.saves} laptops committed {(time.perf_counter() - start) * 1000:.1f}ms after the last add')
+
+        serials = [f'SERIAL{i:08d}' for i in rng.integers(0, args.laptops - 1, args.lookups)]
+        lots = [f'LOT{i // 50:06d}' for i in rng.integers(0, args.laptops - 1, args.lookups)]
+        legacy_runs = max(1, args.lookups // 50)  # a scan takes seconds on large datasets
+        print_summary('serial: legacy CSV scan', [timed(legacy_lookup, csv_path, 'serial number', serial)[1]
+                                                  for serial in serials[:legacy_runs]])
+        print_summary('serial: store', [timed(store.find, serial=serial)[1] for serial in serials])
+        print_summary('lot: legacy CSV scan', [timed(legacy_lookup, csv_path, 'lot number', lot)[1]
+                                               for lot in lots[:legacy_runs]])
+        print_summary('lot: store', [timed(store.find, lot=lot)[1] for lot in lots])
+        today = time.strftime('%Y-%m-%d')
+        print_summary('day count: store', [timed(store.count, start=today, end=today)[1]
+                                           for _ in range(args.lookups)])
+        print_summary('model and grade count: store', [timed(store.count, model='Dell', grade='C')[1]
+                                                       for _ in range(min(args.lookups, 20))])
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark of the report of a synthetic six-surface inspection: size and render time of the legacy report (full
+resolution images embedded losslessly through PIL), the compressed PDF report (print resolution JPEG) and the html
+report (JSON record, HTML page and JPEG images saved by ImageSaver).
+
+Surfaces are noisy gradients (harder to compress than real laptops) with a few defect crops each.
+
+Usage:
+    python -m benchmarks.bench_report --runs 5 --resolution 1920x1080 --quality 80 --dpi 150
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import argparse
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from interfaces.classes import Defect
+from interfaces.report import IMAGE_WIDTH, render_pdf_report, write_html_report
+from interfaces.saver import ImageSaver
+from benchmarks.utils import print_summary, timed
+
+
+def synthetic_inspection(width, height, defects_per_surface=3):
+    rng = np.random.default_rng(0)
+    ramp = np.linspace(40, 200, width, dtype=np.float32)[None, :, None]
+    detected_imgs, defects_list = [], []
+    for port in range(1, 7):
+        image = np.clip(ramp + rng.normal(0, 12, (height, width, 3)), 0, 255).astype(np.uint8)
+        defects = []
+        for _ in range(defects_per_surface):
+            x, y = int(rng.integers(0, width - 400)), int(rng.integers(0, height - 200))
+            defects.append(Defect(image[y:y + 200, x:x + 400], 'scratch', (x, y, x + 400, y + 200)))
+        detected_imgs.append((image, port))
+        defects_list.append((defects, port))
+    return detected_imgs, defects_list
+
+
+def render_legacy(path, detected_imgs, defects_list):
+    """Layout of the original report: full resolution images converted by PIL, embedded losslessly."""
+    c = canvas.Canvas(path, pagesize=letter)
+    width, height = letter
+    y_position = height - 50
+    for defects, camera_port in defects_list:
+        for img, port in detected_imgs:  # linear scan of the images for every surface
+            if port != camera_port:
+                continue
+            pil_image = Image.fromarray(img)
+            display_height = IMAGE_WIDTH * pil_image.size[1] / pil_image.size[0]
+            if y_position - display_height < 100:
+                c.showPage()
+                y_position = height - 50
+            c.drawImage(ImageReader(pil_image), 50, y_position - display_height, width=IMAGE_WIDTH,
+                        height=display_height)
+            y_position -= display_height + 20
+        for d in defects:
+            pil_image = Image.fromarray(d.image)
+            w, h = pil_image.size
+            display_width = min(w, IMAGE_WIDTH)
+            display_height = display_width * h / w
+            if y_position - display_height < 100:
+                c.showPage()
+                y_position = height - 50
+            c.drawImage(ImageReader(pil_image), 50, y_position - display_height, width=display_width,
+                        height=display_height)
+            y_position -= display_height + 20
+    c.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--resolution', default='1920x1080')
+    parser.add_argument('--quality', type=int, default=80)
+    parser.add_argument('--dpi', type=int, default=150)
+    parser.add_argument('--image-width', type=int, default=1024, help='width of the images of the html report')
+    args = parser.parse_args()
+
+    width, height = map(int, args.resolution.split('x'))
+    detected_imgs, defects_list = synthetic_inspection(width, height)
+    renderers = {
+        'legacy (lossless, full resolution)': lambda path: render_legacy(path, detected_imgs, defects_list),
+        f'JPEG q{args.quality} at {args.dpi} dpi': lambda path: render_pdf_report(
+            path, detected_imgs, defects_list, dpi=args.dpi, quality=args.quality),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name, render in renderers.items():
+            path = os.path.join(directory, 'report.pdf')
+            samples = [timed(render, path)[1] for _ in range(args.runs)]
+            print_summary(f'{name}: render', samples)
+            print(f'{name}: {os.path.getsize(path) / 1e6:.2f} MB')
+
+        saver = ImageSaver(save_directory=directory)
+        folder = os.path.join(directory, 'html')
+
+        def render_html():
+            surfaces = saver.save_report_images('html', 'LOT', detected_imgs, defects_list, args.image_width,
+                                                args.quality)
+            return write_html_report(folder, 'LOT', surfaces, {'lot': 'LOT'})
+
+        name = f'html, images {args.image_width}px q{args.quality}'
+        samples = [timed(render_html)[1] for _ in range(args.runs)]
+        print_summary(f'{name}: render', samples)
+        size = sum(os.path.getsize(os.path.join(folder, file)) for file in os.listdir(folder))
+        print(f'{name}: {size / 1e6:.2f} MB')
+
+if __name__ == '__main__':
+    main()
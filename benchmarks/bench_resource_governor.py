@@ -0,0 +1,92 @@
+"""
+Benchmark of the inference latency with the live previews running, throttled, frozen or stopped.
+
+The cameras are synthetic sources decoding a JPEG per frame like MJPG cameras (``--backend auto`` measures the real
+devices). The inference is simulated by OpenCV work (blur, resize and colour conversion of a large image, with the
+intra-op threads set by limit_inference_threads), or by a convolution of torch when it is installed (``--torch``).
+
+Usage:
+    python -m benchmarks.bench_resource_governor --cameras 6 --runs 20 --resolution 1920x1080
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import argparse
+import time
+
+import cv2 as cv
+import numpy as np
+
+from interfaces.resource_governor import ResourceGovernor, limit_inference_threads
+from interfaces.settings import get_settings
+from widgets.camera_sessions import CameraSessionManager
+from benchmarks.utils import print_summary, timed
+
+
+def simulated_inference(image):
+    """OpenCV work releasing the GIL, like the pre-processing and the inference of the detection."""
+    for _ in range(3):
+        image = cv.GaussianBlur(image, (15, 15), 0)
+    small = cv.resize(image, (image.shape[1] // 2, image.shape[0] // 2), interpolation=cv.INTER_AREA)
+    return cv.cvtColor(small, cv.COLOR_BGR2HSV)
+
+
+def torch_inference(model, batch):
+    import torch
+    with torch.no_grad():
+        return model(batch)
+
+
+def measure(inference, runs):
+    return [timed(inference)[1] for _ in range(runs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cameras', type=int, default=6)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--backend', default='synthetic')
+    parser.add_argument('--resolution', default='1920x1080')
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--throttled-fps', type=float, default=2)
+    parser.add_argument('--torch', action='store_true', help='simulate the inference with a torch convolution')
+    args = parser.parse_args()
+
+    width, height = map(int, args.resolution.split('x'))
+    default = get_settings()['cameras']['default']
+    default.update(backend=args.backend, width=width, height=height, fps=args.fps, mjpeg=True)
+    get_settings()['preview']['max_fps'] = 0
+    print(f'Inference threads: {limit_inference_threads()}')
+
+    if args.torch:
+        import torch
+        model = torch.nn.Sequential(*[torch.nn.Conv2d(16, 16, 3, padding=1) for _ in range(4)]).eval()
+        batch = torch.rand(1, 16, 320, 320)
+        inference = lambda: torch_inference(model, batch)  # noqa: E731
+    else:
+        image = np.random.default_rng(0).integers(0, 255, (1080, 1920, 3), dtype=np.uint8)
+        inference = lambda: simulated_inference(image)  # noqa: E731
+    measure(inference, 2)  # warm-up
+
+    print_summary('previews off', measure(inference, args.runs))
+
+    manager = CameraSessionManager()
+    threads = [manager.acquire(port)[0] for port in range(1, args.cameras + 1)]
+    deadline = time.monotonic() + 30.0
+    while any(thread.frame_buffer.latest() is None for thread in threads) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    try:
+        for mode in ('off', 'throttle', 'freeze'):
+            governor = ResourceGovernor(lambda: threads, mode, args.throttled_fps)
+            with governor.inference():
+                time.sleep(0.5)  # let the cameras settle at their new rate
+                samples = measure(inference, args.runs)
+            name = {'off': 'previews on', 'throttle': f'previews at {args.throttled_fps:g} fps',
+                    'freeze': 'previews frozen'}[mode]
+            print_summary(name, samples)
+    finally:
+        manager.release_all()
+
+
+if __name__ == '__main__':
+    main()
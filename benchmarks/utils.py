@@ -0,0 +1,39 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Functions:
+- timed(fn, *args, **kwargs): Run a function and return its result with the elapsed time in milliseconds.
+- summarize(samples): Summarize latency samples (mean, median, p95, max) in milliseconds.
+- print_summary(name, samples): Print a one-line latency summary.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import time
+
+import numpy as np
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def summarize(samples):
+    samples = np.asarray(samples, dtype=np.float64)
+    if samples.size == 0:
+        return {'n': 0, 'mean': 0.0, 'median': 0.0, 'p95': 0.0, 'max': 0.0}
+    return {
+        'n': int(samples.size),
+        'mean': float(samples.mean()),
+        'median': float(np.median(samples)),
+        'p95': float(np.percentile(samples, 95)),
+        'max': float(samples.max()),
+    }
+
+
+def print_summary(name, samples):
+    s = summarize(samples)
+    print(f"{name:<40} n={s['n']:<5} mean={s['mean']:8.2f}ms  median={s['median']:8.2f}ms  "
+          f"p95={s['p95']:8.2f}ms  max={s['max']:8.2f}ms")
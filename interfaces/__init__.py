@@ -2,10 +2,13 @@ from .saver import ImageSaver
 from .export import ExportFile
 from .google_driver import GoogleDriveUploader
 from .classes import Defect
+from .ocr import OCRService, get_ocr_service
 
 __all__ = (
     'ImageSaver',
     'ExportFile',
     'GoogleDriveUploader',
     'Defect',
+    'OCRService',
+    'get_ocr_service',
 )
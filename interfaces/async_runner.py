@@ -0,0 +1,56 @@
+"""
+asyncio event loop running next to the Qt event loop.
+
+The inspection (capture -> detect -> report) is a coroutine. Running it with run_until_complete on the GUI thread
+froze the window for the whole inspection. AsyncRunner keeps one asyncio event loop running in a background thread:
+the GUI submits coroutines to it and gets concurrent futures back, and the coroutines report progress and results
+through Qt signals, which are queued to the GUI thread. This gives the integration qasync provides without adding
+a dependency, the Qt event loop never waits for asyncio.
+
+Classes:
+- AsyncRunner: Background thread running an asyncio event loop.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import asyncio
+import threading
+
+
+class AsyncRunner:
+    """
+    asyncio event loop running in a background thread.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The event loop, None once stopped.
+    """
+    def __init__(self, name='inspection-loop'):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine):
+        """
+        Schedule a coroutine on the loop.
+
+        Args:
+            coroutine: The coroutine.
+
+        Returns:
+            concurrent.futures.Future: Result of the coroutine, cancelling it cancels the coroutine.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self, timeout=5.0):
+        """Stop the loop once the running callbacks return, and close it."""
+        if self.loop is None:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self.loop.close()
+        self.loop = None
@@ -0,0 +1,254 @@
+"""
+Barcode decoding for the lot/asset label.
+
+The lot/asset detection model already localizes the barcode printed on the label. Decoding it is much faster and
+more reliable than running OCR on the lot and asset crops, so detect_lot_asset_barcode reads the barcode first and
+only falls back to OCR for the fields the barcode did not provide.
+
+Decoding works offline: the 1D barcode detector of OpenCV (``cv.barcode``, OpenCV >= 4.8, EAN and UPC only), a
+scanline decoder of Code 128 (the alphanumeric lot/asset labels) and the QR code detector of OpenCV. Payloads are mapped to fields with the regular expressions of the ``barcode`` settings; a
+payload matching no field pattern is assigned to ``barcode.bare_field`` (none by default) only if it passes the rules
+of that field, so a vendor SKU or a URL is not taken for an asset number.
+
+Classes:
+- IdentificationStats: Thread-safe counters of which path (barcode, ocr, missing) produced each field.
+
+Functions:
+- decode_barcode(img): Decode every 1D barcode and QR code found in a crop.
+- parse_payloads(payloads): Map decoded payloads to label fields.
+- read_barcode_fields(img): Decode a barcode crop into label fields.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import re
+import threading
+
+import cv2 as cv
+import numpy as np
+
+from .fields import normalize_field, validate_field
+from .settings import get_settings
+
+# Crops narrower than this are upscaled before decoding, the detectors need a few pixels per bar
+_MIN_DECODE_WIDTH = 400
+
+
+_warned = False
+
+
+def _create_barcode_detector():
+    global _warned
+    if hasattr(cv, 'barcode') and hasattr(cv.barcode, 'BarcodeDetector'):
+        return cv.barcode.BarcodeDetector()
+    if hasattr(cv, 'barcode_BarcodeDetector'):  # opencv-contrib < 4.8
+        return cv.barcode_BarcodeDetector()
+    if not _warned:
+        _warned = True
+        print(f'Warning: OpenCV {cv.__version__} has no 1D barcode detector, EAN and UPC barcodes are not decoded '
+              '(install opencv-python >= 4.8)')
+    return None
+
+
+_local = threading.local()
+
+
+def _detectors():
+    """OpenCV detectors are not thread-safe, each thread keeps its own instances."""
+    if not hasattr(_local, 'barcode'):
+        _local.barcode = _create_barcode_detector()
+        _local.qr = cv.QRCodeDetector()
+    return _local.barcode, _local.qr
+
+
+def _decode_1d(detector, img):
+    if detector is None:
+        return []
+    if hasattr(detector, 'detectAndDecodeWithType'):
+        ok, infos, _, _ = detector.detectAndDecodeWithType(img)
+    else:
+        ok, infos, _, _ = detector.detectAndDecode(img)
+    return [info for info in infos if info] if ok else []
+
+
+# bar and space widths, in modules, of the Code 128 symbols by value (103, 104, 105: start codes A, B, C)
+_CODE128 = {pattern: value for value, pattern in enumerate((
+    '212222 222122 222221 121223 121322 131222 122213 122312 132212 221213 221312 231212 112232 122132 122231 113222 '
+    '123122 123221 223211 221132 221231 213212 223112 312131 311222 321122 321221 312212 322112 322211 212123 212321 '
+    '232121 111323 131123 131321 112313 132113 132311 211313 231113 231311 112133 112331 132131 113123 113321 133121 '
+    '313121 211331 231131 213113 213311 213131 311123 311321 331121 312113 312311 332111 314111 221411 431111 111224 '
+    '111422 121124 121421 141122 141221 112214 112412 122114 122411 142112 142211 241211 221114 413111 241112 134111 '
+    '111242 121142 121241 114212 124112 124211 411212 421112 421211 212141 214121 412121 111143 111341 131141 114113 '
+    '114311 411113 411311 113141 114131 311141 411131 211412 211214 211232').split())}
+_CODE128_STOP = '2331112'
+# code set switches: value -> code set, per current code set (Shift and FNC codes are not used by the labels)
+_CODE128_SWITCH = {'A': {99: 'C', 100: 'B'}, 'B': {99: 'C', 101: 'A'}, 'C': {100: 'B', 101: 'A'}}
+
+
+def _modules(widths, modules):
+    unit = sum(widths) / modules
+    return ''.join(str(min(4, max(1, round(w / unit)))) for w in widths)
+
+
+def _code128_text(values):
+    """Text of the symbol values (start code, data, check symbol), None if the check symbol does not match."""
+    if len(values) < 2 or values[-1] != (values[0] + sum(i * v for i, v in enumerate(values[1:-1], 1))) % 103:
+        return None
+    code_set = 'ABC'[values[0] - 103]
+    text = []
+    for value in values[1:-1]:
+        if value in _CODE128_SWITCH[code_set]:
+            code_set = _CODE128_SWITCH[code_set][value]
+        elif code_set == 'C' and value < 100:
+            text.append(f'{value:02d}')
+        elif code_set == 'B' and value < 96:
+            text.append(chr(value + 32))
+        elif code_set == 'A' and value < 96:
+            text.append(chr(value + 32) if value < 64 else chr(value - 64))
+    return ''.join(text)
+
+
+def _decode_code128_runs(dark, widths):
+    for start in range(len(widths) - 6):
+        value = _CODE128.get(_modules(widths[start:start + 6], 11)) if dark[start] else None
+        if value not in (103, 104, 105):
+            continue
+        values = [value]
+        i = start + 6
+        while i + 7 <= len(widths):
+            if _modules(widths[i:i + 7], 13) == _CODE128_STOP:
+                text = _code128_text(values)
+                if text:
+                    return text
+                break
+            value = _CODE128.get(_modules(widths[i:i + 6], 11))
+            if value is None or value > 102:
+                break
+            values.append(value)
+            i += 6
+    return None
+
+
+def _decode_code128(img):
+    """Decode a Code 128 barcode along a few scanlines of the crop, in both directions."""
+    gray = cv.cvtColor(img, cv.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    _, binary = cv.threshold(gray, 0, 255, cv.THRESH_BINARY + cv.THRESH_OTSU)
+    for y in np.linspace(0.2, 0.8, 7) * (binary.shape[0] - 1):
+        row = binary[int(y)] == 0
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(row)) + 1, [len(row)]))
+        dark, widths = row[bounds[:-1]].tolist(), np.diff(bounds).tolist()
+        text = _decode_code128_runs(dark, widths) or _decode_code128_runs(dark[::-1], widths[::-1])
+        if text:
+            return [text]
+    return []
+
+
+def decode_barcode(img):
+    """
+    Decode every 1D barcode and QR code found in a crop.
+
+    Args:
+        img (numpy.ndarray): BGR or grayscale barcode crop.
+
+    Returns:
+        list[str]: Decoded payloads, empty if nothing could be decoded.
+    """
+    if img is None or img.size == 0:
+        return []
+    if img.shape[1] < _MIN_DECODE_WIDTH:
+        scale = _MIN_DECODE_WIDTH / img.shape[1]
+        img = cv.resize(img, None, fx=scale, fy=scale, interpolation=cv.INTER_CUBIC)
+
+    barcode_detector, qr_detector = _detectors()
+    payloads = _decode_1d(barcode_detector, img) or _decode_code128(img)
+    if payloads:
+        return payloads
+
+    payload, _, _ = qr_detector.detectAndDecode(img)
+    return [payload] if payload else []
+
+
+def parse_payloads(payloads):
+    """
+    Map decoded payloads to label fields.
+
+    Args:
+        payloads (list[str]): Decoded payloads.
+
+    Returns:
+        dict: Field name ('lot', 'asset') mapped to its value for every field found.
+    """
+    settings = get_settings()['barcode']
+    fields = {}
+    for payload in payloads:
+        matched = False
+        for field, pattern in settings['patterns'].items():
+            match = re.search(pattern, payload)
+            if match:
+                matched = True
+                fields.setdefault(field, match.group('value').strip())
+        bare_field = settings['bare_field']
+        if not matched and bare_field and validate_field(bare_field, normalize_field(payload)):
+            fields.setdefault(bare_field, payload.strip())
+    return fields
+
+
+def read_barcode_fields(img):
+    """
+    Decode a barcode crop into label fields.
+
+    Args:
+        img (numpy.ndarray): Barcode crop.
+
+    Returns:
+        dict: Field name mapped to its value, empty if the barcode could not be decoded.
+    """
+    return parse_payloads(decode_barcode(img))
+
+
+class IdentificationStats:
+    """
+    Counts which path produced each identification field and how long it took.
+
+    Sources are 'barcode', 'ocr' and 'missing'.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+        self.elapsed = {}
+
+    def record(self, field, source, elapsed_ms=0.0):
+        with self._lock:
+            self.counts.setdefault(field, {}).setdefault(source, 0)
+            self.counts[field][source] += 1
+            self.elapsed.setdefault(source, 0.0)
+            self.elapsed[source] += elapsed_ms
+
+    def reset(self):
+        with self._lock:
+            self.counts = {}
+            self.elapsed = {}
+
+    def report(self):
+        """
+        Summarize the statistics.
+
+        Returns:
+            str: One line per field with the share of each source, and the mean latency of each source.
+        """
+        with self._lock:
+            lines = []
+            totals = {}
+            for field, sources in sorted(self.counts.items()):
+                total = sum(sources.values())
+                shares = ', '.join(f'{src}: {n} ({n / total:.0%})' for src, n in sorted(sources.items()))
+                lines.append(f'{field}: {shares}')
+                for src, n in sources.items():
+                    totals[src] = totals.get(src, 0) + n
+            for src, n in sorted(totals.items()):
+                if src != 'missing':
+                    lines.append(f'{src} mean latency: {self.elapsed.get(src, 0.0) / n:.1f}ms')
+            return '\n'.join(lines)
+
+
+identification_stats = IdentificationStats()
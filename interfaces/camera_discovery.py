@@ -0,0 +1,227 @@
+"""
+Camera discovery.
+
+Opening a missing camera blocks until the driver gives up, which used to cost a full open timeout per missing port
+every time detection was started. CameraDiscovery probes all candidate ports in parallel with a bounded timeout,
+keeps the map of live ports and their capabilities in a json file, and refreshes it in the background so that
+cameras plugged or unplugged while the application runs are picked up. Starting detection then only opens the
+known-good cameras.
+
+Classes:
+- CameraDiscovery: Parallel probing, cached device map and hot-plug monitor.
+
+Functions:
+- get_camera_discovery(): Return the discovery service shared by the application.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import json
+import os
+import threading
+import time
+
+from .camera_sources import create_source
+from .settings import get_settings
+
+_root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class CameraDiscovery:
+    """
+    Discovers the live camera ports.
+
+    Probes run in daemon threads: a driver hanging in open() cannot be interrupted, so a probe still running when
+    the timeout expires is abandoned, its port is reported missing and it is not probed again until it returns.
+
+    Attributes:
+        ports (list[int]): Candidate camera ports.
+        timeout (float): Maximum duration of a discovery, in seconds.
+        cache_file (str): Json file holding the device map, None to keep it in memory only.
+        devices (dict): Live port mapped to its capabilities, None until loaded or discovered.
+    """
+    def __init__(self, ports, timeout=2.0, cache_file=None, source_factory=create_source):
+        self.ports = list(ports)
+        self.timeout = timeout
+        self.cache_file = cache_file
+        self.source_factory = source_factory
+        self.devices = None
+
+        self._lock = threading.Lock()
+        self._probing = set()
+        self._monitor = None
+        self._stop_event = threading.Event()
+        self.load_cache()
+
+    def probe(self, port):
+        """
+        Open a port and read one frame.
+
+        Args:
+            port (int): Camera port.
+
+        Returns:
+            dict: Capabilities of the camera, None if no camera delivers frames on this port.
+        """
+        source = self.source_factory(port)
+        try:
+            if not source.open():
+                return None
+            ret, _ = source.read()
+            return source.capabilities() if ret else None
+        finally:
+            source.release()
+
+    def _probe_worker(self, port, results):
+        try:
+            capabilities = self.probe(port)
+        except Exception as e:
+            print(f'Probe of camera {port} failed: {e}')
+            capabilities = None
+        finally:
+            with self._lock:
+                self._probing.discard(port)
+        if capabilities is not None:
+            results[port] = capabilities
+
+    def discover(self, skip=()):
+        """
+        Probe every candidate port in parallel and update the device map.
+
+        Args:
+            skip (iterable[int] or callable): Ports currently opened by the application, or a function returning them.
+                They are not probed (a device cannot always be opened twice) and keep their entry of the device map.
+                A function is called as each probe starts, atomically with open_port().
+
+        Returns:
+            dict: Live port mapped to its capabilities.
+        """
+        fixed = None if callable(skip) else set(skip)
+        skipped = set()
+        results = {}
+        threads = []
+        for port in self.ports:
+            with self._lock:
+                if port in (fixed if fixed is not None else skip()):
+                    skipped.add(port)
+                    continue
+                if port in self._probing:  # an earlier probe of this port is still hanging
+                    continue
+                self._probing.add(port)
+            thread = threading.Thread(target=self._probe_worker, args=(port, results), name=f'camera-probe-{port}',
+                                      daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        deadline = time.monotonic() + self.timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+        with self._lock:
+            devices = {port: caps for port, caps in (self.devices or {}).items() if port in skipped}
+            devices.update(dict(results))
+            self.devices = devices
+        self.save_cache()
+        return devices
+
+    def open_port(self, port, opener):
+        """
+        Open a port for the application unless it is being probed.
+
+        The check and the call to ``opener`` hold the lock taken as each probe starts, so a discovery skipping the
+        ports returned by its ``skip`` function never probes a device the application is opening.
+
+        Args:
+            port (int): Camera port.
+            opener (callable): Opens the port, called with the port. It must register the port in the ports skipped
+                by the discovery before returning, and not block.
+
+        Returns:
+            The result of ``opener``, None if the port is being probed (open it again once the probe is done).
+        """
+        with self._lock:
+            if port in self._probing:
+                return None
+            return opener(port)
+
+    def live_ports(self):
+        """
+        Returns:
+            list[int]: Live ports from the device map, discovering them first if the map is unknown.
+        """
+        if self.devices is None:
+            self.discover()
+        return sorted(self.devices)
+
+    def load_cache(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+            self.devices = {int(port): caps for port, caps in content['devices'].items()}
+        except (ValueError, KeyError, AttributeError) as e:
+            print(f'Ignoring invalid camera map {self.cache_file}: {e}')
+
+    def save_cache(self):
+        if not self.cache_file:
+            return
+        directory = os.path.dirname(self.cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = self.cache_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'updated': time.time(), 'devices': {str(port): caps for port, caps in self.devices.items()}},
+                      f, indent=2)
+        os.replace(tmp_file, self.cache_file)
+
+    def start_monitor(self, interval, on_change=None, busy_ports=None):
+        """
+        Refresh the device map in a background thread, starting immediately.
+
+        Args:
+            interval (float): Seconds between two refreshes.
+            on_change (callable): Called with the new device map when the set of live ports changes.
+            busy_ports (callable): Returns the ports currently opened by the application, see discover().
+        """
+        if self._monitor is not None:
+            return
+        self._stop_event.clear()
+        self._monitor = threading.Thread(target=self._monitor_loop, args=(interval, on_change, busy_ports),
+                                         name='camera-monitor', daemon=True)
+        self._monitor.start()
+
+    def _monitor_loop(self, interval, on_change, busy_ports):
+        while not self._stop_event.is_set():
+            previous = set(self.devices or {})
+            devices = self.discover(skip=busy_ports if busy_ports is not None else ())
+            if on_change is not None and set(devices) != previous:
+                on_change(devices)
+            self._stop_event.wait(interval)
+
+    def stop(self):
+        """Stop the background refresh."""
+        self._stop_event.set()
+        if self._monitor is not None:
+            self._monitor.join(self.timeout + 1.0)
+            self._monitor = None
+
+
+_discovery = None
+_discovery_lock = threading.Lock()
+
+
+def get_camera_discovery():
+    """
+    Get the discovery service shared by the application, configured by the ``cameras`` settings.
+
+    Returns:
+        CameraDiscovery: The shared service.
+    """
+    global _discovery
+    with _discovery_lock:
+        if _discovery is None:
+            cameras = get_settings()['cameras']
+            cache_file = os.path.join(_root_dir, cameras['device_map']) if cameras['device_map'] else None
+            _discovery = CameraDiscovery(cameras['ports'], timeout=cameras['probe_timeout'], cache_file=cache_file)
+        return _discovery
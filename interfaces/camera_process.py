@@ -0,0 +1,230 @@
+"""
+Camera capture in a dedicated process.
+
+Decoding MJPG and converting colours for six cameras in the application process competes for the GIL with the
+detection and the GUI. With the ``process`` camera setting, the frame source of a port runs in its own process and
+writes the decoded frames into a shared-memory ring (see interfaces.shared_frames); the application reads them from
+the ring without copying.
+
+A camera process that crashes (e.g. a faulty driver) or stops delivering frames only affects its own port: the
+application keeps running and ProcessSource restarts the process a limited number of times.
+
+Classes:
+- ProcessSource: FrameSource reading the ring written by a camera process.
+
+Functions:
+- camera_process_main(...): Entry point of a camera process.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import multiprocessing
+import queue
+import time
+
+from .camera_sources import FrameSource, create_source
+from .shared_frames import SharedFrameRing
+
+
+def camera_process_main(port, config, ring_name, slots, capacity, commands, events, stop_event):
+    """
+    Open the frame source of a port and copy its frames into the shared ring until asked to stop.
+
+    Args:
+        port (int): Camera port.
+        config (dict): Camera settings of the port, without the ``process`` option.
+        ring_name (str): Name of the shared memory block of the ring.
+        slots (int): Number of slots of the ring.
+        capacity (int): Size of one slot, in bytes.
+        commands (multiprocessing.Queue): Requests of the application, ('profile', profile) or ('throttle', fps).
+        events (multiprocessing.Queue): Messages to the application, ('opened', capabilities), ('failed', reason)
+            or ('profile', size).
+        stop_event (multiprocessing.Event): Set by the application to stop the process.
+    """
+    ring = SharedFrameRing(ring_name, slots, capacity)
+    source = create_source(port, config)
+    try:
+        if not source.open():
+            events.put(('failed', 'cannot open the device'))
+            return
+        events.put(('opened', source.capabilities()))
+
+        throttle = None  # frames per second, 0 to stop reading, see ProcessSource.set_throttle
+        last_read = 0.0
+        while not stop_event.is_set():
+            if throttle is None:
+                wait = 0.0
+            else:
+                wait = 0.5 if throttle == 0 else last_read + 1.0 / throttle - time.monotonic()
+            try:
+                command, argument = commands.get(timeout=wait) if wait > 0 else commands.get_nowait()
+            except queue.Empty:
+                if wait > 0 and throttle == 0:
+                    continue
+            else:
+                if command == 'profile':
+                    events.put(('profile', source.apply_profile(argument)))
+                elif command == 'throttle':
+                    throttle = argument
+                continue
+
+            ret, frame = source.read()
+            last_read = time.monotonic()
+            if not ret:
+                events.put(('failed', 'cannot read frames'))
+                return
+            ring.write(frame)
+    except Exception as e:
+        events.put(('failed', str(e)))
+    finally:
+        source.release()
+        ring.close()
+
+
+class ProcessSource(FrameSource):
+    """
+    Frame source running in a camera process.
+
+    Settings (in the camera settings of the port): ``ring_slots`` slots of the ring, ``max_resolution`` largest
+    [width, height] of a frame, ``max_restarts`` restarts of a crashed process, ``read_timeout`` seconds without
+    frame before the process is considered hung.
+
+    Attributes:
+        ring (SharedFrameRing): Ring written by the camera process, None until opened.
+        last_timestamp (float): Capture time (time.monotonic) of the last frame read.
+        restarts (int): Number of restarts of the camera process.
+    """
+    backend = 'process'
+    OPEN_TIMEOUT = 10.0  # seconds for a new process to start and open its device
+
+    def __init__(self, port, config):
+        super().__init__(port, config)
+        self.source_config = dict(config, process=False)
+        self.slots = config.get('ring_slots', 10)
+        width, height = config.get('max_resolution', (1920, 1080))
+        self.capacity = width * height * 3
+        self.max_restarts = config.get('max_restarts', 3)
+        self.read_timeout = config.get('read_timeout', 2.0)
+
+        self.ring = None
+        self.process = None
+        self.last_timestamp = None
+        self.restarts = 0
+        self.throttle = None
+        self._seq = 0
+        self._capabilities = {}
+        self._context = multiprocessing.get_context('spawn')
+
+    def _start_process(self):
+        self._commands = self._context.Queue()
+        self._events = self._context.Queue()
+        self._stop_event = self._context.Event()
+        self.process = self._context.Process(
+            target=camera_process_main, name=f'camera-{self.port}', daemon=True,
+            args=(self.port, self.source_config, self.ring.name, self.slots, self.capacity,
+                  self._commands, self._events, self._stop_event))
+        self.process.start()
+        try:
+            kind, payload = self._events.get(timeout=self.OPEN_TIMEOUT)
+        except queue.Empty:
+            kind, payload = 'failed', 'no answer'
+        if kind == 'opened':
+            self._capabilities = payload
+            if self.throttle is not None:  # restarted while throttled
+                self._commands.put(('throttle', self.throttle))
+            return True
+        print(f'Camera process {self.port} failed: {payload}')
+        self._stop_process()
+        return False
+
+    def _stop_process(self):
+        if self.process is None:
+            return
+        self._stop_event.set()
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1.0)
+        self.process = None
+
+    def open(self):
+        self.ring = SharedFrameRing(slots=self.slots, capacity=self.capacity, create=True)
+        if self._start_process():
+            return True
+        self.ring.close()
+        self.ring.unlink()
+        self.ring = None
+        return False
+
+    def read(self):
+        """
+        Returns:
+            tuple: (bool, numpy.ndarray) the newest frame as a view of the ring.
+        """
+        deadline = time.monotonic() + self.read_timeout
+        while True:
+            frame = self.ring.wait_newer(self._seq, min(0.1, self.read_timeout))
+            if frame is not None:
+                self._seq = frame.seq
+                self.last_timestamp = frame.timestamp
+                return True, frame.image
+            if self.process.is_alive() and time.monotonic() < deadline:
+                continue
+            if not self._restart():
+                return False, None
+            deadline = time.monotonic() + self.read_timeout
+
+    def _restart(self):
+        """Restart a crashed or hung camera process, return False once the restarts are exhausted."""
+        reason = 'stopped delivering frames'
+        while True:
+            try:
+                kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'failed':
+                reason = payload
+        if self.process is not None and not self.process.is_alive():
+            reason = f'exited with code {self.process.exitcode} ({reason})'
+
+        if self.restarts >= self.max_restarts:
+            print(f'Camera process {self.port} {reason}, giving up after {self.restarts} restarts')
+            return False
+        self.restarts += 1
+        print(f'Camera process {self.port} {reason}, restart {self.restarts}/{self.max_restarts}')
+        self._stop_process()
+        return self._start_process()
+
+    def apply_profile(self, profile):
+        self._commands.put(('profile', profile))
+        while True:
+            try:
+                kind, payload = self._events.get(timeout=self.read_timeout)
+            except queue.Empty:
+                return None
+            if kind == 'profile':
+                return tuple(payload) if payload is not None else None
+
+    def set_throttle(self, fps):
+        """
+        Limit the frames decoded by the camera process.
+
+        Args:
+            fps (float): Frames per second, 0 to stop reading, None for no limit.
+        """
+        self.throttle = fps
+        if self.process is not None:
+            self._commands.put(('throttle', fps))
+
+    def is_opened(self):
+        return self.process is not None and self.process.is_alive()
+
+    def release(self):
+        self._stop_process()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring.unlink()
+            self.ring = None
+
+    def capabilities(self):
+        return dict(self._capabilities, backend=f"process/{self._capabilities.get('backend')}")
@@ -0,0 +1,364 @@
+"""
+Camera frame sources.
+
+VideoThread reads its frames from a FrameSource selected per camera port by the ``cameras`` settings, so the
+application can run with DirectShow cameras on Windows, V4L2 cameras on Linux, or without any camera at all.
+
+Backends:
+- dshow: DirectShow capture device (Windows).
+- v4l2: Video4Linux2 capture device, negotiating FOURCC (MJPG by default), resolution, FPS and buffer size so that
+  several 1080p cameras fit on one USB hub.
+- any: OpenCV picks the capture API.
+- file: loops over a video file or a folder of images.
+- synthetic: deterministic generated frames, for tests and benchmarks.
+- auto: dshow on Windows, v4l2 on Linux, any elsewhere.
+
+With the ``process`` setting, the source of the port runs in a dedicated process (see interfaces.camera_process).
+
+Classes:
+- FrameSource: Interface of every source.
+- CaptureDeviceSource, DirectShowSource, V4L2Source: Sources backed by cv.VideoCapture.
+- FileSource: Video file or image folder source.
+- SyntheticSource: Generated frames.
+
+Functions:
+- camera_config(port): Settings of one camera port (defaults merged with the port overrides).
+- create_source(port, config): Create the source of a camera port.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import os
+import sys
+import time
+
+import cv2 as cv
+import numpy as np
+
+from .settings import get_settings
+
+_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class FrameSource:
+    """
+    Interface of a camera frame source.
+
+    Attributes:
+        port (int): Camera port the source is attached to.
+        config (dict): Camera settings (backend, width, height, fps, ...).
+    """
+    backend = None
+
+    def __init__(self, port, config):
+        self.port = port
+        self.config = config
+
+    def open(self):
+        """
+        Open the source.
+
+        Returns:
+            bool: True if the source delivers frames.
+        """
+        raise NotImplementedError
+
+    def read(self):
+        """
+        Read the next frame, blocking until it is available.
+
+        Returns:
+            tuple: (bool, numpy.ndarray) like cv.VideoCapture.read().
+        """
+        raise NotImplementedError
+
+    def is_opened(self):
+        raise NotImplementedError
+
+    def release(self):
+        raise NotImplementedError
+
+    def capabilities(self):
+        """
+        Returns:
+            dict: Negotiated width, height and fps of the opened source.
+        """
+        return {'backend': self.backend, 'width': 0, 'height': 0, 'fps': 0.0}
+
+    def apply_profile(self, profile):
+        """
+        Switch the opened source to a stream profile (``width``, ``height`` and optionally ``fps``).
+
+        Args:
+            profile (dict): The profile, see the ``profiles`` camera setting.
+
+        Returns:
+            tuple[int, int]: Negotiated (width, height), None if the source cannot switch.
+        """
+        return None
+
+
+class CaptureDeviceSource(FrameSource):
+    """Source backed by a cv.VideoCapture device, negotiating the format requested by the settings."""
+    backend = 'any'
+    api = cv.CAP_ANY
+
+    def __init__(self, port, config):
+        super().__init__(port, config)
+        self.cap = None
+
+    def open(self):
+        self.cap = cv.VideoCapture(self.config.get('device', self.port), self.api)
+        if not self.cap.isOpened():
+            return False
+        self.negotiate()
+        return True
+
+    def negotiate(self):
+        """Request FOURCC, resolution, FPS and buffer size. Unsupported requests are ignored by the driver."""
+        fourcc = self.config.get('fourcc')
+        if fourcc:
+            self.cap.set(cv.CAP_PROP_FOURCC, cv.VideoWriter_fourcc(*fourcc))
+        if self.config.get('width') and self.config.get('height'):
+            self.cap.set(cv.CAP_PROP_FRAME_WIDTH, self.config['width'])
+            self.cap.set(cv.CAP_PROP_FRAME_HEIGHT, self.config['height'])
+        if self.config.get('fps'):
+            self.cap.set(cv.CAP_PROP_FPS, self.config['fps'])
+        if self.config.get('buffer_size'):
+            self.cap.set(cv.CAP_PROP_BUFFERSIZE, self.config['buffer_size'])
+
+    def read(self):
+        return self.cap.read()
+
+    def apply_profile(self, profile):
+        self.cap.set(cv.CAP_PROP_FRAME_WIDTH, profile['width'])
+        self.cap.set(cv.CAP_PROP_FRAME_HEIGHT, profile['height'])
+        if profile.get('fps'):
+            self.cap.set(cv.CAP_PROP_FPS, profile['fps'])
+        return int(self.cap.get(cv.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv.CAP_PROP_FRAME_HEIGHT))
+
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+    def capabilities(self):
+        if not self.is_opened():
+            return super().capabilities()
+        return {
+            'backend': self.backend,
+            'width': int(self.cap.get(cv.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv.CAP_PROP_FRAME_HEIGHT)),
+            'fps': float(self.cap.get(cv.CAP_PROP_FPS)),
+        }
+
+
+class DirectShowSource(CaptureDeviceSource):
+    backend = 'dshow'
+    api = cv.CAP_DSHOW
+
+
+class V4L2Source(CaptureDeviceSource):
+    """Video4Linux2 device, MJPG is requested by default to keep the USB bandwidth of 1080p streams low."""
+    backend = 'v4l2'
+    api = cv.CAP_V4L2
+
+    def negotiate(self):
+        if not self.config.get('fourcc'):
+            self.config = dict(self.config, fourcc='MJPG')
+        super().negotiate()
+
+
+class _PacedSource(FrameSource):
+    """Source generating frames itself, paced to the configured FPS like a real camera."""
+
+    def __init__(self, port, config):
+        super().__init__(port, config)
+        self.fps = float(config.get('fps') or 30)
+        self._opened = False
+        self._next_frame_time = 0.0
+
+    def _wait_next_frame(self):
+        now = time.monotonic()
+        if self._next_frame_time > now:
+            time.sleep(self._next_frame_time - now)
+        self._next_frame_time = max(now, self._next_frame_time) + 1.0 / self.fps
+
+    def is_opened(self):
+        return self._opened
+
+    def release(self):
+        self._opened = False
+
+
+class FileSource(_PacedSource):
+    """
+    Loops over a video file or a folder of images (``path`` setting).
+    """
+    backend = 'file'
+
+    def __init__(self, port, config):
+        super().__init__(port, config)
+        self.path = config.get('path', '')
+        self.cap = None
+        self.images = []
+        self.index = 0
+
+    def open(self):
+        if os.path.isdir(self.path):
+            self.images = sorted(os.path.join(self.path, name) for name in os.listdir(self.path)
+                                 if name.lower().endswith(_IMAGE_EXTENSIONS))
+            self._opened = len(self.images) > 0
+        elif os.path.isfile(self.path):
+            self.cap = cv.VideoCapture(self.path)
+            self._opened = self.cap.isOpened()
+        return self._opened
+
+    def read(self):
+        if not self._opened:
+            return False, None
+        self._wait_next_frame()
+        if self.images:
+            frame = cv.imread(self.images[self.index % len(self.images)])
+            self.index += 1
+            return frame is not None, frame
+
+        ret, frame = self.cap.read()
+        if not ret:  # end of the video, loop
+            self.cap.set(cv.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def release(self):
+        super().release()
+        if self.cap is not None:
+            self.cap.release()
+
+    def capabilities(self):
+        if self.images:
+            h, w = cv.imread(self.images[0]).shape[:2]
+        elif self.cap is not None:
+            w, h = int(self.cap.get(cv.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv.CAP_PROP_FRAME_HEIGHT))
+        else:
+            w = h = 0
+        return {'backend': self.backend, 'width': w, 'height': h, 'fps': self.fps}
+
+
+class SyntheticSource(_PacedSource):
+    """
+    Deterministic generated frames: a gradient background specific to the port, a moving block and the frame index.
+    Frame ``n`` of a port is always the same image. ``open_delay`` and ``switch_delay`` seconds can be configured to
+    mimic the format negotiation of a real device in benchmarks, and ``mjpeg`` to decode every frame from JPEG like
+    an MJPG camera (frame ``n`` is then the decoded frame ``n % MJPEG_FRAMES``).
+    """
+    backend = 'synthetic'
+    MJPEG_FRAMES = 30
+
+    def __init__(self, port, config):
+        super().__init__(port, config)
+        self.width = int(config.get('width') or 640)
+        self.height = int(config.get('height') or 480)
+        self.index = 0
+        self._background = None
+        self._encoded = None
+
+    def open(self):
+        time.sleep(self.config.get('open_delay', 0))
+        self._build_background()
+        self._opened = True
+        return True
+
+    def _build_background(self):
+        rng = np.random.default_rng(self.port)
+        colour = rng.integers(40, 200, 3).astype(np.float32)
+        ramp = np.linspace(0.6, 1.0, self.width, dtype=np.float32)
+        self._background = (ramp[None, :, None] * colour[None, None, :]).astype(np.uint8)
+        self._background = np.repeat(self._background, self.height, axis=0)
+        if self.config.get('mjpeg'):
+            self._encoded = [cv.imencode('.jpg', self.frame(i))[1] for i in range(self.MJPEG_FRAMES)]
+
+    def apply_profile(self, profile):
+        time.sleep(self.config.get('switch_delay', 0))
+        self.width, self.height = int(profile['width']), int(profile['height'])
+        self._build_background()
+        return self.width, self.height
+
+    def frame(self, index):
+        """Generate frame ``index``."""
+        frame = self._background.copy()
+        size = max(8, self.height // 6)
+        x = (index * 7) % max(1, self.width - size)
+        y = (self.height - size) // 2
+        frame[y: y + size, x: x + size] = 255
+        cv.putText(frame, f'{self.port}:{index}', (10, 30), cv.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+        return frame
+
+    def read(self):
+        if not self._opened:
+            return False, None
+        self._wait_next_frame()
+        if self._encoded is not None:
+            frame = cv.imdecode(self._encoded[self.index % self.MJPEG_FRAMES], cv.IMREAD_COLOR)
+        else:
+            frame = self.frame(self.index)
+        self.index += 1
+        return True, frame
+
+    def capabilities(self):
+        return {'backend': self.backend, 'width': self.width, 'height': self.height, 'fps': self.fps}
+
+
+SOURCES = {
+    'any': CaptureDeviceSource,
+    'dshow': DirectShowSource,
+    'v4l2': V4L2Source,
+    'file': FileSource,
+    'synthetic': SyntheticSource,
+}
+
+
+def _auto_backend():
+    if sys.platform.startswith('win'):
+        return 'dshow'
+    if sys.platform.startswith('linux'):
+        return 'v4l2'
+    return 'any'
+
+
+def camera_config(port):
+    """
+    Get the settings of one camera port.
+
+    Args:
+        port (int): Camera port.
+
+    Returns:
+        dict: The ``cameras.default`` settings overridden by ``cameras.overrides[port]``.
+    """
+    cameras = get_settings()['cameras']
+    return dict(cameras['default'], **cameras['overrides'].get(str(port), {}))
+
+
+def create_source(port, config=None):
+    """
+    Create the frame source of a camera port.
+
+    Args:
+        port (int): Camera port.
+        config (dict): Camera settings, defaults to camera_config(port).
+
+    Returns:
+        FrameSource: The (not yet opened) source.
+    """
+    config = camera_config(port) if config is None else config
+    if config.get('process'):
+        from .camera_process import ProcessSource  # imports this module
+        return ProcessSource(port, config)
+    backend = config.get('backend', 'auto')
+    if backend == 'auto':
+        backend = _auto_backend()
+    if backend not in SOURCES:
+        raise ValueError(f'Unknown camera backend: {backend}')
+    return SOURCES[backend](port, config)
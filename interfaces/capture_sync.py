@@ -0,0 +1,99 @@
+"""
+Synchronized snapshot of several cameras.
+
+Reading the cameras one after the other spreads the capture of one laptop over hundreds of milliseconds. Each
+camera thread already keeps its most recent frames with timestamps (see interfaces.frame_buffer), so a snapshot
+picks, for every camera, the buffered frame closest to one common trigger time and reports the remaining
+inter-camera skew. With a burst size above one, the snapshot keeps the sharpest of the first frames delivered after
+the trigger instead (see interfaces.frame_quality).
+
+Classes:
+- Snapshot: Frames selected for one inspection and the measured skew.
+
+Functions:
+- synchronized_snapshot(buffers, trigger, timeout): Select the frame of every camera closest to the trigger time.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import time
+
+from .frame_quality import select_sharpest
+
+
+class Snapshot:
+    """
+    Frames of all cameras selected for one inspection.
+
+    Attributes:
+        trigger (float): Trigger time (time.monotonic).
+        frames (dict): Camera port mapped to the selected Frame.
+        stale_ports (list[int]): Ports that produced no frame after the trigger before the timeout.
+        bursts (dict): Camera port mapped to (selected index, sharpness scores) of its burst.
+    """
+    def __init__(self, trigger, frames, stale_ports, bursts=None):
+        self.trigger = trigger
+        self.frames = frames
+        self.stale_ports = stale_ports
+        self.bursts = {} if bursts is None else bursts
+
+    @property
+    def skew_ms(self):
+        """Spread between the earliest and the latest selected frame, in milliseconds."""
+        if not self.frames:
+            return 0.0
+        timestamps = [frame.timestamp for frame in self.frames.values()]
+        return (max(timestamps) - min(timestamps)) * 1000
+
+    def images(self):
+        """
+        Returns:
+            list[tuple]: (image, camera port) for every camera, ordered by port.
+        """
+        return [(self.frames[port].image, port) for port in sorted(self.frames)]
+
+
+def synchronized_snapshot(buffers, trigger=None, timeout=0.5, burst=1):
+    """
+    Select, for every camera, the buffered frame closest to a common trigger time.
+
+    The function first waits until every camera has delivered a frame after the trigger, so each buffer holds
+    frames on both sides of it, then picks the closest one. With ``burst`` above one, it waits for ``burst`` frames
+    after the trigger and picks the sharpest of them.
+
+    Args:
+        buffers (dict): Camera port mapped to its FrameBuffer.
+        trigger (float): Trigger time (time.monotonic), defaults to now.
+        timeout (float): Maximum waiting time in seconds for a camera to deliver its frames after the trigger.
+        burst (int): Number of frames scored per camera, at most the capacity of the buffers.
+
+    Returns:
+        Snapshot: Selected frames and skew.
+    """
+    trigger = time.monotonic() if trigger is None else trigger
+    deadline = trigger + timeout
+
+    stale_ports = []
+    for port, buffer in buffers.items():
+        frame = buffer.wait_newer(trigger, max(0.0, deadline - time.monotonic()))
+        if frame is None:
+            stale_ports.append(port)
+            continue
+        for _ in range(burst - 1):
+            frame = buffer.wait_newer(frame.timestamp, max(0.0, deadline - time.monotonic()))
+            if frame is None:
+                break
+
+    frames = {}
+    bursts = {}
+    for port, buffer in buffers.items():
+        candidates = buffer.snapshot()
+        after = [frame for frame in candidates if frame.timestamp > trigger][:burst]
+        if burst > 1 and after:
+            selected, scores = select_sharpest([frame.image for frame in after])
+            frames[port] = after[selected]
+            bursts[port] = (selected, scores)
+        elif candidates:
+            frames[port] = min(candidates, key=lambda frame: abs(frame.timestamp - trigger))
+
+    return Snapshot(trigger, frames, stale_ports, bursts)
@@ -0,0 +1,340 @@
+"""
+Daily aggregate report of the inspections.
+
+The records of a date range are streamed from the inspection log (see interfaces.inspection_log) in chunks of
+``chunk_size`` records: every chunk is turned into numpy arrays and added to per-day counters with bincount, so the
+memory used depends on the number of days and categories, not on the number of inspections. The summary gives for
+every day the inspections by grade, the defect classes, the OCR failure rates and the mean duration of every stage
+(per surface), with approximate percentiles of the stage durations over the range from fixed log-spaced histograms.
+It is written as a single HTML page or PDF with charts.
+
+The log keeps the automatic grade of every inspection, before the operator corrects it. The grades of the report are
+therefore taken from the inspection store (see interfaces.inspection_store), the source of record of the laptops
+saved by the operator, with DailyAggregate.set_grades(); the other counters come from the log.
+
+Usage:
+    python -m interfaces.daily_report --start 2026-10-01 --end 2026-10-19 --format html --output dataset/daily.html
+
+Classes:
+- DailyAggregate: Per-day counters of the inspections of a date range.
+
+Functions:
+- aggregate(records, start, end, chunk_size): Aggregate a stream of records.
+- write_html(aggregate, path): Write the summary as an HTML page.
+- write_pdf(aggregate, path): Write the summary as a PDF.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import argparse
+import base64
+import html
+import io
+import itertools
+import os
+from datetime import date
+
+import numpy as np
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from .inspection_log import IDENTIFICATION_FIELDS, get_inspection_log
+from .inspection_store import close_inspection_store, get_inspection_store
+
+try:
+    from matplotlib.figure import Figure  # figures drawn without pyplot, the GUI backend is not touched
+except ImportError:  # matplotlib is optional, the summary is written without charts
+    Figure = None
+
+# edges of the stage duration histograms, in milliseconds
+DURATION_BINS = np.geomspace(1, 10 * 60 * 1000, 241)
+
+
+class DailyAggregate:
+    """
+    Per-day counters of the inspections of a date range.
+
+    Attributes:
+        start (date): First day.
+        days (list[date]): Every day of the range.
+        inspections (numpy.ndarray): Inspections per day.
+        grades (dict): Grade mapped to the inspections per day.
+        defects (dict): Defect class mapped to the defects per day.
+        ocr_failed (dict): Identification field mapped to the inspections per day where it was not read.
+        stage_sum (dict): Stage mapped to the total duration per day, in milliseconds.
+        stage_count (dict): Stage mapped to the runs per day.
+        stage_hist (dict): Stage mapped to the histogram of its durations over the range (see DURATION_BINS).
+    """
+    def __init__(self, start, end):
+        self.start = start
+        self.days = [date.fromordinal(d) for d in range(start.toordinal(), end.toordinal() + 1)]
+        self._start64 = np.datetime64(start.isoformat(), 'D')
+        self.inspections = self._zeros()
+        self.grades = {}
+        self.defects = {}
+        self.ocr_failed = {field: self._zeros() for field in IDENTIFICATION_FIELDS}
+        self.stage_sum = {}
+        self.stage_count = {}
+        self.stage_hist = {}
+
+    def _zeros(self):
+        return np.zeros(len(self.days), dtype=np.float64)
+
+    def _count(self, counters, name, day, weights=None):
+        counter = counters.get(name)
+        if counter is None:
+            counter = counters[name] = self._zeros()
+        counter += np.bincount(day, weights=weights, minlength=len(self.days))
+
+    def add(self, records):
+        """Add a chunk of records, counted with vectorized operations."""
+        if not records:
+            return
+        day = (np.array([r['time'][:10] for r in records], dtype='datetime64[D]') - self._start64).astype(np.int64)
+        valid = (day >= 0) & (day < len(self.days))
+        if not valid.all():
+            records = list(itertools.compress(records, valid))
+            day = day[valid]
+            if not records:
+                return
+        self.inspections += np.bincount(day, minlength=len(self.days))
+
+        grades = np.array([r.get('grade') or '?' for r in records])
+        for grade in np.unique(grades):
+            self._count(self.grades, str(grade), day[grades == grade])
+
+        for cls in set(itertools.chain.from_iterable(r.get('defects', {}) for r in records)):
+            self._count(self.defects, cls, day, np.array([r.get('defects', {}).get(cls, 0) for r in records],
+                                                         dtype=np.float64))
+
+        for field in IDENTIFICATION_FIELDS:
+            failed = np.array([field in r.get('ocr_failed', ()) for r in records])
+            self.ocr_failed[field] += np.bincount(day[failed], minlength=len(self.days))
+
+        for stage in set(itertools.chain.from_iterable(r.get('stage_ms', {}) for r in records)):
+            ms = np.array([r.get('stage_ms', {}).get(stage, np.nan) for r in records], dtype=np.float64)
+            ran = ~np.isnan(ms)
+            self._count(self.stage_sum, stage, day[ran], ms[ran])
+            self._count(self.stage_count, stage, day[ran])
+            hist = self.stage_hist.setdefault(stage, np.zeros(len(DURATION_BINS) - 1))
+            hist += np.histogram(np.clip(ms[ran], DURATION_BINS[0], DURATION_BINS[-1]), DURATION_BINS)[0]
+
+    def set_grades(self, counts):
+        """
+        Replace the grades of the log by the grades saved by the operator.
+
+        Args:
+            counts (iterable[tuple]): (day YYYY-MM-DD, grade, laptops), see InspectionStore.grades_per_day().
+        """
+        self.grades = {}
+        for day, grade, n in counts:
+            index = date.fromisoformat(day).toordinal() - self.start.toordinal()
+            if 0 <= index < len(self.days):
+                counter = self.grades.setdefault(grade or '?', self._zeros())
+                counter[index] += n
+
+    def percentile(self, stage, q):
+        """Approximate percentile of the durations of a stage over the range (upper edge of its histogram bin)."""
+        hist = self.stage_hist[stage]
+        if hist.sum() == 0:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(hist), hist.sum() * q / 100))
+        return float(DURATION_BINS[min(index + 1, len(DURATION_BINS) - 1)])
+
+    def stage_mean(self, stage):
+        """Mean duration of a stage per day, NaN on the days it did not run."""
+        count = self.stage_count[stage]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.stage_sum[stage] / count
+
+    def rows(self):
+        """
+        Returns:
+            list[dict]: Summary of every day with inspections: 'day', 'inspections', grades, defect classes,
+            'ocr_failed' rates and mean 'stage_ms'.
+        """
+        rows = []
+        for i in np.flatnonzero(self.inspections):
+            n = self.inspections[i]
+            rows.append({
+                'day': self.days[i].isoformat(),
+                'inspections': int(n),
+                'grades': {grade: int(c[i]) for grade, c in sorted(self.grades.items())},
+                'defects': {cls: int(c[i]) for cls, c in sorted(self.defects.items())},
+                'ocr_failed': {field: c[i] / n for field, c in self.ocr_failed.items()},
+                'stage_ms': {stage: float(self.stage_mean(stage)[i]) for stage in sorted(self.stage_sum)
+                             if self.stage_count[stage][i]},
+            })
+        return rows
+
+    def stages(self):
+        """
+        Returns:
+            list[tuple]: (stage, runs, mean, p50, p95) over the range, durations in milliseconds.
+        """
+        stages = []
+        for stage in sorted(self.stage_sum):
+            runs = self.stage_count[stage].sum()
+            stages.append((stage, int(runs), float(self.stage_sum[stage].sum() / max(runs, 1)),
+                           self.percentile(stage, 50), self.percentile(stage, 95)))
+        return stages
+
+
+def aggregate(records, start, end, chunk_size=10000):
+    """
+    Aggregate a stream of records.
+
+    Args:
+        records (iterable[dict]): Inspection records (see interfaces.inspection_log.inspection_record).
+        start (date): First day of the summary.
+        end (date): Last day of the summary.
+        chunk_size (int): Records converted to arrays at a time.
+
+    Returns:
+        DailyAggregate: The counters.
+    """
+    result = DailyAggregate(start, end)
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return result
+        result.add(chunk)
+
+
+def _charts(summary):
+    """PNG charts of the summary: grades per day, defect classes, OCR failure rates and stage durations."""
+    if Figure is None or not summary.inspections.any():
+        return []
+    days = [day.isoformat()[5:] for day in summary.days]
+    charts = []
+
+    fig = Figure(figsize=(8, 3))
+    ax = fig.subplots()
+    bottom = np.zeros(len(days))
+    for grade, counts in sorted(summary.grades.items()):
+        ax.bar(days, counts, bottom=bottom, label=grade)
+        bottom += counts
+    ax.set_title('Inspections per day by grade')
+    ax.legend()
+    charts.append(fig)
+
+    fig = Figure(figsize=(8, 3))
+    ax = fig.subplots()
+    classes = sorted(summary.defects)
+    ax.bar(classes, [summary.defects[cls].sum() for cls in classes])
+    ax.set_title('Defect classes')
+    charts.append(fig)
+
+    fig = Figure(figsize=(8, 3))
+    ax = fig.subplots()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for field, failed in summary.ocr_failed.items():
+            ax.plot(days, 100 * failed / summary.inspections, marker='o', label=field)
+    ax.set_title('OCR failure rate per day (%)')
+    ax.legend()
+    charts.append(fig)
+
+    stages = summary.stages()
+    if stages:
+        fig = Figure(figsize=(8, 3))
+        ax = fig.subplots()
+        names = [stage for stage, *_ in stages]
+        ax.bar(names, [mean for _, _, mean, _, _ in stages], label='mean')
+        ax.scatter(names, [p95 for *_, p95 in stages], color='black', label='p95', zorder=3)
+        ax.set_title('Stage durations (ms)')
+        ax.legend()
+        charts.append(fig)
+
+    images = []
+    for fig in charts:
+        fig.autofmt_xdate()
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=100)
+        images.append(buffer.getvalue())
+    return images
+
+
+def _title(summary):
+    return f'Inspections from {summary.days[0].isoformat()} to {summary.days[-1].isoformat()}'
+
+
+def _row_text(row):
+    grades = ', '.join(f'{grade}: {count}' for grade, count in row['grades'].items())
+    defects = ', '.join(f'{cls}: {count}' for cls, count in row['defects'].items()) or 'none'
+    ocr = ', '.join(f'{field} {rate:.0%}' for field, rate in row['ocr_failed'].items())
+    return f"{row['day']}: {row['inspections']} laptops ({grades}), defects {defects}, OCR failed {ocr}"
+
+
+def write_html(summary, path):
+    """Write the summary as a single HTML page, charts embedded."""
+    lines = ['<!DOCTYPE html><html><head><meta charset="utf-8">',
+             f'<title>{_title(summary)}</title></head><body>', f'<h1>{_title(summary)}</h1>',
+             f'<p>{int(summary.inspections.sum())} inspections</p>']
+    for png in _charts(summary):
+        lines.append(f'<img src="data:image/png;base64,{base64.b64encode(png).decode()}">')
+    lines.append('<h2>Stages</h2><table><tr><th>Stage</th><th>Runs</th><th>Mean (ms)</th><th>p50</th><th>p95</th></tr>')
+    for stage, runs, mean, p50, p95 in summary.stages():
+        lines.append(f'<tr><td>{html.escape(stage)}</td><td>{runs}</td><td>{mean:.0f}</td><td>{p50:.0f}</td>'
+                     f'<td>{p95:.0f}</td></tr>')
+    lines.append('</table><h2>Days</h2>')
+    lines += [f'<p>{html.escape(_row_text(row))}</p>' for row in summary.rows()]
+    lines.append('</body></html>')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+def write_pdf(summary, path):
+    """Write the summary as a PDF, charts first."""
+    c = canvas.Canvas(path, pagesize=letter)
+    width, height = letter
+    y_position = height - 50
+
+    def line(text):
+        nonlocal y_position
+        if y_position < 60:
+            c.showPage()
+            y_position = height - 50
+        c.drawString(50, y_position, text)
+        y_position -= 16
+
+    line(_title(summary))
+    line(f'{int(summary.inspections.sum())} inspections')
+    for png in _charts(summary):
+        reader = ImageReader(io.BytesIO(png))
+        w, h = reader.getSize()
+        display_height = 500 * h / w
+        if y_position - display_height < 60:
+            c.showPage()
+            y_position = height - 50
+        c.drawImage(reader, 50, y_position - display_height, width=500, height=display_height)
+        y_position -= display_height + 10
+    for stage, runs, mean, p50, p95 in summary.stages():
+        line(f'{stage}: {runs} runs, mean {mean:.0f}ms, p50 {p50:.0f}ms, p95 {p95:.0f}ms')
+    for row in summary.rows():
+        line(_row_text(row))
+    c.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Daily aggregate report of the inspections.')
+    parser.add_argument('--start', required=True, help='first day, YYYY-MM-DD')
+    parser.add_argument('--end', default=date.today().isoformat(), help='last day, YYYY-MM-DD')
+    parser.add_argument('--format', choices=['html', 'pdf'], default='html')
+    parser.add_argument('--output', help='path of the summary, dataset/daily_<start>_<end>.<format> by default')
+    args = parser.parse_args()
+
+    start, end = date.fromisoformat(args.start), date.fromisoformat(args.end)
+    summary = aggregate(get_inspection_log().iter_records(args.start, args.end), start, end)
+    summary.set_grades(get_inspection_store().grades_per_day(args.start, args.end))
+    close_inspection_store()
+    output = args.output or os.path.join(os.path.dirname(get_inspection_log().path),
+                                         f'daily_{args.start}_{args.end}.{args.format}')
+    (write_html if args.format == 'html' else write_pdf)(summary, output)
+    print(f'Summary of {int(summary.inspections.sum())} inspections saved to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Debug image sink for the detection pipeline.
+
+Intermediate crops and thresholded images used to be displayed with ``cv.imshow`` followed by ``cv.waitKey``, which
+blocked the inspection until someone pressed a key and broke headless runs. Detection functions now record those
+images into a sink that never blocks the caller.
+
+Modes (``debug.mode`` setting):
+- off: images are discarded, the pipeline runs fully unattended.
+- disk: images go into a bounded ring buffer written to disk by a background thread. When the writer falls behind,
+  the oldest images are dropped instead of stalling detection.
+- qt: images are emitted through a Qt signal to a non-modal viewer (see widgets.debug_viewer.DebugViewer).
+
+Classes:
+- DebugSink: Sink discarding every image (mode off).
+- DiskDebugSink: Ring buffer flushed to disk by a background thread.
+- QtDebugSink: Sink emitting images to the GUI thread.
+
+Functions:
+- configure_debug_sink(mode, **kwargs): Replace the sink used by the pipeline.
+- get_debug_sink(): Return the sink used by the pipeline.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import cv2 as cv
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .settings import get_settings
+
+_root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class DebugSink:
+    """Sink discarding every image, used when debugging is off."""
+    mode = 'off'
+
+    def record(self, name, image):
+        """
+        Record an intermediate image.
+
+        Args:
+            name (str): Short name of the image (e.g. 'lot', 'serial').
+            image (numpy.ndarray): Image to record.
+        """
+        pass
+
+    def close(self):
+        pass
+
+
+class DiskDebugSink(DebugSink):
+    """
+    Ring buffer of debug images written to disk by a background thread.
+
+    Attributes:
+        directory (str): Directory where images are written.
+        capacity (int): Maximum number of images waiting to be written.
+        dropped (int): Number of images dropped because the buffer was full.
+        written (int): Number of images written to disk.
+    """
+    mode = 'disk'
+
+    def __init__(self, directory, capacity=64):
+        self.directory = directory
+        self.capacity = capacity
+        self.dropped = 0
+        self.written = 0
+        self._buffer = deque(maxlen=capacity)
+        self._condition = threading.Condition()
+        self._running = True
+        self._seq = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._writer = threading.Thread(target=self._write_loop, name='DebugSinkWriter', daemon=True)
+        self._writer.start()
+
+    def record(self, name, image):
+        if image is None:
+            return
+        with self._condition:
+            if len(self._buffer) == self.capacity:
+                self.dropped += 1
+            self._seq += 1
+            # copy, the caller may keep drawing on the image
+            self._buffer.append((self._seq, time.time(), name, np.copy(image)))
+            self._condition.notify()
+
+    def _write_loop(self):
+        while True:
+            with self._condition:
+                while self._running and not self._buffer:
+                    self._condition.wait()
+                if not self._buffer:
+                    return
+                seq, timestamp, name, image = self._buffer.popleft()
+
+            stamp = time.strftime('%Y%m%d%H%M%S', time.localtime(timestamp))
+            cv.imwrite(os.path.join(self.directory, f'{stamp}_{seq:06d}_{name}.png'), image)
+            self.written += 1
+
+    def flush(self, timeout=5.0):
+        """Wait until every buffered image has been written."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._condition:
+                if not self._buffer:
+                    break
+            time.sleep(0.005)
+
+    def close(self):
+        """Write the remaining images and stop the writer thread."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._writer.join()
+
+
+class QtDebugSink(QObject, DebugSink):
+    """
+    Sink emitting every image to the GUI thread through ``image_recorded``.
+
+    The signal is queued across threads, so detection never waits for the viewer.
+    """
+    mode = 'qt'
+    image_recorded = pyqtSignal(str, object)
+
+    def __init__(self):
+        super().__init__()
+
+    def record(self, name, image):
+        if image is not None:
+            self.image_recorded.emit(name, np.copy(image))
+
+
+_debug_sink = None
+_debug_sink_lock = threading.Lock()
+
+
+def _create_sink(mode, **kwargs):
+    settings = get_settings()['debug']
+    if mode == 'off':
+        return DebugSink()
+    if mode == 'disk':
+        directory = kwargs.get('directory', os.path.join(_root_dir, settings['directory']))
+        return DiskDebugSink(directory, kwargs.get('capacity', settings['capacity']))
+    if mode == 'qt':
+        return QtDebugSink()
+    raise ValueError(f'Unknown debug sink mode: {mode}')
+
+
+def configure_debug_sink(mode=None, **kwargs):
+    """
+    Replace the sink used by the detection pipeline.
+
+    Args:
+        mode (str): 'off', 'disk' or 'qt'. Defaults to the ``debug.mode`` setting.
+        **kwargs: ``directory`` and ``capacity`` for the disk sink.
+
+    Returns:
+        DebugSink: The new sink.
+    """
+    global _debug_sink
+    sink = _create_sink(mode or get_settings()['debug']['mode'], **kwargs)
+    with _debug_sink_lock:
+        previous, _debug_sink = _debug_sink, sink
+    if previous is not None:
+        previous.close()
+    return sink
+
+
+def get_debug_sink():
+    """
+    Get the sink used by the detection pipeline, configuring it from the settings on first use.
+
+    Returns:
+        DebugSink: The current sink.
+    """
+    global _debug_sink
+    with _debug_sink_lock:
+        if _debug_sink is None:
+            _debug_sink = _create_sink(get_settings()['debug']['mode'])
+        return _debug_sink
@@ -19,17 +19,20 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import cv2 as cv
 import numpy as np
 import random
-import pytesseract
 from exceptions.detection_exceptions import (LotNumberNotFoundException, LogoNotFoundException,
                                              SerialNumberNotFoundException, BarcodeNotFoundException, 
                                              AssetNumberNotFoundException)
 
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-
 from sahi import AutoDetectionModel
 from sahi.predict import get_sliced_prediction
 from ultralytics import YOLO
 from .classes import Defect
+from .ocr import get_ocr_service, read_field
+from .fields import normalize_field, validate_field
+from .ocr_preprocess import build_variants
+from .debug_sink import get_debug_sink
+from .barcode import read_barcode_fields, identification_stats
+from .settings import get_settings
 import threading
 import time
 
@@ -39,83 +42,113 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 models_dir_path = os.path.join(script_dir, '../models')
 
 
-def detect_lot_asset_barcode(original_img, model):
+def detect_lot_asset_barcode(original_img, model, sources=None, thorough_ocr=True):
     """
        Detects lot number, asset number, and barcode in the image using a YOLO model.
 
+       The barcode is decoded first; OCR is only run on the lot/asset crops for the fields the barcode did not
+       provide. The path that produced each field is recorded in ``identification_stats``.
+
        Args:
            original_img: The input image.
-           detection_model: YOLO model for detection.
-           classes: List of class names the model can detect (e.g., ['lot number', 'asset number', 'barcode']).
+           model: YOLO model detecting the 'lot', 'asset' and 'barcode' classes.
+           sources (dict): Optional, filled with the path ('barcode', 'ocr' or 'missing') that produced each field.
+           thorough_ocr (bool): Fall back to the candidate OCR variants when the first variant fails.
 
        Returns:
-           Dictionary containing detected lot number, asset number, and barcode images or extracted text.
+           tuple: Detected lot number and asset number.
        """
     print(f"detect_lot_asset_barcode running in thread: {threading.current_thread().name}")
-    lot, asset = '', ''
     results = model(original_img)
     classes = list(model.names.values())
     print(classes)
-    classes_ids = [classes.index(cls) for cls in classes]
     asset_id = classes.index('asset')
     lot_id = classes.index('lot')
     barcode_id = classes.index('barcode')
+    crops = {}
     for box in results[0].boxes:
         cls_id = int(box.cls[0].item())  # Class ID as integer
         x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())  # Bounding box coordinates
-        detected_region = original_img[y1-2: y2+2, x1-2: x2+2]  # Crop the detected region
-        if cls_id == asset_id:
-            asset = process_asset_number(detected_region)
-        elif cls_id == lot_id:
-            lot = process_lot_number(detected_region)
-        # elif cls_id == barcode_id:
-        #     process_barcode(detected_region)
-
+        detected_region = original_img[max(y1 - 2, 0): y2 + 2, max(x1 - 2, 0): x2 + 2]  # Crop the detected region
+        crops[cls_id] = detected_region
+
+    start = time.perf_counter()
+    values = process_barcode(crops[barcode_id]) if barcode_id in crops else {}
+    barcode_ms = (time.perf_counter() - start) * 1000
+
+    readers = {'lot': (lot_id, process_lot_number), 'asset': (asset_id, process_asset_number)}
+    sources = {} if sources is None else sources
+    for field, (cls_id, process) in readers.items():
+        start = time.perf_counter()
+        if values.get(field) and validate_field(field, normalize_field(values[field])):
+            sources[field] = 'barcode'
+            elapsed = barcode_ms
+        elif cls_id in crops:
+            values[field] = process(crops[cls_id], thorough_ocr)
+            sources[field] = 'ocr'
+            elapsed = (time.perf_counter() - start) * 1000
+        else:  # a value rejected by the validation is not kept
+            values.pop(field, None)
+            elapsed = 0.0
+        if not values.get(field):
+            sources[field] = 'missing'
+        identification_stats.record(field, sources[field], elapsed)
+
+    lot, asset = values.get('lot', ''), values.get('asset', '')
     if lot is None or len(lot) == 0:
         raise LotNumberNotFoundException()
     if asset is None or len(asset) == 0:
         raise AssetNumberNotFoundException()
-    # if asset is None:
 
     return lot, asset
 
 
-def process_lot_number(lot_img):
+def fixed_threshold(gray_img, thresh=200, maxval=250):
+    _, thresh_img = cv.threshold(gray_img, thresh, maxval, cv.THRESH_BINARY)
+    return thresh_img
+
+
+def otsu_threshold(gray_img, maxval=255):
+    _, thresh_img = cv.threshold(gray_img, 0, maxval, cv.THRESH_BINARY + cv.THRESH_OTSU)
+    return thresh_img
+
+
+# OCR preprocessing tried first, the candidate variants of build_variants are only built when it fails
+LABEL_OCR_VARIANTS = [('fixed', fixed_threshold)]
+SERIAL_OCR_VARIANTS = [('otsu', lambda gray_img: otsu_threshold(gray_img, 220))]
+
+
+def process_lot_number(lot_img, thorough_ocr=True):
     """Processes the lot number region."""
     gray_img = cv.cvtColor(lot_img, cv.COLOR_BGR2GRAY)
-    _, thresh = cv.threshold(gray_img, 200, 250, cv.THRESH_BINARY)
-
-    cv.imshow("Lot Image", thresh)
-    cv.waitKey()
-    cv.destroyAllWindows()
-    lot_number = pytesseract.image_to_string(thresh)
+    lot_number = read_field(gray_img, 'lot', LABEL_OCR_VARIANTS, candidates=build_variants if thorough_ocr else None)
     print(f"Detected lot number: {lot_number}")
 
     return lot_number
 
 
-def process_asset_number(asset_img):
+def process_asset_number(asset_img, thorough_ocr=True):
     """Processes the asset number region."""
     gray_img = cv.cvtColor(asset_img, cv.COLOR_BGR2GRAY)
-    _, thresh = cv.threshold(gray_img, 200, 250, cv.THRESH_BINARY)
-
-    cv.imshow("asset Image", thresh)
-    cv.waitKey()
-    cv.destroyAllWindows()
-    asset_number = pytesseract.image_to_string(thresh)
+    asset_number = read_field(gray_img, 'asset', LABEL_OCR_VARIANTS,
+                              candidates=build_variants if thorough_ocr else None)
     print(f"Detected asset number: {asset_number}")
 
     return asset_number
 
 
 def process_barcode(barcode_img):
-    """Processes the barcode region."""
-    # You can use specialized barcode reading libraries (e.g., `pyzbar` or `pytesseract`)
-    cv.imshow("Barcode Image", barcode_img)
-    cv.waitKey()
-    cv.destroyAllWindows()
+    """
+    Processes the barcode region.
+
+    Returns:
+        dict: Label fields ('lot', 'asset') decoded from the barcode, empty if it could not be decoded.
+    """
+    get_debug_sink().record('barcode', barcode_img)
+    fields = read_barcode_fields(barcode_img)
+    print(f"Decoded barcode fields: {fields}")
 
-    return barcode_img
+    return fields
 
 
 def detect_keyboard(original_img, model):
@@ -188,7 +221,7 @@ def detect_keyboard(original_img, model):
     # return original_img
 
 
-def segment_with_sahi(original_img, num_blocks, model):
+def segment_with_sahi(original_img, num_blocks, model, image_size=None):
     laptop_model_path = os.path.join(models_dir_path, 'laptop.pt')
     laptop_model = YOLO(laptop_model_path)
 
@@ -205,6 +238,7 @@ def segment_with_sahi(original_img, num_blocks, model):
         model=model,
         confidence_threshold=0.3,
         device='cuda',
+        image_size=image_size,
     )
 
     h, w = laptop_region_img.shape[:2]
@@ -277,7 +311,8 @@ def segment_with_sahi(original_img, num_blocks, model):
     # time.sleep(10)
     # cv.destroyAllWindows()
     detected_img = laptop_region_img
-    detected_img = draw_multiple_rectangles(laptop_region_img)
+    if get_settings()['detection']['manual_annotation']:
+        detected_img = draw_multiple_rectangles(laptop_region_img)
     # if scratch_count == 0 or stain_count == 0:
     #     detected_img = draw_multiple_rectangles(original_img)
     # else:
@@ -366,9 +401,7 @@ def detect_barcode(original_img, barcode_model):
 
     x1, y1, x2, y2 = map(int, xyxy_list)
     barcode_img = original_img[y1: y2, x1: x2]
-    cv.imshow('barcode', barcode_img)
-    cv.waitKey()
-    cv.destroyAllWindows()
+    get_debug_sink().record('barcode', barcode_img)
 
 
 def detect_logo(original_img, logo_model):
@@ -406,17 +439,15 @@ def detect_lot(original_img, ocr_model):
 
     # sharpened = cv.filter2D(gray_img, -1, high_pass_kernel)
     _, thresh = cv.threshold(gray_img, 150, 200, cv.THRESH_BINARY)
-    cv.imshow('Lot image', thresh)
-    cv.waitKey()
-    cv.destroyAllWindows()
+    get_debug_sink().record('lot', thresh)
 
-    lot_number = pytesseract.image_to_string(thresh)
+    lot_number = get_ocr_service().read(thresh, 'lot')
     print(f'lot number: {lot_number}')
 
     return lot_number
 
 
-def detect_serial(img, ser_region_model, ser_model):
+def detect_serial(img, ser_region_model, ser_model, thorough_ocr=True):
     if img is None:
         print(f'Image is None')
         return
@@ -448,18 +479,15 @@ def detect_serial(img, ser_region_model, ser_model):
     # cv.waitKey()
     # cv.destroyAllWindows()
 
+    get_debug_sink().record('serial_crop', serial_img)
+
     gray_img = cv.cvtColor(serial_img, cv.COLOR_BGR2GRAY)
     # high_pass_kernel = np.array([[0, -1, 0],
     #                              [-1, 5, -1],
     #                              [0, -1, 0]])
 
     # sharpened = cv.filter2D(gray_img, -1, high_pass_kernel)
-    _, thresh = cv.threshold(gray_img, 180, 220, cv.THRESH_BINARY + cv.THRESH_OTSU)
-    cv.imshow('serial', thresh)
-    cv.waitKey()
-    cv.destroyAllWindows()
-
-    serial = pytesseract.image_to_string(thresh)
+    serial = read_field(gray_img, 'serial', SERIAL_OCR_VARIANTS, candidates=build_variants if thorough_ocr else None)
     print(f'serial: {serial}')
 
     return serial
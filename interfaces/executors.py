@@ -0,0 +1,151 @@
+"""
+Execution pools of the application.
+
+Model calls, blocking I/O and OCR do not share one default thread pool: a report being written or an upload waiting on
+the network must not hold a thread the next inference needs, and the pool running the models is kept small since
+torch and OpenCV already spread every operation over their own intra-op threads (see
+interfaces.resource_governor.limit_inference_threads).
+
+- 'cpu': model calls (identification, segmentation), sized to the physical cores by default,
+- 'io': disk and network (frame capture waits, images, PDF reports, CSV appends, uploads),
+- 'ocr': concurrent OCR reads of the candidate crops, sized to the OCR engine pool by default.
+
+Every pool counts its queued and running tasks and its busy time, so a saturated pool shows in metrics().
+
+Classes:
+- InstrumentedExecutor: ThreadPoolExecutor recording queue depth, utilization and waiting times.
+
+Functions:
+- get_executor(name): The shared pool of a kind of work, created from the ``executors`` settings on first use.
+- executor_metrics(): Metrics of every pool created.
+- executors_report(): One line of metrics per pool.
+- shutdown_executors(): Shut every pool down.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .settings import get_settings
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, count the logical cores instead
+    psutil = None
+
+
+def physical_cores():
+    cores = psutil.cpu_count(logical=False) if psutil is not None else None
+    return cores or os.cpu_count() or 1
+
+
+class InstrumentedExecutor(ThreadPoolExecutor):
+    """
+    Thread pool recording its load.
+
+    Attributes:
+        name (str): Name of the pool, prefix of its threads.
+        workers (int): Maximum number of threads.
+    """
+    def __init__(self, name, workers):
+        super().__init__(max_workers=workers, thread_name_prefix=name)
+        self.name = name
+        self.workers = workers
+        self.created = time.perf_counter()
+        self._queued = 0
+        self._running = 0
+        self._max_queued = 0
+        self._completed = 0
+        self._busy = 0.0
+        self._wait = 0.0
+        self._metrics_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._metrics_lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        return super().submit(self._measured, time.perf_counter(), fn, args, kwargs)
+
+    def _measured(self, submitted, fn, args, kwargs):
+        start = time.perf_counter()
+        with self._metrics_lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait += start - submitted
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._metrics_lock:
+                self._running -= 1
+                self._completed += 1
+                self._busy += time.perf_counter() - start
+
+    def metrics(self):
+        """
+        Returns:
+            dict: 'workers', 'queued' tasks waiting for a thread, 'max_queued', 'running', 'completed',
+            'utilization' (busy time of the threads over their available time since the pool was created) and
+            'mean_wait_ms' spent queued by the completed tasks.
+        """
+        with self._metrics_lock:
+            elapsed = max(time.perf_counter() - self.created, 1e-9)
+            return {'workers': self.workers, 'queued': self._queued, 'max_queued': self._max_queued,
+                    'running': self._running, 'completed': self._completed,
+                    'utilization': self._busy / (elapsed * self.workers),
+                    'mean_wait_ms': self._wait / self._completed * 1000 if self._completed else 0.0}
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _pool_size(name):
+    settings = get_settings()['executors']
+    if name == 'cpu':
+        return settings['cpu_workers'] or physical_cores()
+    if name == 'io':
+        return settings['io_workers'] or 4
+    if name == 'ocr':
+        return settings['ocr_workers'] or get_settings()['ocr']['pool_size']
+    raise ValueError(f'Unknown executor {name!r}, expected cpu, io or ocr')
+
+
+def get_executor(name):
+    """
+    Args:
+        name (str): 'cpu', 'io' or 'ocr'.
+
+    Returns:
+        InstrumentedExecutor: The pool shared by the application for this kind of work.
+    """
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = _executors[name] = InstrumentedExecutor(name, max(1, _pool_size(name)))
+        return executor
+
+
+def executor_metrics():
+    with _executors_lock:
+        return {name: executor.metrics() for name, executor in _executors.items()}
+
+
+def executors_report():
+    lines = []
+    for name, m in executor_metrics().items():
+        lines.append(f"Executor {name}: {m['running']}/{m['workers']} running, {m['queued']} queued "
+                     f"(max {m['max_queued']}), {m['completed']} done, utilization {m['utilization']:.0%}, "
+                     f"mean wait {m['mean_wait_ms']:.1f}ms")
+    return '\n'.join(lines) or 'Executors: none started'
+
+
+def shutdown_executors(wait=True):
+    """Shut every pool down, the next get_executor() creates a new one."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
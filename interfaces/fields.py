@@ -0,0 +1,94 @@
+"""
+Validation of the identification fields read from a laptop label.
+
+Each field (lot, asset, serial) is described in the ``fields`` settings by its allowed length, character set,
+an optional regular expression and an optional check digit algorithm. OCR and barcode results are normalized and
+validated against these rules, so a plausible string can be accepted immediately and an implausible one retried.
+
+Functions:
+- normalize_field(text): Remove whitespace and upper-case an OCR or barcode result.
+- validate_field(field, text): Check a normalized value against the rules of its field.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import re
+
+from .settings import get_settings
+
+
+def _luhn_valid(value):
+    """Luhn (mod 10) check digit, the last digit is the check digit."""
+    if not value.isdigit():
+        return False
+    total = 0
+    for i, ch in enumerate(reversed(value)):
+        digit = int(ch)
+        if i % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+def _mod10_weighted_valid(value):
+    """GS1 (EAN/UPC) mod 10 check digit with alternating 3/1 weights."""
+    if not value.isdigit() or len(value) < 2:
+        return False
+    body, check = value[:-1], int(value[-1])
+    total = sum(int(ch) * (3 if i % 2 == 0 else 1) for i, ch in enumerate(reversed(body)))
+    return (10 - total % 10) % 10 == check
+
+
+CHECK_DIGITS = {
+    'luhn': _luhn_valid,
+    'gs1': _mod10_weighted_valid,
+}
+
+
+def normalize_field(text):
+    """
+    Normalize an OCR or barcode result.
+
+    Args:
+        text (str): Raw text.
+
+    Returns:
+        str: Text without whitespace, upper-cased.
+    """
+    return re.sub(r'\s+', '', text or '').upper()
+
+
+def validate_field(field, text):
+    """
+    Check a value against the rules of its field.
+
+    Args:
+        field (str): Field name ('lot', 'asset', 'serial').
+        text (str): Normalized value.
+
+    Returns:
+        bool: True if the value satisfies every rule, fields without rules only need to be non-empty.
+    """
+    if not text:
+        return False
+    rules = get_settings()['fields'].get(field)
+    if not rules:
+        return True
+
+    if not rules.get('min_length', 1) <= len(text) <= rules.get('max_length', len(text)):
+        return False
+    charset = rules.get('charset')
+    if charset and any(ch not in charset for ch in text):
+        return False
+    pattern = rules.get('pattern')
+    if pattern and re.fullmatch(pattern, text) is None:
+        return False
+    check_digit = rules.get('check_digit')
+    if check_digit:
+        if check_digit not in CHECK_DIGITS:
+            raise ValueError(f'Unknown check digit algorithm: {check_digit}')
+        if not CHECK_DIGITS[check_digit](text):
+            return False
+    return True
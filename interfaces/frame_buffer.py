@@ -0,0 +1,98 @@
+"""
+Ring buffer of the most recent camera frames.
+
+The camera thread is the only reader of its capture device. It pushes every decoded frame into a FrameBuffer,
+and any other thread (GUI, capture, detection) takes frames from the buffer without touching the device.
+
+Classes:
+- Frame: A decoded frame with its capture timestamp (time.monotonic) and sequence number.
+- FrameBuffer: Thread-safe ring buffer of the most recent frames.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import threading
+import time
+from collections import deque, namedtuple
+
+Frame = namedtuple('Frame', ['image', 'timestamp', 'seq'])
+
+
+class FrameBuffer:
+    """
+    Thread-safe ring buffer of the most recent frames of one camera.
+
+    Frames are never modified after being pushed, readers get references and copy them when they need to draw.
+
+    Attributes:
+        capacity (int): Number of frames kept.
+    """
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self._frames = deque(maxlen=capacity)
+        self._condition = threading.Condition()
+        self._seq = 0
+
+    def push(self, image, timestamp=None):
+        """
+        Add a decoded frame, dropping the oldest one when the buffer is full.
+
+        Args:
+            image (numpy.ndarray): Decoded frame.
+            timestamp (float): Capture time (time.monotonic), defaults to now.
+
+        Returns:
+            Frame: The stored frame.
+        """
+        with self._condition:
+            self._seq += 1
+            frame = Frame(image, time.monotonic() if timestamp is None else timestamp, self._seq)
+            self._frames.append(frame)
+            self._condition.notify_all()
+            return frame
+
+    def latest(self):
+        """
+        Returns:
+            Frame: The newest frame, None if the buffer is empty.
+        """
+        with self._condition:
+            return self._frames[-1] if self._frames else None
+
+    def wait_newer(self, timestamp, timeout=1.0):
+        """
+        Wait for the first frame captured after a given time.
+
+        Args:
+            timestamp (float): Trigger time (time.monotonic).
+            timeout (float): Maximum waiting time in seconds.
+
+        Returns:
+            Frame: The first frame newer than ``timestamp``, None on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                for frame in self._frames:
+                    if frame.timestamp > timestamp:
+                        return frame
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+    def snapshot(self):
+        """
+        Returns:
+            list[Frame]: Every buffered frame, oldest first.
+        """
+        with self._condition:
+            return list(self._frames)
+
+    def clear(self):
+        with self._condition:
+            self._frames.clear()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._frames)
@@ -0,0 +1,138 @@
+"""
+Time budget of the detection of one laptop.
+
+On busy shifts a slightly less thorough inspection is preferred to a slow one. With a budget, every stage of the
+detection (identification, segmentation of each surface, report) picks the most thorough of its options whose
+estimated cost still leaves enough time for the cheapest options of the stages after it:
+
+- segmentation: 'full' (2x2 SAHI slices), 'reduced' (a single slice), 'minimal' (a single slice at a smaller
+  inference size), or 'skip' for the optional surfaces,
+- identification: OCR with the candidate variants fallback, or 'fast' without it.
+
+Costs are not configured per station but measured: StageCosts keeps an exponentially weighted moving average of the
+duration of every option, starting from rough priors. Every option other than the first one of a stage is recorded
+as a degradation in the inspection results and in the report.
+
+Classes:
+- StageCosts: Online cost model of the stage options.
+- InspectionBudget: Option choice of one inspection under a time budget.
+
+Functions:
+- get_stage_costs(): The cost model shared by the inspections.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import threading
+import time
+
+from .settings import get_settings
+
+# segment_with_sahi arguments of the segmentation options, most thorough first
+SEGMENT_OPTIONS = {
+    'full': {'num_blocks': 2, 'image_size': None},
+    'reduced': {'num_blocks': 1, 'image_size': None},
+    'minimal': {'num_blocks': 1, 'image_size': 320},
+}
+
+
+class StageCosts:
+    """
+    Exponentially weighted moving average of the duration of every stage option.
+
+    Attributes:
+        alpha (float): Weight of the newest measurement.
+        priors (dict): Option name mapped to its estimated duration before any measurement, in milliseconds.
+    """
+    def __init__(self, alpha=0.3, priors=None):
+        self.alpha = alpha
+        self.priors = dict(priors or {})
+        self._costs = {}
+        self._lock = threading.Lock()
+
+    def estimate(self, option):
+        """
+        Returns:
+            float: Estimated duration of an option in milliseconds, 0 for 'skip' and unknown options.
+        """
+        with self._lock:
+            return self._costs.get(option, self.priors.get(option, 0.0))
+
+    def record(self, option, ms):
+        with self._lock:
+            previous = self._costs.get(option)
+            self._costs[option] = ms if previous is None else previous + self.alpha * (ms - previous)
+
+    def measured(self):
+        with self._lock:
+            return dict(self._costs)
+
+
+class InspectionBudget:
+    """
+    Chooses the options of the stages of one inspection so that it ends within its budget.
+
+    Attributes:
+        budget_ms (float): Time budget in milliseconds, 0 for none (every stage takes its first option).
+        costs (StageCosts): Cost model.
+        degradations (list[str]): Options chosen other than the first one of their stage, e.g. 'segment 3: reduced'.
+    """
+    def __init__(self, budget_ms, costs, start=None):
+        self.budget_ms = budget_ms
+        self.costs = costs
+        self.start = time.perf_counter() if start is None else start
+        self.degradations = []
+
+    def remaining_ms(self):
+        return self.budget_ms - (time.perf_counter() - self.start) * 1000
+
+    def choose(self, stage, options, later=()):
+        """
+        Choose the option of a stage.
+
+        Args:
+            stage (str): Name of the stage, used in the degradations.
+            options (list[str]): Options of the stage (cost model names), most thorough first.
+            later (list[list[str]]): Options of the stages still to run after this one.
+
+        Returns:
+            str: The most thorough option whose cost fits the remaining time once the cheapest options of the later
+            stages are reserved, the cheapest option if none fits.
+        """
+        chosen = options[0]
+        if self.budget_ms > 0:
+            reserve = sum(min(self.costs.estimate(option) for option in stage_options) for stage_options in later)
+            available = self.remaining_ms() - reserve
+            chosen = next((option for option in options if self.costs.estimate(option) <= available),
+                          min(options, key=self.costs.estimate))
+        if chosen != options[0]:
+            self.degradations.append(f'{stage}: {chosen.split("/")[-1]}')
+        return chosen
+
+    def run(self, option, fn, *args, **kwargs):
+        """Run a stage option and record its duration in the cost model."""
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.costs.record(option, (time.perf_counter() - start) * 1000)
+        return result
+
+    @property
+    def reduced(self):
+        return bool(self.degradations)
+
+
+_stage_costs = None
+_stage_costs_lock = threading.Lock()
+
+
+def get_stage_costs():
+    """
+    Returns:
+        StageCosts: The cost model shared by the inspections, created from the ``deadline`` settings on first use.
+    """
+    global _stage_costs
+    with _stage_costs_lock:
+        if _stage_costs is None:
+            settings = get_settings()['deadline']
+            _stage_costs = StageCosts(settings['alpha'], settings['priors_ms'])
+        return _stage_costs
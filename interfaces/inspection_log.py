@@ -0,0 +1,146 @@
+"""
+Log of the inspections, one record per laptop.
+
+Every inspection appends a json line to the log (``inspection_log.path``) with its date, identification, grade,
+defect classes and stage durations. The log is only appended to and read sequentially, so the daily report (see
+interfaces.daily_report) streams over months of records without loading them.
+
+The grade of a record is the automatic one of grade_laptop(). The laptop saved by the operator, with the grade they
+may have corrected, goes to the inspection store (see interfaces.inspection_store), the source of record of the
+grades of the daily report.
+
+Classes:
+- InspectionLog: Append-only json lines file of inspection records.
+
+Functions:
+- grade_laptop(scratch, stain): Grade of a laptop from its defect counts.
+- inspection_record(features, defects_list, when): Record of one inspection.
+- get_inspection_log(): The log shared by the application.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+
+from .settings import get_settings
+
+_root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# identification fields read by OCR or barcode, counted as failed when not read
+IDENTIFICATION_FIELDS = ('lot', 'serial')
+_TIME_PREFIX = '{"time": "'
+
+
+def grade_laptop(scratch, stain):
+    """
+    Grade of a laptop from its defect counts.
+    Still need to be expanded.
+
+    Returns:
+        str: 'A' or 'C'.
+    """
+    if scratch > 10 or stain > 10:
+        return 'C'
+    return 'A'
+
+
+def _read(value):
+    return bool(value) and not str(value).endswith('_Not_Found')
+
+
+def inspection_record(features, defects_list, when=None):
+    """
+    Record of one inspection.
+
+    Args:
+        features (dict): Detected features (see VideoBase.detect_images).
+        defects_list (list[tuple]): Defects grouped by camera port.
+        when (datetime): Time of the inspection, now by default.
+
+    Returns:
+        dict: 'time' (ISO format), 'job', 'model', 'lot', 'serial', 'grade', 'defects' (class mapped to count),
+        'ocr_failed' (identification fields not read), 'stage_ms' (stage mapped to duration) and 'mode'.
+    """
+    scratch = sum(counts[0] for counts, _ in features.get('detected_info', []))
+    stain = sum(counts[1] for counts, _ in features.get('detected_info', []))
+    defects = Counter(d.cls for surface_defects, _ in defects_list for d in surface_defects)
+    return {
+        'time': (when or datetime.now()).isoformat(timespec='seconds'),
+        'job': features.get('job'),
+        'model': features.get('logo'),
+        'lot': features.get('lot'),
+        'serial': features.get('serial'),
+        'grade': grade_laptop(scratch, stain),
+        'defects': dict(defects),
+        'ocr_failed': [field for field in IDENTIFICATION_FIELDS if not _read(features.get(field))],
+        'stage_ms': {stage: round(ms, 1) for stage, ms in features.get('stage_ms', {}).items()},
+        'mode': features.get('inspection_mode', 'full'),
+    }
+
+
+class InspectionLog:
+    """
+    Append-only json lines file of inspection records.
+
+    Attributes:
+        path (str): Path of the log.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+
+    def iter_records(self, start=None, end=None):
+        """
+        Stream the records of a date range, one line at a time.
+
+        Args:
+            start (str): First day (YYYY-MM-DD), included.
+            end (str): Last day (YYYY-MM-DD), included.
+
+        Yields:
+            dict: The records, in log order.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                # records written by append() start with the time, out of range lines are skipped without parsing
+                day = line[len(_TIME_PREFIX):len(_TIME_PREFIX) + 10] if line.startswith(_TIME_PREFIX) else None
+                if day is not None and ((start and day < start) or (end and day > end)):
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:  # line cut by a crash
+                    continue
+                day = str(record.get('time', ''))[:10]
+                if (start and day < start) or (end and day > end):
+                    continue
+                yield record
+
+
+_inspection_log = None
+_inspection_log_lock = threading.Lock()
+
+
+def get_inspection_log():
+    """
+    Returns:
+        InspectionLog: The log shared by the application, at the ``inspection_log.path`` setting.
+    """
+    global _inspection_log
+    with _inspection_log_lock:
+        if _inspection_log is None:
+            _inspection_log = InspectionLog(os.path.join(_root_dir, get_settings()['inspection_log']['path']))
+        return _inspection_log
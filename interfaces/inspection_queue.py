@@ -0,0 +1,157 @@
+"""
+Queue of captured laptops waiting for detection and reporting.
+
+Without it a laptop occupies the station from the capture until its PDF report is written. With it the capture only
+produces an InspectionJob (the selected frames and the capture metadata) and returns: the operator can swap laptops
+and capture again while background workers run the detection, the report and the saving of the previous jobs.
+
+The queue is bounded. Once ``max_depth`` jobs are waiting, submit() refuses new jobs until a worker takes one, so a
+station whose detection is slower than the operator does not pile up frames in memory (backpressure).
+
+Classes:
+- InspectionJob: Frames and metadata of one captured laptop.
+- InspectionQueue: Bounded job queue consumed by worker threads.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import itertools
+import queue
+import threading
+import time
+
+_job_ids = itertools.count(1)
+
+
+class InspectionJob:
+    """
+    One captured laptop.
+
+    Attributes:
+        id (int): Number of the job, increasing with the captures.
+        frames (list[tuple]): (image, camera port) selected for the detection.
+        metadata (dict): Capture information merged into the detected features (skew, bursts, ...).
+        created (float): Capture time (time.monotonic).
+    """
+    def __init__(self, frames, metadata=None):
+        self.id = next(_job_ids)
+        self.frames = frames
+        self.metadata = {} if metadata is None else metadata
+        self.created = time.monotonic()
+
+
+class InspectionQueue:
+    """
+    Bounded queue of InspectionJobs processed by worker threads, in capture order with a single worker.
+
+    Attributes:
+        max_depth (int): Jobs allowed to wait, not counting the ones being processed.
+        done (int): Jobs processed.
+        failed (int): Jobs whose processing raised an exception.
+    """
+    def __init__(self, process, max_depth=2, workers=1, on_change=None):
+        """
+        Args:
+            process (callable): Called with each job in a worker thread.
+            max_depth (int): Jobs allowed to wait.
+            workers (int): Worker threads.
+            on_change (callable): Called with status() whenever a job is queued, started or finished.
+        """
+        self.process = process
+        self.max_depth = max_depth
+        self.on_change = on_change
+        self.done = 0
+        self.failed = 0
+        self._jobs = queue.Queue(max_depth)
+        self._running = 0
+        self._stopped = False
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._workers = [threading.Thread(target=self._work, name=f'inspection-worker-{i}', daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, job, timeout=0.0):
+        """
+        Queue a job.
+
+        Args:
+            job (InspectionJob): The captured laptop.
+            timeout (float): Seconds to wait for a free place, 0 to return at once.
+
+        Returns:
+            bool: False if the queue stayed full or is stopped.
+        """
+        if self._stopped:
+            return False
+        try:
+            self._jobs.put(job, block=timeout > 0, timeout=timeout if timeout > 0 else None)
+        except queue.Full:
+            return False
+        self._changed()
+        return True
+
+    def full(self):
+        return self._jobs.full()
+
+    def status(self):
+        """
+        Returns:
+            dict: 'pending' jobs waiting, 'running' jobs being processed, 'done', 'failed' and 'max_depth'.
+        """
+        with self._lock:
+            return {'pending': self._jobs.qsize(), 'running': self._running, 'done': self.done,
+                    'failed': self.failed, 'max_depth': self.max_depth}
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self.status())
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                self._jobs.task_done()
+                return
+            with self._lock:
+                self._running += 1
+            self._changed()
+            try:
+                self.process(job)
+            except Exception as e:
+                print(f'Inspection of laptop {job.id} failed: {e!r}')
+                failed = True
+            else:
+                failed = False
+            with self._lock:
+                self._running -= 1
+                if failed:
+                    self.failed += 1
+                else:
+                    self.done += 1
+                self._jobs.task_done()
+                self._idle.notify_all()
+            self._changed()
+
+    def join(self, timeout=None):
+        """
+        Wait until every queued job has been processed.
+
+        Returns:
+            bool: False on timeout.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._jobs.unfinished_tasks == 0, timeout)
+
+    def stop(self, timeout=30.0):
+        """Process the jobs already queued, then stop the workers."""
+        self._stopped = True
+        deadline = time.monotonic() + timeout
+        for _ in self._workers:
+            try:
+                self._jobs.put(None, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                break
+        for worker in self._workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
@@ -0,0 +1,332 @@
+"""
+Inspection store of the laptops saved by the operator.
+
+The laptops are kept in an embedded SQLite database (``inspection_store.path``) instead of appending rows to
+dataset.csv: the database runs in WAL mode so that queries never wait for a write, and the laptops are indexed by
+serial, lot, model, grade and time. Every laptop is linked to its files (report, surface images) and to its defects.
+
+Writes are batched: add() only queues the laptop and returns, a writer thread commits the queued laptops together
+every ``flush_interval`` seconds (or ``batch_size`` laptops), so a save costs no disk synchronization on the GUI
+thread. An existing dataset.csv is imported once (see import_csv()).
+
+Classes:
+- InspectionStore: SQLite store of the laptops, their files and their defects.
+
+Functions:
+- get_inspection_store(): The store shared by the application, created from the settings on first use.
+- close_inspection_store(): Write the queued laptops and close the shared store.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import csv
+import itertools
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from .settings import get_settings
+
+_root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+LAPTOP_COLUMNS = ('time', 'job', 'model', 'serial', 'lot', 'grade', 'scratch', 'stain', 'source')
+# columns of the legacy dataset.csv mapped to the laptop columns
+CSV_COLUMNS = {'model': 'model', 'serial number': 'serial', 'lot number': 'lot', 'grade': 'grade',
+               'stain': 'stain', 'scratch': 'scratch'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS laptops (
+    id INTEGER PRIMARY KEY,
+    time TEXT,
+    job INTEGER,
+    model TEXT,
+    serial TEXT,
+    lot TEXT,
+    grade TEXT,
+    scratch INTEGER,
+    stain INTEGER,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS images (
+    laptop_id INTEGER NOT NULL REFERENCES laptops(id),
+    surface TEXT,
+    path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS defects (
+    laptop_id INTEGER NOT NULL REFERENCES laptops(id),
+    surface TEXT,
+    cls TEXT,
+    x1 INTEGER, y1 INTEGER, x2 INTEGER, y2 INTEGER
+);
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY,
+    laptops INTEGER,
+    time TEXT
+);
+CREATE INDEX IF NOT EXISTS laptops_serial ON laptops(serial);
+CREATE INDEX IF NOT EXISTS laptops_lot ON laptops(lot);
+CREATE INDEX IF NOT EXISTS laptops_model ON laptops(model);
+CREATE INDEX IF NOT EXISTS laptops_grade ON laptops(grade);
+CREATE INDEX IF NOT EXISTS laptops_time ON laptops(time);
+CREATE INDEX IF NOT EXISTS images_laptop ON images(laptop_id);
+CREATE INDEX IF NOT EXISTS defects_laptop ON defects(laptop_id);
+"""
+
+_STOP = object()
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')  # WAL stays consistent after a crash, only the last commits can be lost
+    conn.execute('PRAGMA foreign_keys=ON')
+    return conn
+
+
+def _insert_laptop(conn, laptop, images, defects):
+    cursor = conn.execute(f'INSERT INTO laptops ({", ".join(LAPTOP_COLUMNS)}) '
+                          f'VALUES ({", ".join("?" * len(LAPTOP_COLUMNS))})',
+                          [laptop.get(column) for column in LAPTOP_COLUMNS])
+    laptop_id = cursor.lastrowid
+    conn.executemany('INSERT INTO images (laptop_id, surface, path) VALUES (?, ?, ?)',
+                     [(laptop_id, surface, path) for surface, path in images])
+    conn.executemany('INSERT INTO defects (laptop_id, surface, cls, x1, y1, x2, y2) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                     [(laptop_id, surface, cls, *map(int, xyxy)) for surface, cls, xyxy in defects])
+    return laptop_id
+
+
+class InspectionStore:
+    """
+    SQLite store of the laptops, their files and their defects.
+
+    Attributes:
+        path (str): Path of the database.
+        batch_size (int): Largest number of laptops committed together.
+        flush_interval (float): Seconds the writer waits for more laptops before committing.
+        failed (list[tuple]): Laptops that could not be written and their error.
+    """
+    def __init__(self, path, batch_size=256, flush_interval=0.2):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._reader = _connect(path)
+        self._reader.row_factory = sqlite3.Row
+        self._reader.executescript(_SCHEMA)
+        self._reader_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._closed = False
+        self.failed = []
+        self._writer = threading.Thread(target=self._write_loop, name='inspection_store', daemon=True)
+        self._writer.start()
+
+    def add(self, laptop, images=(), defects=()):
+        """
+        Queue a laptop, written by the next batch.
+
+        Args:
+            laptop (dict): Values of the laptop columns (see LAPTOP_COLUMNS), 'time' defaults to now.
+            images (iterable[tuple]): (surface, path) of the files of the laptop, e.g. ('report', 'dataset/LOT.pdf').
+            defects (iterable[tuple]): (surface, cls, (x1, y1, x2, y2)) of the defects of the laptop.
+        """
+        if self._closed:
+            raise RuntimeError(f'Inspection store {self.path} is closed')
+        laptop = dict(laptop)
+        laptop.setdefault('time', datetime.now().isoformat(timespec='seconds'))
+        self._queue.put((laptop, list(images), list(defects)))
+
+    def _write_loop(self):
+        conn = _connect(self.path)
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and isinstance(batch[-1], tuple):
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self._write(conn, [item for item in batch if isinstance(item, tuple)])
+            finally:
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+            if batch[-1] is _STOP:
+                conn.close()
+                return
+
+    def _write(self, conn, laptops):
+        """Commit the laptops in one transaction, or one by one when the batch fails so a bad laptop is isolated."""
+        if not laptops:
+            return
+        try:
+            with conn:
+                for laptop in laptops:
+                    _insert_laptop(conn, *laptop)
+            return
+        except Exception as e:
+            if len(laptops) == 1:
+                self.failed.append((laptops[0][0], repr(e)))
+                print(f'Failed to save laptop {laptops[0][0].get("serial")} to {self.path}: {e!r}')
+                return
+        for laptop in laptops:
+            self._write(conn, [laptop])
+
+    def flush(self):
+        """Wait until the queued laptops are written."""
+        if self._closed:
+            return
+        written = threading.Event()
+        self._queue.put(written)
+        while not written.wait(0.5):
+            if not self._writer.is_alive():
+                return
+
+    def close(self):
+        """Write the queued laptops and close the database."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+        with self._reader_lock:
+            self._reader.close()
+
+    def _query(self, sql, params=()):
+        with self._reader_lock:
+            return [dict(row) for row in self._reader.execute(sql, params)]
+
+    @staticmethod
+    def _where(serial=None, lot=None, model=None, grade=None, start=None, end=None):
+        clauses, params = [], []
+        for column, value in (('serial', serial), ('lot', lot), ('model', model), ('grade', grade)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if start:
+            clauses.append('time >= ?')
+            params.append(start)
+        if end:  # the whole last day is included
+            clauses.append('time < ?')
+            params.append((date.fromisoformat(end[:10]) + timedelta(days=1)).isoformat())
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def find(self, limit=100, **filters):
+        """
+        Laptops matching every filter, newest first.
+
+        Args:
+            limit (int): Largest number of laptops returned.
+            **filters: 'serial', 'lot', 'model', 'grade' (exact values), 'start' and 'end' (days, YYYY-MM-DD,
+                included).
+
+        Returns:
+            list[dict]: The laptop rows.
+        """
+        where, params = self._where(**filters)
+        return self._query(f'SELECT * FROM laptops{where} ORDER BY id DESC LIMIT ?', params + [limit])
+
+    def count(self, **filters):
+        """Number of laptops matching the filters of find()."""
+        where, params = self._where(**filters)
+        return self._query(f'SELECT COUNT(*) AS n FROM laptops{where}', params)[0]['n']
+
+    def grades_per_day(self, start, end):
+        """
+        Laptops saved per day and grade, the laptops imported without time are left out.
+
+        Args:
+            start (str): First day, YYYY-MM-DD.
+            end (str): Last day, YYYY-MM-DD, included.
+
+        Returns:
+            list[tuple]: (day, grade, laptops) rows.
+        """
+        where, params = self._where(start=start, end=end)
+        rows = self._query(f'SELECT substr(time, 1, 10) AS day, grade, COUNT(*) AS n FROM laptops{where} '
+                           f'GROUP BY day, grade ORDER BY day, grade', params)
+        return [(row['day'], row['grade'], row['n']) for row in rows]
+
+    def get(self, laptop_id):
+        """
+        Returns:
+            dict: The laptop row with its 'images' and 'defects', None for an unknown id.
+        """
+        rows = self._query('SELECT * FROM laptops WHERE id = ?', (laptop_id,))
+        if not rows:
+            return None
+        laptop = rows[0]
+        laptop['images'] = self._query('SELECT surface, path FROM images WHERE laptop_id = ?', (laptop_id,))
+        laptop['defects'] = self._query('SELECT surface, cls, x1, y1, x2, y2 FROM defects WHERE laptop_id = ?',
+                                        (laptop_id,))
+        return laptop
+
+    def import_csv(self, csv_path, chunk_size=10000):
+        """
+        Import the laptops of a dataset.csv once, a file already imported is skipped.
+
+        Args:
+            csv_path (str): Path of the CSV file (columns of CSV_COLUMNS).
+            chunk_size (int): Rows inserted at a time.
+
+        Returns:
+            int: Number of laptops imported.
+        """
+        csv_path = os.path.abspath(csv_path)
+        if not os.path.exists(csv_path):
+            return 0
+        conn = _connect(self.path)
+        try:
+            with conn:  # the rows and the import mark are committed together
+                if conn.execute('SELECT 1 FROM imports WHERE path = ?', (csv_path,)).fetchone():
+                    return 0
+                imported = 0
+                with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+                    rows = csv.DictReader(f)
+                    while True:
+                        chunk = list(itertools.islice(rows, chunk_size))
+                        if not chunk:
+                            break
+                        conn.executemany(
+                            f'INSERT INTO laptops ({", ".join(CSV_COLUMNS.values())}, source) '
+                            f'VALUES ({", ".join("?" * len(CSV_COLUMNS))}, ?)',
+                            [[row.get(column) for column in CSV_COLUMNS] + ['csv'] for row in chunk])
+                        imported += len(chunk)
+                conn.execute('INSERT INTO imports (path, laptops, time) VALUES (?, ?, ?)',
+                             (csv_path, imported, datetime.now().isoformat(timespec='seconds')))
+        finally:
+            conn.close()
+        print(f'Imported {imported} laptops from {csv_path} into {self.path}')
+        return imported
+
+
+_inspection_store = None
+_inspection_store_lock = threading.Lock()
+
+
+def get_inspection_store():
+    """
+    Returns:
+        InspectionStore: The store shared by the application, from the ``inspection_store`` settings.
+    """
+    global _inspection_store
+    with _inspection_store_lock:
+        if _inspection_store is None:
+            settings = get_settings()['inspection_store']
+            _inspection_store = InspectionStore(os.path.join(_root_dir, settings['path']), settings['batch_size'],
+                                                settings['flush_interval'])
+        return _inspection_store
+
+
+def close_inspection_store():
+    """Write the queued laptops and close the shared store, the next get_inspection_store() opens it again."""
+    global _inspection_store
+    with _inspection_store_lock:
+        store, _inspection_store = _inspection_store, None
+    if store is not None:
+        store.close()
@@ -0,0 +1,129 @@
+"""
+Motion and stability detection on the preview stream, used by the auto-capture mode.
+
+Each camera feeds its decoded frames to a StabilityDetector, ``fps`` times per second whether its preview is
+throttled or not. The detector compares a small blurred grayscale copy of
+every frame with the empty scene (presence) and with the previous frame (motion). It fires once when an object has
+entered the scene and stayed still for a number of frames, then waits for the scene to be empty again before it can
+fire for the next device.
+
+Classes:
+- StabilityDetector: Per-camera state machine (empty -> moving -> captured -> empty).
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import threading
+
+import cv2 as cv
+import numpy as np
+
+from .settings import get_settings
+
+
+class StabilityDetector:
+    """
+    Detects that a new object has been placed in front of a camera and has settled.
+
+    Attributes:
+        width (int): Width of the downsampled frames compared, in pixels.
+        motion_threshold (float): Mean absolute difference (0-255) between consecutive frames below which the
+            scene is still.
+        presence_threshold (float): Mean absolute difference with the empty scene above which an object is present.
+        settle_frames (int): Consecutive still frames required before firing.
+        clear_frames (int): Consecutive empty frames required before firing again. An empty frame is below half the
+            presence threshold, so noise around the threshold cannot re-arm the detector (hysteresis).
+        background_rate (float): Adaptation rate of the empty scene to slow lighting changes.
+        fps (float): Frames fed per second by the camera thread, see VideoThread.
+        state (str): 'empty', 'moving' or 'captured'.
+    """
+    EMPTY, MOVING, CAPTURED = 'empty', 'moving', 'captured'
+
+    def __init__(self, width=64, motion_threshold=4.0, presence_threshold=12.0, settle_frames=8, clear_frames=5,
+                 background_rate=0.05, fps=15.0):
+        self.width = width
+        self.motion_threshold = motion_threshold
+        self.presence_threshold = presence_threshold
+        self.settle_frames = settle_frames
+        self.clear_frames = clear_frames
+        self.background_rate = background_rate
+        self.fps = fps
+
+        self.state = self.EMPTY
+        self.presence = 0.0
+        self.motion = 0.0
+        self._background = None
+        self._previous = None
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        config = get_settings()['auto_capture']
+        return cls(width=config['width'], motion_threshold=config['motion_threshold'],
+                   presence_threshold=config['presence_threshold'], settle_frames=config['settle_frames'],
+                   clear_frames=config['clear_frames'], fps=config['fps'])
+
+    def _downsample(self, frame):
+        h, w = frame.shape[:2]
+        small = cv.resize(frame, (self.width, max(1, h * self.width // w)), interpolation=cv.INTER_AREA)
+        if small.ndim == 3:
+            small = cv.cvtColor(small, cv.COLOR_BGR2GRAY)
+        return cv.GaussianBlur(small, (3, 3), 0).astype(np.float32)
+
+    def feed(self, frame):
+        """
+        Process one frame.
+
+        Args:
+            frame (numpy.ndarray): BGR or grayscale frame.
+
+        Returns:
+            bool: True once per placed object, when it has settled.
+        """
+        small = self._downsample(frame)
+        with self._lock:
+            if self._background is None or self._background.shape != small.shape:
+                # the first frame is taken as the empty scene
+                self._background = small
+                self._previous = small
+                return False
+
+            self.presence = float(cv.absdiff(small, self._background).mean())
+            self.motion = float(cv.absdiff(small, self._previous).mean())
+            self._previous = small
+
+            if self.state == self.EMPTY:
+                if self.presence > self.presence_threshold:
+                    self.state, self._count = self.MOVING, 0
+                else:
+                    cv.accumulateWeighted(small, self._background, self.background_rate)
+                return False
+
+            if self.state == self.MOVING:
+                if self.presence <= self.presence_threshold:  # removed before settling
+                    self.state = self.EMPTY
+                    return False
+                self._count = self._count + 1 if self.motion < self.motion_threshold else 0
+                if self._count >= self.settle_frames:
+                    self.state, self._count = self.CAPTURED, 0
+                    return True
+                return False
+
+            # captured: wait for the scene to be empty again
+            self._count = self._count + 1 if self.presence < self.presence_threshold / 2 else 0
+            if self._count >= self.clear_frames:
+                self.state, self._count = self.EMPTY, 0
+            return False
+
+    def mark_captured(self):
+        """Do not fire again before the scene has been cleared (another camera triggered the capture)."""
+        with self._lock:
+            self.state, self._count = self.CAPTURED, 0
+
+    def reset(self):
+        """Forget the empty scene, the next frame is taken as the new one."""
+        with self._lock:
+            self.state, self._count = self.EMPTY, 0
+            self._background = None
+            self._previous = None
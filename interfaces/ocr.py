@@ -0,0 +1,439 @@
+"""
+OCR service backed by a pool of long-lived Tesseract engines.
+
+``pytesseract.image_to_string`` spawns a new ``tesseract`` process and writes temporary image files for every crop.
+The OCRService keeps a small pool of engines alive instead and hands them out to callers, so lot, asset and serial
+crops can be read concurrently from the detection pipeline without paying the process start-up on every call.
+
+Two engine backends are available:
+- TesserocrEngine: wraps ``tesserocr.PyTessBaseAPI`` (Tesseract C API). Crops are passed as raw pixel buffers.
+- SubprocessEngine: falls back to ``pytesseract`` when tesserocr is not installed.
+
+Classes:
+- FieldConfig: Page segmentation mode and character whitelist used to read one field.
+- TesserocrEngine: Persistent Tesseract engine using the C API binding.
+- SubprocessEngine: Tesseract engine spawning one process per call (legacy path).
+- OCRService: Thread-safe pool of engines.
+- OCRCache: LRU cache of OCR results keyed by crop hash, with hit-rate and time-saved statistics.
+
+Functions:
+- decode_buffer(buffer): Convert an in-memory crop (array or encoded bytes) into a uint8 array.
+- get_ocr_service(): Return the OCR service shared by the application.
+- get_ocr_cache(): Return the OCR cache shared by the application.
+- read_field(crop, field, variants): Read a field trying preprocessing variants until one yields a valid value.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+import cv2 as cv
+import numpy as np
+import pytesseract
+
+from .settings import get_settings
+from .fields import normalize_field, validate_field
+from .debug_sink import get_debug_sink
+from .executors import get_executor
+
+try:
+    import tesserocr
+except ImportError:  # tesserocr is optional, fall back to pytesseract
+    tesserocr = None
+
+
+class FieldConfig:
+    """
+    Tesseract configuration used to read one field.
+
+    Attributes:
+        psm (int): Page segmentation mode (7 means a single line of text).
+        whitelist (str): Characters Tesseract is allowed to output, empty for no restriction.
+    """
+    def __init__(self, psm=7, whitelist=''):
+        self.psm = psm
+        self.whitelist = whitelist
+
+    def to_cli(self):
+        """Format the configuration as command line options for the tesseract executable."""
+        config = f'--psm {self.psm}'
+        if self.whitelist:
+            config += f' -c tessedit_char_whitelist={self.whitelist}'
+        return config
+
+
+_UPPER_DIGITS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+# Per-field configurations, a label crop always contains a single line of text
+FIELD_CONFIGS = {
+    'lot': FieldConfig(psm=7, whitelist=_UPPER_DIGITS + '-'),
+    'asset': FieldConfig(psm=7, whitelist=_UPPER_DIGITS + '-'),
+    'serial': FieldConfig(psm=7, whitelist=_UPPER_DIGITS),
+    'text': FieldConfig(psm=3),
+}
+
+
+def decode_buffer(buffer):
+    """
+    Convert an in-memory crop into a contiguous uint8 image.
+
+    Args:
+        buffer (numpy.ndarray | bytes | bytearray | memoryview): Image array or encoded image (PNG, JPEG, ...).
+
+    Returns:
+        numpy.ndarray: Grayscale or BGR image.
+    """
+    if isinstance(buffer, (bytes, bytearray, memoryview)):
+        image = cv.imdecode(np.frombuffer(buffer, dtype=np.uint8), cv.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError('Cannot decode image buffer')
+    elif isinstance(buffer, np.ndarray):
+        image = buffer
+    else:
+        raise ValueError('OCR input must be a numpy array or an encoded image buffer')
+
+    if image.dtype != np.uint8:
+        image = cv.normalize(image, None, 0, 255, cv.NORM_MINMAX).astype(np.uint8)
+    return np.ascontiguousarray(image)
+
+
+class TesserocrEngine:
+    """
+    Persistent Tesseract engine using the C API (tesserocr).
+
+    The language model is loaded once; each call only sets the image and the field variables.
+    """
+    def __init__(self, language='eng'):
+        self.api = tesserocr.PyTessBaseAPI(lang=language)
+
+    def read(self, image, config):
+        """
+        Read text from a crop.
+
+        Args:
+            image (numpy.ndarray): Grayscale or BGR crop.
+            config (FieldConfig): Configuration of the field to read.
+
+        Returns:
+            str: Raw text detected by Tesseract.
+        """
+        if image.ndim == 3:
+            image = np.ascontiguousarray(cv.cvtColor(image, cv.COLOR_BGR2RGB))
+            bytes_per_pixel = 3
+        else:
+            bytes_per_pixel = 1
+        h, w = image.shape[:2]
+
+        self.api.SetPageSegMode(config.psm)
+        self.api.SetVariable('tessedit_char_whitelist', config.whitelist)
+        self.api.SetImageBytes(image.tobytes(), w, h, bytes_per_pixel, w * bytes_per_pixel)
+        return self.api.GetUTF8Text()
+
+    def close(self):
+        self.api.End()
+
+
+class SubprocessEngine:
+    """Tesseract engine calling the tesseract executable through pytesseract (one process per crop)."""
+    def __init__(self, language='eng', tesseract_cmd=None):
+        self.language = language
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    def read(self, image, config):
+        return pytesseract.image_to_string(image, lang=self.language, config=config.to_cli())
+
+    def close(self):
+        pass
+
+
+def _default_engine_factory(backend, language, tesseract_cmd):
+    if backend == 'auto':
+        backend = 'tesserocr' if tesserocr is not None else 'subprocess'
+        if tesserocr is None:
+            print('Warning: tesserocr is not installed, OCR falls back to one pytesseract process per read '
+                  '(install tesserocr for persistent engines)')
+    if backend == 'tesserocr':
+        if tesserocr is None:
+            raise ValueError('OCR backend "tesserocr" requested but tesserocr is not installed')
+        return lambda: TesserocrEngine(language)
+    if backend == 'subprocess':
+        return lambda: SubprocessEngine(language, tesseract_cmd)
+    raise ValueError(f'Unknown OCR backend: {backend}')
+
+
+class OCRService:
+    """
+    Pool of long-lived OCR engines that can be used concurrently.
+
+    Engines are created lazily up to ``pool_size``. A caller borrows an engine for the duration of one read and
+    blocks while all engines are busy, so at most ``pool_size`` crops are recognised at the same time.
+
+    Attributes:
+        pool_size (int): Maximum number of engines.
+        backend (str): Name of the engine backend.
+    """
+    def __init__(self, pool_size=None, backend=None, engine_factory=None):
+        """
+        Initializes the OCR service.
+
+        Args:
+            pool_size (int): Maximum number of engines. Defaults to the ``ocr.pool_size`` setting.
+            backend (str): 'auto', 'tesserocr' or 'subprocess'. Defaults to the ``ocr.backend`` setting.
+            engine_factory (callable): Creates one engine, overrides ``backend`` when given.
+        """
+        settings = get_settings()['ocr']
+        self.pool_size = max(1, pool_size or settings['pool_size'])
+        self.backend = backend or settings['backend']
+        if engine_factory is None:
+            engine_factory = _default_engine_factory(self.backend, settings['language'], settings['tesseract_cmd'])
+        self.engine_factory = engine_factory
+
+        self._idle = queue.LifoQueue()
+        self._engines = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._engines) < self.pool_size:
+                engine = self.engine_factory()
+                self._engines.append(engine)
+                return engine
+
+        return self._idle.get()
+
+    def read(self, buffer, field='text'):
+        """
+        Read the text of one field from a crop.
+
+        Args:
+            buffer (numpy.ndarray | bytes): Crop as an image array or an encoded image buffer.
+            field (str): Field name used to select the Tesseract configuration ('lot', 'asset', 'serial', 'text').
+
+        Returns:
+            str: Detected text, stripped of surrounding whitespace.
+        """
+        image = decode_buffer(buffer)
+        config = FIELD_CONFIGS.get(field, FIELD_CONFIGS['text'])
+
+        engine = self._acquire()
+        try:
+            text = engine.read(image, config)
+        finally:
+            self._idle.put(engine)
+
+        return text.strip()
+
+    def read_many(self, buffers, field='text'):
+        """
+        Read several crops of the same field concurrently.
+
+        Args:
+            buffers (list): Crops as image arrays or encoded image buffers.
+            field (str): Field name used to select the Tesseract configuration.
+
+        Returns:
+            list[str]: Detected text of every crop, in the same order.
+        """
+        if len(buffers) <= 1:
+            return [self.read(buffer, field) for buffer in buffers]
+        return list(get_executor('ocr').map(lambda buffer: self.read(buffer, field), buffers))
+
+    def close(self):
+        """Release every engine of the pool."""
+        with self._lock:
+            engines, self._engines = self._engines, []
+        for engine in engines:
+            engine.close()
+        self._idle = queue.LifoQueue()
+
+
+_ocr_service = None
+_ocr_service_lock = threading.Lock()
+
+
+def get_ocr_service():
+    """
+    Get the OCR service shared by the application, creating it on first use.
+
+    Returns:
+        OCRService: The shared OCR service.
+    """
+    global _ocr_service
+    with _ocr_service_lock:
+        if _ocr_service is None:
+            _ocr_service = OCRService()
+        return _ocr_service
+
+
+class OCRCache:
+    """
+    LRU cache of OCR results keyed by the hash of the crop content and the field name.
+
+    Every entry remembers how long the OCR took, so each hit adds that cost to ``time_saved_ms``.
+
+    Attributes:
+        capacity (int): Maximum number of cached results.
+        hits (int): Number of lookups answered by the cache.
+        misses (int): Number of lookups that had to run OCR.
+        time_saved_ms (float): OCR time avoided by cache hits.
+        early_exits (int): Reads that stopped before trying every preprocessing variant.
+        variants_skipped (int): Preprocessing variants skipped by early exits.
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.time_saved_ms = 0.0
+        self.early_exits = 0
+        self.variants_skipped = 0
+
+    @staticmethod
+    def key(crop, field):
+        crop = np.ascontiguousarray(crop)
+        digest = hashlib.blake2b(crop.data, digest_size=16)
+        digest.update(f'{crop.shape}{crop.dtype}{field}'.encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Look up a result.
+
+        Returns:
+            tuple: (text, valid) if cached, None otherwise.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            text, valid, cost_ms = entry
+            self.time_saved_ms += cost_ms
+            return text, valid
+
+    def put(self, key, text, valid, cost_ms):
+        with self._lock:
+            self._entries[key] = (text, valid, cost_ms)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def record_early_exit(self, skipped):
+        with self._lock:
+            self.early_exits += 1
+            self.variants_skipped += skipped
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.early_exits = self.variants_skipped = 0
+            self.time_saved_ms = 0.0
+
+    def report(self):
+        """
+        Summarize the cache statistics.
+
+        Returns:
+            str: Hit rate, time saved and early exits.
+        """
+        return (f'OCR cache: {self.hits} hits / {self.misses} misses ({self.hit_rate:.0%}), '
+                f'{self.time_saved_ms:.0f}ms saved, {self.early_exits} early exits '
+                f'({self.variants_skipped} variants skipped)')
+
+
+_ocr_cache = None
+
+
+def get_ocr_cache():
+    """
+    Get the OCR cache shared by the application, creating it on first use.
+
+    Returns:
+        OCRCache: The shared OCR cache.
+    """
+    global _ocr_cache
+    with _ocr_service_lock:
+        if _ocr_cache is None:
+            _ocr_cache = OCRCache(get_settings()['ocr']['cache_size'])
+        return _ocr_cache
+
+
+def read_field(crop, field, variants, service=None, cache=None, candidates=None):
+    """
+    Read a field from a crop, trying preprocessing variants from the cheapest to the most expensive.
+
+    The sequential ``variants`` are tried first and the result is returned as soon as one yields a value passing
+    the field validation. When none does, the ``candidates`` variants are built in one pass and read concurrently
+    through the OCR pool; the valid value produced by the most variants wins (ties go to the earlier variant).
+    Valid results are cached by crop hash, so reading the same crop again costs no OCR. An invalid result is not cached:
+    a later read of the crop, possibly with ``candidates``, tries again.
+
+    Args:
+        crop (numpy.ndarray): Crop of the field (usually the grayscale crop every variant starts from).
+        field (str): Field name ('lot', 'asset', 'serial').
+        variants (list[tuple[str, callable]]): Named preprocessing functions, cheapest first.
+        service (OCRService): OCR service, defaults to the shared service.
+        cache (OCRCache): OCR cache, defaults to the shared cache.
+        candidates (callable): Builds a list of (name, image) variants of the crop in one pass, optional.
+
+    Returns:
+        str: The best valid value, or the first non-empty one if no variant yields a valid value.
+    """
+    service = service or get_ocr_service()
+    cache = cache or get_ocr_cache()
+
+    key = cache.key(crop, field)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached[0]
+
+    start = time.perf_counter()
+    fallback = ''
+    for idx, (name, preprocess) in enumerate(variants):
+        image = preprocess(crop)
+        get_debug_sink().record(f'{field}_{name}', image)
+        text = normalize_field(service.read(image, field))
+        if validate_field(field, text):
+            skipped = len(variants) - idx - 1
+            if skipped:
+                cache.record_early_exit(skipped)
+            cache.put(key, text, True, (time.perf_counter() - start) * 1000)
+            return text
+        fallback = fallback or text
+
+    if candidates is not None:
+        built = candidates(crop)
+        for name, image in built:
+            get_debug_sink().record(f'{field}_{name}', image)
+        texts = [normalize_field(text) for text in service.read_many([image for _, image in built], field)]
+
+        votes = {}
+        for idx, text in enumerate(texts):
+            if validate_field(field, text):
+                count, first = votes.get(text, (0, idx))
+                votes[text] = (count + 1, first)
+            fallback = fallback or text
+        if votes:
+            best = max(votes, key=lambda t: (votes[t][0], -votes[t][1]))
+            cache.put(key, best, True, (time.perf_counter() - start) * 1000)
+            return best
+
+    return fallback
@@ -0,0 +1,109 @@
+"""
+OCR preprocessing variants built in one pass.
+
+A single fixed threshold often fails on glossy or unevenly lit labels, which used to mean re-capturing and
+re-detecting the whole laptop. build_variants derives several candidate binarizations from one grayscale crop,
+sharing the intermediate images (blurred crop, Otsu mask, foreground coordinates) between variants, so retrying the
+OCR costs milliseconds instead.
+
+Variants:
+- otsu: Otsu threshold of the denoised crop.
+- adaptive: Gaussian adaptive threshold of the denoised crop, robust to uneven lighting.
+- sharpened: Otsu threshold after a high-pass sharpening, for slightly blurred captures.
+- upscaled: Otsu threshold of the crop upscaled 2x, for small text.
+- deskewed: Otsu mask rotated so the text line is horizontal.
+
+Functions:
+- build_variants(gray_img, names): Build the requested variants of a grayscale crop.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import cv2 as cv
+import numpy as np
+
+VARIANT_NAMES = ('otsu', 'adaptive', 'sharpened', 'upscaled', 'deskewed')
+
+_HIGH_PASS_KERNEL = np.array([[0, -1, 0],
+                              [-1, 5, -1],
+                              [0, -1, 0]], dtype=np.float32)
+
+# Skew angles below this are not worth an affine warp
+_MIN_SKEW_DEGREES = 0.5
+
+
+def _skew_angle(mask):
+    """Angle in degrees of the text line formed by the dark pixels of a binary mask."""
+    coords = cv.findNonZero(cv.bitwise_not(mask))
+    if coords is None or len(coords) < 10:
+        return 0.0
+    (_, _), (w, h), angle = cv.minAreaRect(coords)
+    # the angle convention of minAreaRect changed across OpenCV versions, use the angle of the long side
+    if w < h:
+        angle += 90
+    while angle >= 45:
+        angle -= 90
+    while angle < -45:
+        angle += 90
+    return angle
+
+
+def build_variants(gray_img, names=VARIANT_NAMES):
+    """
+    Build binarized variants of a grayscale crop in one pass.
+
+    Args:
+        gray_img (numpy.ndarray): Grayscale crop.
+        names (tuple[str]): Variants to build, in the order they should be returned.
+
+    Returns:
+        list[tuple[str, numpy.ndarray]]: (name, binary image) for every requested variant.
+    """
+    unknown = set(names) - set(VARIANT_NAMES)
+    if unknown:
+        raise ValueError(f'Unknown OCR preprocessing variants: {sorted(unknown)}')
+
+    shared = {}
+
+    def blurred():
+        if 'blurred' not in shared:
+            shared['blurred'] = cv.GaussianBlur(gray_img, (3, 3), 0)
+        return shared['blurred']
+
+    def otsu():
+        if 'otsu' not in shared:
+            _, shared['otsu'] = cv.threshold(blurred(), 0, 255, cv.THRESH_BINARY + cv.THRESH_OTSU)
+        return shared['otsu']
+
+    def adaptive():
+        block_size = max(3, (min(gray_img.shape[:2]) // 2) | 1)
+        return cv.adaptiveThreshold(blurred(), 255, cv.ADAPTIVE_THRESH_GAUSSIAN_C, cv.THRESH_BINARY,
+                                    min(block_size, 31), 10)
+
+    def sharpened():
+        sharp = cv.filter2D(gray_img, -1, _HIGH_PASS_KERNEL)
+        _, thresh = cv.threshold(sharp, 0, 255, cv.THRESH_BINARY + cv.THRESH_OTSU)
+        return thresh
+
+    def upscaled():
+        large = cv.resize(blurred(), None, fx=2, fy=2, interpolation=cv.INTER_CUBIC)
+        _, thresh = cv.threshold(large, 0, 255, cv.THRESH_BINARY + cv.THRESH_OTSU)
+        return thresh
+
+    def deskewed():
+        mask = otsu()
+        angle = _skew_angle(mask)
+        if abs(angle) < _MIN_SKEW_DEGREES:
+            return mask
+        h, w = mask.shape[:2]
+        rotation = cv.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+        return cv.warpAffine(mask, rotation, (w, h), flags=cv.INTER_NEAREST, borderValue=255)
+
+    builders = {
+        'otsu': otsu,
+        'adaptive': adaptive,
+        'sharpened': sharpened,
+        'upscaled': upscaled,
+        'deskewed': deskewed,
+    }
+    return [(name, builders[name]()) for name in names]
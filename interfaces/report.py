@@ -0,0 +1,397 @@
+"""
+PDF inspection reports.
+
+Every surface image and defect crop is downscaled to the resolution it is printed at (``report.dpi`` over the size it
+occupies on the page) and embedded as a JPEG (``report.jpeg_quality``): ReportLab embeds JPEG data as is, where raw
+pixels are stored losslessly at full camera resolution.
+
+The report of an inspection is built incrementally: as soon as the detection of a surface finishes, its image and
+defect crops are encoded into a ReportFragment in the I/O pool, while the next surfaces are detected. Every new
+fragment rewrites a partial report, so the surfaces already detected survive a crash or a failed surface, and the
+final document is assembled from the encoded fragments once the last one has arrived.
+
+Stations that rarely open the reports can use the ``html`` format instead (``report.format``): a JSON record and a
+static HTML page referencing the JPEG images saved by ImageSaver.save_report_images, written in milliseconds. The PDF
+of such a report is rendered on demand from its record (see pdf_from_record and the File > Report as PDF action).
+
+Classes:
+- ReportFragment: Encoded images of one surface.
+- IncrementalReport: Report built one surface at a time in an executor.
+
+Functions:
+- encode_for_print(image, display_width, dpi, quality): JPEG bytes of an image at print resolution.
+- print_image(image, display_width, dpi, quality): Same, as an ImageReader.
+- render_fragment(camera_port, detected_img, defects, dpi, quality): Encode the images of one surface.
+- write_report(path, fragments, notes): Write a report from encoded fragments.
+- render_pdf_report(path, detected_imgs, defects_list, notes, dpi, quality): Write the report of one laptop at once.
+- write_html_report(directory, name, surfaces, features, notes): Write the JSON record and the HTML page of a laptop.
+- pdf_from_record(record_path, pdf_path, dpi, quality): Render the PDF of an HTML report.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import html
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+import cv2 as cv
+import numpy as np
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from .classes import Defect
+
+# Surface name of every camera port
+SURFACES = {1: 'top', 2: 'bottom', 3: 'keyboard', 4: 'screen', 5: 'left', 6: 'right'}
+
+IMAGE_WIDTH = 500  # points, widest image of a page
+
+
+def encode_for_print(image, display_width, dpi=150, quality=80):
+    """
+    Encode an image for a report.
+
+    Args:
+        image (numpy.ndarray): BGR image.
+        display_width (float): Width of the image on the page, in points (1/72 inch).
+        dpi (int): Print resolution, the image is downscaled beyond it.
+        quality (int): JPEG quality (0-100).
+
+    Returns:
+        bytes: The JPEG, embedded without re-encoding by ReportLab.
+    """
+    if not isinstance(image, np.ndarray):
+        raise ValueError('Image must be a NumPy array')
+    h, w = image.shape[:2]
+    max_width = max(1, int(round(display_width / 72 * dpi)))
+    if w > max_width:
+        image = cv.resize(image, (max_width, max(1, round(h * max_width / w))), interpolation=cv.INTER_AREA)
+    ok, encoded = cv.imencode('.jpg', image, [cv.IMWRITE_JPEG_QUALITY, int(quality)])
+    if not ok:
+        raise ValueError('Image cannot be encoded as JPEG')
+    return encoded.tobytes()
+
+
+def print_image(image, display_width, dpi=150, quality=80):
+    """Encode an image for a report (see encode_for_print) and wrap it in an ImageReader."""
+    return ImageReader(io.BytesIO(encode_for_print(image, display_width, dpi, quality)))
+
+
+class ReportFragment:
+    """
+    Encoded content of one surface.
+
+    Attributes:
+        camera_port (int): Port of the surface.
+        image (tuple): (JPEG bytes, display width, display height) of the annotated image, None without image.
+        defects (list[tuple]): (class, JPEG bytes, display width, display height) of every defect crop.
+    """
+    def __init__(self, camera_port, image, defects):
+        self.camera_port = camera_port
+        self.image = image
+        self.defects = defects
+
+
+def render_fragment(camera_port, detected_img, defects, dpi=150, quality=80):
+    """
+    Encode the annotated image and the defect crops of one surface.
+
+    Args:
+        camera_port (int): Port of the surface.
+        detected_img (numpy.ndarray): Annotated image, None to list the defects only.
+        defects (list[Defect]): Defects of the surface.
+        dpi (int): Print resolution of the images.
+        quality (int): JPEG quality of the images.
+
+    Returns:
+        ReportFragment: The encoded surface.
+    """
+    image = None
+    if detected_img is not None:
+        if not isinstance(detected_img, np.ndarray):
+            raise ValueError('Detected image must be a NumPy array')
+        original_height, original_width = detected_img.shape[:2]
+        display_height = IMAGE_WIDTH * original_height / original_width
+        image = (encode_for_print(detected_img, IMAGE_WIDTH, dpi, quality), IMAGE_WIDTH, display_height)
+
+    encoded = []
+    for d in defects:
+        if not isinstance(d.image, np.ndarray):
+            raise ValueError('Image must be a NumPy array')
+        original_height, original_width = d.image.shape[:2]
+        # small crops are printed at one pixel per point, larger ones fit the page width
+        display_width = min(original_width, IMAGE_WIDTH)
+        display_height = display_width * original_height / original_width
+        encoded.append((d.cls, encode_for_print(d.image, display_width, dpi, quality), display_width, display_height))
+    return ReportFragment(camera_port, image, encoded)
+
+
+def write_report(path, fragments, notes=None):
+    """
+    Write a report from encoded fragments: the notes, then every surface with its defects.
+
+    The file is written next to ``path`` and renamed, a reader never sees a truncated report.
+
+    Args:
+        path (str): Path of the PDF file.
+        fragments (list[ReportFragment]): Surfaces in report order.
+        notes (list[str]): Lines written at the top of the report, e.g. the degradations of a reduced inspection.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    c = canvas.Canvas(path + '.tmp', pagesize=letter)
+    width, height = letter
+
+    y_position = height - 50
+    idx = 0
+
+    for note in notes or []:
+        c.drawString(50, y_position, note)
+        y_position -= 20
+
+    for fragment in fragments:
+        if fragment.image is not None:
+            jpeg, display_width, display_height = fragment.image
+            if y_position - display_height < 100:  # end of page
+                c.showPage()
+                y_position = height - 50
+            c.drawString(50, y_position, f'Surface: {SURFACES.get(fragment.camera_port, fragment.camera_port)}')
+            y_position -= 20
+            c.drawImage(ImageReader(io.BytesIO(jpeg)), 50, y_position - display_height,
+                        width=display_width, height=display_height)
+            y_position -= (display_height + 20)
+
+            if y_position < 100:  # end of page
+                c.showPage()
+                y_position = height - 50
+
+        for cls, jpeg, display_width, display_height in fragment.defects:
+            c.drawString(50, y_position, f'Defect {idx + 1}: {cls}')
+            idx += 1
+            y_position -= 20
+
+            c.drawImage(ImageReader(io.BytesIO(jpeg)), 50, y_position - display_height,
+                        width=display_width, height=display_height)
+            y_position -= (display_height + 20)
+
+            if y_position < 100:  # end of page
+                c.showPage()
+                y_position = height - 50
+
+    c.save()
+    os.replace(path + '.tmp', path)
+
+
+def render_pdf_report(path, detected_imgs, defects_list, notes=None, dpi=150, quality=80):
+    """
+    Write the PDF report of one laptop at once.
+
+    Args:
+        path (str): Path of the PDF file.
+        detected_imgs (list[tuple]): (annotated image, camera port) of every surface.
+        defects_list (list[tuple[list[Defect], int]]): Detected defects grouped by camera port.
+        notes (list[str]): Lines written at the top of the report.
+        dpi (int): Print resolution of the images.
+        quality (int): JPEG quality of the images.
+    """
+    images = {port: img for img, port in detected_imgs}  # the last image of a port wins
+    fragments = [render_fragment(camera_port, images.get(camera_port), defects, dpi, quality)
+                 for defects, camera_port in defects_list]
+    write_report(path, fragments, notes)
+
+
+class IncrementalReport:
+    """
+    Report of one inspection built one surface at a time.
+
+    add_surface() encodes a surface in the executor and rewrites the partial report with every surface encoded so far.
+    finish() assembles the final report once the surfaces added have been encoded, in the executor thread encoding the
+    last one (or a new task), so that no executor thread waits for another.
+
+    Attributes:
+        partial_path (str): Partial report, removed once the final report is written.
+        assemble_ms (float): Duration of the assembly of the final report, None before.
+        failed_ports (list[int]): Surfaces whose encoding raised an exception, left out of the report.
+    """
+    def __init__(self, partial_path, executor, dpi=150, quality=80):
+        self.partial_path = partial_path
+        self.executor = executor
+        self.dpi = dpi
+        self.quality = quality
+        self.assemble_ms = None
+        self.failed_ports = []
+        self._fragments = {}  # order of add_surface() mapped to the fragment
+        self._added = 0
+        self._pending = 0
+        self._final = None  # (path, notes) once finish() has been called
+        self._assembled = False  # set under _write_lock, no partial report is written after the final one
+        self._done = Future()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def add_surface(self, camera_port, detected_img, defects):
+        """
+        Encode a surface in the executor.
+
+        Args:
+            camera_port (int): Port of the surface.
+            detected_img (numpy.ndarray): Annotated image, None to list the defects only.
+            defects (list[Defect]): Defects of the surface.
+        """
+        with self._lock:
+            if self._final is not None:
+                raise RuntimeError('Surface added to a finished report')
+            order = self._added
+            self._added += 1
+            self._pending += 1
+        self.executor.submit(self._render, order, camera_port, detected_img, defects)
+
+    def _render(self, order, camera_port, detected_img, defects):
+        try:
+            fragment = render_fragment(camera_port, detected_img, defects, self.dpi, self.quality)
+        except Exception as e:
+            print(f'Report of surface {camera_port} failed: {e!r}')
+            fragment = None
+        with self._lock:
+            if fragment is None:
+                self.failed_ports.append(camera_port)
+            else:
+                self._fragments[order] = fragment
+            self._pending -= 1
+            final = self._final if self._pending == 0 else None
+        if final is not None:
+            self._assemble(*final)
+        elif fragment is not None:
+            self._write_partial()
+
+    def fragments(self):
+        with self._lock:
+            return [self._fragments[order] for order in sorted(self._fragments)]
+
+    def _write_partial(self):
+        fragments = self.fragments()
+        ports = ', '.join(str(SURFACES.get(f.camera_port, f.camera_port)) for f in fragments)
+        try:
+            with self._write_lock:
+                if self._assembled:
+                    return
+                write_report(self.partial_path, fragments, [f'Partial report, surfaces: {ports}'])
+        except OSError as e:
+            print(f'Partial report {self.partial_path} not written: {e!r}')
+
+    def finish(self, path, notes=None):
+        """
+        Assemble the final report once every surface added has been encoded.
+
+        Args:
+            path (str): Path of the final report.
+            notes (list[str]): Lines written at the top of the report.
+
+        Returns:
+            concurrent.futures.Future: Resolves to ``path`` once the report is written.
+        """
+        with self._lock:
+            self._final = (path, notes)
+            ready = self._pending == 0
+        if ready:
+            self.executor.submit(self._assemble, path, notes)
+        return self._done
+
+    def _assemble(self, path, notes):
+        start = time.perf_counter()
+        if self.failed_ports:
+            notes = list(notes or []) + [f'Surfaces missing from the report: {self.failed_ports}']
+        try:
+            with self._write_lock:
+                self._assembled = True
+                write_report(path, self.fragments(), notes)
+                if os.path.exists(self.partial_path):
+                    os.remove(self.partial_path)
+        except Exception as e:
+            self._done.set_exception(e)
+            return
+        self.assemble_ms = (time.perf_counter() - start) * 1000
+        self._done.set_result(path)
+
+
+def _json_default(value):
+    """Convert the numpy values of the detected features for json."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def write_html_report(directory, name, surfaces, features=None, notes=None):
+    """
+    Write the JSON record and the static HTML page of a laptop.
+
+    Args:
+        directory (str): Folder of the report, holding the images of ``surfaces``.
+        name (str): Name of the files, ``<name>.json`` and ``<name>.html``.
+        surfaces (list[dict]): Surfaces and defects with their image files, see ImageSaver.save_report_images.
+        features (dict): Detected features of the laptop, stored in the record.
+        notes (list[str]): Lines written at the top of the report.
+
+    Returns:
+        str: Path of the JSON record.
+    """
+    os.makedirs(directory, exist_ok=True)
+    record = {'name': name, 'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'notes': list(notes or []),
+              'features': features or {}, 'surfaces': surfaces}
+    record_path = os.path.join(directory, f'{name}.json')
+    with open(record_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(record, f, default=_json_default, indent=1)
+    os.replace(record_path + '.tmp', record_path)
+
+    lines = [f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{html.escape(name)}</title></head><body>',
+             f'<h1>{html.escape(name)}</h1>', f'<p>{record["created"]}</p>']
+    lines += [f'<p>{html.escape(note)}</p>' for note in record['notes']]
+    idx = 0
+    for surface in surfaces:
+        lines.append(f'<h2>Surface: {html.escape(surface["surface"])}</h2>')
+        if surface['image']:
+            lines.append(f'<img src="{html.escape(surface["image"])}" width="800" loading="lazy">')
+        for defect in surface['defects']:
+            idx += 1
+            lines.append(f'<p>Defect {idx}: {html.escape(defect["cls"])}</p>')
+            lines.append(f'<img src="{html.escape(defect["image"])}" loading="lazy">')
+    lines.append('</body></html>')
+    with open(os.path.join(directory, f'{name}.html'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    return record_path
+
+
+def pdf_from_record(record_path, pdf_path=None, dpi=150, quality=80):
+    """
+    Render the PDF of an HTML report from its JSON record and images.
+
+    Args:
+        record_path (str): Path of the JSON record.
+        pdf_path (str): Path of the PDF, defaults to the record path with a .pdf extension.
+        dpi (int): Print resolution of the images.
+        quality (int): JPEG quality of the images.
+
+    Returns:
+        str: Path of the PDF.
+    """
+    with open(record_path, 'r', encoding='utf-8') as f:
+        record = json.load(f)
+    directory = os.path.dirname(record_path)
+    pdf_path = pdf_path or os.path.splitext(record_path)[0] + '.pdf'
+
+    fragments = []
+    for surface in record['surfaces']:
+        image = cv.imread(os.path.join(directory, surface['image'])) if surface['image'] else None
+        defects = [Defect(cv.imread(os.path.join(directory, d['image'])), d['cls'], tuple(d['xyxy']))
+                   for d in surface['defects']]
+        fragments.append(render_fragment(surface['port'], image, defects, dpi, quality))
+    write_report(pdf_path, fragments, record['notes'])
+    return pdf_path
@@ -0,0 +1,111 @@
+"""
+CPU sharing between the live previews and the inference.
+
+On the CPU-only stations the six camera threads keep reading, decoding and converting frames while the detection
+runs, and the executor threads of the inference each start as many torch/OpenCV intra-op threads as there are cores.
+ResourceGovernor throttles the cameras (or freezes their previews on the last frame) while at least one inference is
+running and restores them afterwards; a capture lifts the throttle while it runs, since it needs fresh frames.
+limit_inference_threads() caps the intra-op threads so that the inference workers do not oversubscribe the cores.
+
+Classes:
+- ResourceGovernor: Throttles the camera threads during the inferences.
+
+Functions:
+- limit_inference_threads(torch_threads, opencv_threads, workers): Set the intra-op thread counts.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import threading
+from contextlib import contextmanager
+
+import cv2 as cv
+
+from .executors import physical_cores
+from .settings import get_settings
+
+
+def limit_inference_threads(torch_threads=0, opencv_threads=0, workers=1):
+    """
+    Set the intra-op thread counts of torch and OpenCV, which apply to the whole process.
+
+    Args:
+        torch_threads (int): Threads of one torch operation, 0 for the physical cores shared between the workers.
+        opencv_threads (int): Threads of one OpenCV operation, 0 for the physical cores shared between the workers.
+        workers (int): Inferences running at the same time.
+
+    Returns:
+        dict: The thread counts applied, None for torch when it is not installed.
+    """
+    share = max(1, physical_cores() // max(1, workers))
+    torch_threads = torch_threads or share
+    opencv_threads = opencv_threads or share
+    cv.setNumThreads(opencv_threads)
+    try:
+        import torch
+    except ImportError:
+        torch_threads = None
+    else:
+        torch.set_num_threads(torch_threads)
+    return {'torch': torch_threads, 'opencv': opencv_threads}
+
+
+class ResourceGovernor:
+    """
+    Throttles the camera threads while inferences run.
+
+    Settings (``resources``): ``preview_mode`` 'throttle', 'freeze' or 'off', ``throttled_fps`` frames read per
+    second by a throttled camera.
+
+    Attributes:
+        targets (callable): Returns the objects to throttle, each having set_throttle(fps) (see VideoThread).
+        mode (str): 'throttle', 'freeze' or 'off'.
+        throttled_fps (float): Frames per second in 'throttle' mode.
+    """
+    def __init__(self, targets, mode='throttle', throttled_fps=2.0):
+        self.targets = targets
+        self.mode = mode
+        self.throttled_fps = throttled_fps
+        self._inferences = 0
+        self._captures = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, targets):
+        settings = get_settings()['resources']
+        return cls(targets, settings['preview_mode'], settings['throttled_fps'])
+
+    def throttle_fps(self):
+        """
+        Returns:
+            float: Frame rate the cameras should run at now, 0 when frozen, None when not throttled.
+        """
+        with self._lock:
+            if self.mode == 'off' or self._inferences == 0 or self._captures > 0:
+                return None
+            return 0 if self.mode == 'freeze' else self.throttled_fps
+
+    def apply(self):
+        fps = self.throttle_fps()
+        for target in self.targets():
+            target.set_throttle(fps)
+
+    @contextmanager
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+        self.apply()
+        try:
+            yield
+        finally:
+            with self._lock:
+                setattr(self, name, getattr(self, name) - 1)
+            self.apply()
+
+    def inference(self):
+        """Context manager throttling the cameras while an inference runs."""
+        return self._count('_inferences')
+
+    def capture(self):
+        """Context manager restoring the cameras while a capture runs."""
+        return self._count('_captures')
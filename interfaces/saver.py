@@ -3,7 +3,8 @@ Model Name: ImageSaver.py
 Description: Handles saving images into the dataset directory.
 
 Classes:
-- ImageSaver: Provides functionality to save processed and raw images into organized directories.
+- ImageSaver: Provides functionality to save processed and raw images into organized directories, and the images
+  referenced by the HTML reports.
 
 Author: Kun
 Last Modified: 03 Jul 2024
@@ -12,6 +13,7 @@ import os
 import cv2 as cv
 from datetime import datetime
 import numpy as np
+from .report import SURFACES
 
 # Mapping of camera ports to descriptive names
 TRANSFER = {0: 'top', 1: 'bottom', 2: 'left', 3: 'right', 4: 'screen', 5: 'keyboard'}
@@ -87,6 +89,52 @@ class ImageSaver:
             cv.imwrite(file_path, image)
             print(f'Saved image: {file_path}')
 
+    @staticmethod
+    def surface_file_name(name, camera_port):
+        """File name of the image of a surface of an HTML report."""
+        return f"{name}_{SURFACES.get(camera_port, f'camera{camera_port}')}.jpg"
+
+    def save_report_images(self, folder_name, name, detected_imgs, defects_list, width=1024, quality=80):
+        """
+        Save the images of an HTML report once: every detected surface downscaled to ``width`` pixels and every
+        defect crop, as JPEG.
+
+        Args:
+            folder_name (str): Name of the sub-folder holding the report.
+            name (str): Prefix of the files (e.g. lot number).
+            detected_imgs (list[tuple]): Detected images and their camera ports.
+            defects_list (list[tuple]): Defects (see interfaces.classes.Defect) grouped by camera port.
+            width (int): Largest width of the surface images.
+            quality (int): JPEG quality (0-100).
+
+        Returns:
+            list[dict]: For every surface of ``defects_list``: 'port', 'surface', 'image' (file name relative to the
+            folder, None without image) and 'defects' ('cls', 'xyxy', 'image') in report order.
+        """
+        save_directory = os.path.join(self.save_directory, folder_name)
+        os.makedirs(save_directory, exist_ok=True)
+        params = [cv.IMWRITE_JPEG_QUALITY, int(quality)]
+        images = {port: image for image, port in detected_imgs}
+
+        surfaces = []
+        for defects, camera_port in defects_list:
+            surface = SURFACES.get(camera_port, f'camera{camera_port}')
+            image = images.get(camera_port)
+            file_name = None
+            if image is not None:
+                h, w = image.shape[:2]
+                if w > width:
+                    image = cv.resize(image, (width, max(1, round(h * width / w))), interpolation=cv.INTER_AREA)
+                file_name = self.surface_file_name(name, camera_port)
+                cv.imwrite(os.path.join(save_directory, file_name), image, params)
+            crops = []
+            for i, d in enumerate(defects):
+                crop_name = f'{name}_{surface}_defect{i + 1}.jpg'
+                cv.imwrite(os.path.join(save_directory, crop_name), d.image, params)
+                crops.append({'cls': d.cls, 'xyxy': [int(v) for v in d.xyxy], 'image': crop_name})
+            surfaces.append({'port': camera_port, 'surface': surface, 'image': file_name, 'defects': crops})
+        return surfaces
+
 
 if __name__ == '__main__':
     saver = ImageSaver()
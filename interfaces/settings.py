@@ -0,0 +1,207 @@
+"""
+Station settings for the Detection Application.
+
+Every tunable of the station lives in one nested dictionary. Defaults are defined in ``DEFAULT_SETTINGS`` and can be
+overridden per station by a ``settings.json`` file in the project root (or the file named by the
+``DETECTION_APP_SETTINGS`` environment variable). Only the keys present in the file are overridden.
+
+Functions:
+- load_settings(path): Load settings from a json file merged over the defaults.
+- get_settings(): Return the cached station settings, loading them on first use.
+- reset_settings(): Drop the cached settings (used by tests or after editing the file).
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import copy
+import json
+import os
+import threading
+
+_root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SETTINGS_FILE = os.path.join(_root_dir, 'settings.json')
+
+_UPPER_DIGITS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+DEFAULT_SETTINGS = {
+    'ocr': {
+        'backend': 'auto',  # 'auto', 'tesserocr' (persistent C API engines) or 'subprocess' (pytesseract)
+        'pool_size': 2,
+        'tesseract_cmd': r'C:\Program Files\Tesseract-OCR\tesseract.exe',
+        'language': 'eng',
+        'cache_size': 256,  # number of OCR results cached by crop hash
+    },
+    # validation rules of the identification fields, see interfaces.fields
+    'fields': {
+        'lot': {'min_length': 4, 'max_length': 20, 'charset': _UPPER_DIGITS + '-', 'pattern': '', 'check_digit': ''},
+        'asset': {'min_length': 3, 'max_length': 20, 'charset': _UPPER_DIGITS + '-', 'pattern': '', 'check_digit': ''},
+        'serial': {'min_length': 6, 'max_length': 20, 'charset': _UPPER_DIGITS, 'pattern': '', 'check_digit': ''},
+    },
+    'debug': {
+        'mode': 'off',  # 'off', 'disk' or 'qt', see interfaces.debug_sink
+        'directory': 'dataset/debug',
+        'capacity': 64,
+    },
+    'barcode': {
+        # regular expressions with a 'value' group extracting each field from a decoded payload
+        'patterns': {
+            'lot': r'(?i)\bLOT\s*(?:NO|NUMBER)?[.:=#\s-]*(?P<value>[A-Z0-9-]+)',
+            'asset': r'(?i)\bASSET\s*(?:NO|NUMBER)?[.:=#\s-]*(?P<value>[A-Z0-9-]+)',
+        },
+        # field of a payload without prefix if it passes the rules of that field, empty to ignore such payloads
+        'bare_field': '',
+    },
+    # frame sources of the camera ports, see interfaces.camera_sources
+    'cameras': {
+        'ports': [1, 2, 3, 4, 5, 6],  # candidate ports, see interfaces.camera_discovery
+        'probe_timeout': 2.0,  # seconds allowed to probe all ports in parallel
+        'refresh_interval': 10.0,  # seconds between two background refreshes of the device map, 0 to disable
+        'device_map': 'dataset/camera_map.json',  # cached live ports and capabilities
+        'idle_timeout': 600.0,  # seconds a stopped camera stays opened before its device is released, 0 for ever
+        'default': {
+            'backend': 'auto',  # 'auto', 'dshow', 'v4l2', 'any', 'file' or 'synthetic'
+            'width': 0,  # requested resolution and fps, 0 keeps the driver default
+            'height': 0,
+            'fps': 0,
+            'fourcc': '',  # e.g. 'MJPG', v4l2 requests MJPG when empty
+            'buffer_size': 1,  # frames queued by the driver
+            # stream profiles ({'width', 'height', 'fps'}): previews stream with 'preview', capture switches to
+            # 'still' for a burst of full resolution frames. Empty profiles keep a single stream, e.g.
+            # {"preview": {"width": 640, "height": 360}, "still": {"width": 1920, "height": 1080}}
+            'profiles': {'preview': {}, 'still': {}},
+            # run the source in a dedicated process writing into a shared-memory ring, see interfaces.camera_process
+            'process': False,
+            'ring_slots': 10,  # frames of the ring, more than the frame buffer of the camera thread (8)
+            'max_resolution': [1920, 1080],  # largest frame written into the ring
+            'max_restarts': 3,  # restarts of a crashed camera process
+        },
+        # port number (as a string) mapped to the keys overriding the default, e.g.
+        # {"1": {"width": 1920, "height": 1080, "fps": 30}, "3": {"backend": "file", "path": "dataset/samples/cam3"}}
+        'overrides': {},
+    },
+    'preview': {
+        'max_fps': 15,  # preview frames emitted per camera and second, 0 for no limit
+    },
+    'capture': {
+        'sync_timeout': 0.5,  # seconds to wait for every camera to deliver a frame after the trigger
+        'burst_size': 3,  # frames scored per camera, the sharpest one is detected (at most 8, the ring buffer size)
+    },
+    # captured laptops waiting for detection and reporting, see interfaces.inspection_queue
+    'inspection_queue': {
+        'enabled': True,  # False runs the detection and the report before the next capture
+        'max_depth': 2,  # laptops waiting, the capture waits for a free place beyond
+        'workers': 1,  # laptops processed at the same time
+    },
+    # CPU sharing between the previews and the inference, see interfaces.resource_governor
+    'resources': {
+        'preview_mode': 'throttle',  # while inferences run: 'throttle', 'freeze' (last frame kept) or 'off'
+        'throttled_fps': 2,  # frames read per second by a throttled camera
+        'torch_threads': 0,  # intra-op threads of one torch operation, 0 for the physical cores shared by the workers
+        'opencv_threads': 0,  # same for OpenCV
+    },
+    # thread pools of the model calls, the disk and network I/O and the OCR reads, see interfaces.executors
+    'executors': {
+        'cpu_workers': 0,  # model calls at the same time, 0 for the physical cores
+        'io_workers': 4,  # image and report writing, CSV appends, uploads
+        'ocr_workers': 0,  # concurrent OCR reads, 0 for the OCR engine pool size
+    },
+    # capture triggered when a laptop has been placed and the scene is still, see interfaces.motion
+    'auto_capture': {
+        'enabled': False,
+        'width': 64,  # width of the downsampled frames compared
+        'fps': 15,  # frames compared per second, read even while the previews are throttled or frozen
+        'motion_threshold': 4.0,  # mean difference (0-255) between consecutive frames of a still scene
+        'presence_threshold': 12.0,  # mean difference with the empty scene when a laptop is present
+        'settle_frames': 8,  # still frames before capturing
+        'clear_frames': 5,  # empty frames before the next laptop can be captured
+    },
+    'detection': {
+        'manual_annotation': False,  # let the operator draw missed defects on every detected surface
+    },
+    # PDF reports, see interfaces.report
+    'report': {
+        'format': 'pdf',  # 'pdf', or 'html' for a JSON record and an HTML page, the PDF being rendered on demand
+        'dpi': 150,  # print resolution of the images, larger images are downscaled
+        'jpeg_quality': 80,  # quality of the embedded JPEG images (0-100)
+        'partial_directory': 'dataset/partial',  # reports of the inspections in progress, kept after a crash
+        'html_folder': 'reports',  # folder of the html reports and their images, in the dataset folder
+        'image_width': 1024,  # largest width of the surface images of the html reports, in pixels
+    },
+    # one json line per inspection, streamed by the daily report, see interfaces.inspection_log
+    'inspection_log': {
+        'path': 'dataset/inspections.jsonl',
+    },
+    # laptops saved by the operator, linked to their files and defects, see interfaces.inspection_store
+    'inspection_store': {
+        'path': 'dataset/inspections.db',
+        'batch_size': 256,  # laptops committed in one transaction at most
+        'flush_interval': 0.2,  # seconds the writer waits for more laptops before committing
+        'legacy_csv': 'dataset/dataset.csv',  # imported once into the store, empty to skip
+    },
+    # time budget of the detection of one laptop, see interfaces.inspection_budget
+    'deadline': {
+        'budget_ms': 0,  # detection and report of one laptop, 0 for no budget (always the full inspection)
+        'optional_ports': [3, 4],  # surfaces whose segmentation is skipped as a last resort
+        'alpha': 0.3,  # weight of the newest measurement in the stage cost averages
+        # estimated durations before the first measurements, in milliseconds
+        'priors_ms': {
+            'segment/full': 4000, 'segment/reduced': 1500, 'segment/minimal': 800,
+            'identify_top': 1500, 'identify_top/fast': 600,
+            'identify_serial': 1200, 'identify_serial/fast': 500,
+            'report': 500,
+        },
+    },
+}
+
+_settings = None
+_settings_lock = threading.Lock()
+
+
+def _merge(base, override):
+    """Recursively merge ``override`` into a copy of ``base``."""
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_settings(path=None):
+    """
+    Load station settings.
+
+    Args:
+        path (str): Path of the json file to load. Defaults to ``DETECTION_APP_SETTINGS`` or ``settings.json``.
+
+    Returns:
+        dict: Default settings overridden by the content of the file, if it exists.
+    """
+    path = path or os.environ.get('DETECTION_APP_SETTINGS', SETTINGS_FILE)
+    if not os.path.exists(path):
+        return copy.deepcopy(DEFAULT_SETTINGS)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return _merge(DEFAULT_SETTINGS, json.load(f))
+
+
+def get_settings():
+    """
+    Get the station settings, loading them on first use.
+
+    Returns:
+        dict: The station settings.
+    """
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = load_settings()
+        return _settings
+
+
+def reset_settings():
+    """Drop the cached settings so that the next call to get_settings() reloads them."""
+    global _settings
+    with _settings_lock:
+        _settings = None
@@ -0,0 +1,233 @@
+"""
+Shared-memory ring buffer of camera frames.
+
+A camera process writes its decoded frames into a SharedFrameRing, the application process reads them from the same
+memory. Every slot is protected by a sequence lock: the writer makes the slot version odd while it copies a frame in
+and even (twice the frame sequence number) once done, so a reader detects a slot being written or already overwritten
+without any lock shared between the processes.
+
+Readers can take a frame without copying it (a numpy view of the slot). Such a view stays valid until the writer
+wraps around the ring, i.e. for ``slots - 1`` more frames; is_current() tells whether it has been overwritten.
+
+Classes:
+- SharedFrame: A frame read from the ring, with its capture timestamp and sequence number.
+- SharedFrameRing: The ring buffer.
+- SharedFrameBuffer: FrameBuffer interface over a ring, so the capture code reads the frames of a camera process
+  the same way as the frames of a camera thread.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+SharedFrame = namedtuple('SharedFrame', ['image', 'timestamp', 'seq'])
+
+_HEADER = np.dtype([('latest', '<i8'), ('reserved', '<i8')])
+_SLOT = np.dtype([('version', '<i8'), ('timestamp', '<f8'), ('height', '<i4'), ('width', '<i4'),
+                  ('channels', '<i4'), ('pad', '<i4')])
+
+
+class SharedFrameRing:
+    """
+    Ring buffer of frames in shared memory, one writer and any number of readers.
+
+    Attributes:
+        name (str): Name of the shared memory block, used by other processes to attach to it.
+        slots (int): Number of frames kept.
+        capacity (int): Maximum size of one frame, in bytes.
+    """
+    def __init__(self, name=None, slots=10, capacity=1920 * 1080 * 3, create=False):
+        self.slots = slots
+        self.capacity = capacity
+        size = _HEADER.itemsize + _SLOT.itemsize * slots + capacity * slots
+        if create:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+
+        buf = self._shm.buf
+        self._header = np.ndarray((), dtype=_HEADER, buffer=buf)
+        self._meta = np.ndarray((slots,), dtype=_SLOT, buffer=buf, offset=_HEADER.itemsize)
+        self._data = np.ndarray((slots, capacity), dtype=np.uint8, buffer=buf,
+                                offset=_HEADER.itemsize + _SLOT.itemsize * slots)
+        if create:
+            self._header['latest'] = 0
+            self._meta['version'] = 0
+
+    @property
+    def latest_seq(self):
+        return int(self._header['latest'])
+
+    def write(self, image, timestamp=None):
+        """
+        Copy a frame into the next slot. Only one process may write.
+
+        Args:
+            image (numpy.ndarray): uint8 frame of at most ``capacity`` bytes.
+            timestamp (float): Capture time (time.monotonic), defaults to now.
+
+        Returns:
+            int: Sequence number of the frame.
+        """
+        if image.nbytes > self.capacity:
+            raise ValueError(f'Frame of {image.nbytes} bytes does not fit slots of {self.capacity} bytes')
+        seq = self.latest_seq + 1
+        slot = seq % self.slots
+        meta = self._meta
+        meta['version'][slot] = 2 * seq - 1  # odd: being written
+        self._data[slot, :image.nbytes] = image.reshape(-1)
+        meta['timestamp'][slot] = time.monotonic() if timestamp is None else timestamp
+        meta['height'][slot], meta['width'][slot] = image.shape[:2]
+        meta['channels'][slot] = image.shape[2] if image.ndim == 3 else 1
+        meta['version'][slot] = 2 * seq
+        self._header['latest'] = seq
+        return seq
+
+    def read_seq(self, seq, copy=False):
+        """
+        Read a frame by sequence number.
+
+        Args:
+            seq (int): Sequence number of the frame.
+            copy (bool): Return a copy instead of a view of the slot.
+
+        Returns:
+            SharedFrame: The frame, None if it has not been written yet or has been overwritten.
+        """
+        slot = seq % self.slots
+        meta = self._meta[slot].copy()
+        if seq <= 0 or int(meta['version']) != 2 * seq:
+            return None
+        height, width, channels = int(meta['height']), int(meta['width']), int(meta['channels'])
+        image = self._data[slot, :height * width * channels]
+        image = image.reshape((height, width, channels) if channels > 1 else (height, width))
+        if copy:
+            image = image.copy()
+            if int(self._meta['version'][slot]) != 2 * seq:
+                return None
+        return SharedFrame(image, float(meta['timestamp']), seq)
+
+    def read(self, copy=False):
+        """
+        Read the newest frame.
+
+        Args:
+            copy (bool): Return a copy instead of a view of the slot.
+
+        Returns:
+            SharedFrame: The newest frame, None if nothing has been written yet.
+        """
+        while True:
+            seq = self.latest_seq
+            if seq == 0:
+                return None
+            frame = self.read_seq(seq, copy)
+            if frame is not None:
+                return frame
+            # overwritten meanwhile, take the new latest
+
+    def wait_newer(self, seq, timeout=1.0, poll=0.001, copy=False):
+        """
+        Wait for a frame newer than a sequence number.
+
+        Args:
+            seq (int): Sequence number of the last frame read.
+            timeout (float): Maximum waiting time in seconds.
+            poll (float): Polling period in seconds.
+            copy (bool): Return a copy instead of a view of the slot.
+
+        Returns:
+            SharedFrame: The newest frame, None on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while self.latest_seq <= seq:
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(poll)
+        return self.read(copy)
+
+    def is_current(self, frame):
+        """
+        Returns:
+            bool: True if the slot of a frame read without copy has not been overwritten.
+        """
+        return int(self._meta['version'][frame.seq % self.slots]) == 2 * frame.seq
+
+    def close(self):
+        """Detach from the shared memory. Views still referenced keep the mapping alive until released."""
+        self._header = self._meta = self._data = None
+        try:
+            self._shm.close()
+        except BufferError:
+            pass
+
+    def unlink(self):
+        """Free the shared memory block, by its creator."""
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedFrameBuffer:
+    """
+    Read-only FrameBuffer (see interfaces.frame_buffer) over a SharedFrameRing: the frames are views of the ring
+    and must be copied by readers that keep them longer than a few frame periods.
+
+    Attributes:
+        capacity (int): Number of frames readable, one less than the slots of the ring (one is being written).
+    """
+    def __init__(self, ring):
+        self.ring = ring
+        self.capacity = ring.slots - 1
+        self._cleared_seq = 0
+
+    def latest(self):
+        frame = self.ring.read()
+        return frame if frame is not None and frame.seq > self._cleared_seq else None
+
+    def snapshot(self):
+        """
+        Returns:
+            list[SharedFrame]: Every readable frame, oldest first.
+        """
+        latest = self.ring.latest_seq
+        first = max(self._cleared_seq + 1, latest - self.capacity + 1, 1)
+        frames = [self.ring.read_seq(seq) for seq in range(first, latest + 1)]
+        return [frame for frame in frames if frame is not None]
+
+    def wait_newer(self, timestamp, timeout=1.0, poll=0.001):
+        """
+        Wait for the first frame captured after a given time.
+
+        Args:
+            timestamp (float): Trigger time (time.monotonic).
+            timeout (float): Maximum waiting time in seconds.
+            poll (float): Polling period in seconds.
+
+        Returns:
+            SharedFrame: The first frame newer than ``timestamp``, None on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        checked = None
+        while True:
+            latest = self.ring.latest_seq
+            if latest != checked:
+                checked = latest
+                for frame in self.snapshot():
+                    if frame.timestamp > timestamp:
+                        return frame
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(poll)
+
+    def clear(self):
+        self._cleared_seq = self.ring.latest_seq
+
+    def __len__(self):
+        return len(self.snapshot())
@@ -0,0 +1,148 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+from unittest.mock import MagicMock
+import cv2 as cv
+import numpy as np
+import pytest
+from interfaces import detection_functions
+from interfaces.barcode import decode_barcode, parse_payloads, IdentificationStats
+from interfaces.settings import get_settings
+from exceptions.detection_exceptions import AssetNumberNotFoundException, LotNumberNotFoundException
+
+
+def make_qr(payload):
+    qr = cv.QRCodeEncoder.create().encode(payload)
+    qr = cv.resize(qr, None, fx=4, fy=4, interpolation=cv.INTER_NEAREST)
+    qr = cv.copyMakeBorder(qr, 20, 20, 20, 20, cv.BORDER_CONSTANT, value=255)
+    return cv.cvtColor(qr, cv.COLOR_GRAY2BGR)
+
+
+# bar and space widths of the Code 128 symbols, by value (103-105 start codes A, B, C)
+CODE128 = ('212222 222122 222221 121223 121322 131222 122213 122312 132212 221213 221312 231212 112232 122132 '
+           '122231 113222 123122 123221 223211 221132 221231 213212 223112 312131 311222 321122 321221 312212 '
+           '322112 322211 212123 212321 232121 111323 131123 131321 112313 132113 132311 211313 231113 231311 '
+           '112133 112331 132131 113123 113321 133121 313121 211331 231131 213113 213311 213131 311123 311321 '
+           '331121 312113 312311 332111 314111 221411 431111 111224 111422 121124 121421 141122 141221 112214 '
+           '112412 122114 122411 142112 142211 241211 221114 413111 241112 134111 111242 121142 121241 114212 '
+           '124112 124211 411212 421112 421211 212141 214121 412121 111143 111341 131141 114113 114311 411113 '
+           '411311 113141 114131 311141 411131 211412 211214 211232').split()
+
+
+def make_code128(payload, module=3, height=80, values=None):
+    """Code 128 (code set B) barcode image of a payload, or of the symbol values after the start code."""
+    values = [104] + (values if values is not None else [ord(c) - 32 for c in payload])
+    values.append(sum(i * v if i else v for i, v in enumerate(values)) % 103)
+    widths = ''.join(CODE128[v] for v in values) + '2331112'
+    row = [255] * (10 * module)
+    for i, width in enumerate(widths):
+        row += [0 if i % 2 == 0 else 255] * (int(width) * module)
+    row += [255] * (10 * module)
+    img = np.repeat(np.array([row], dtype=np.uint8), height, axis=0)
+    img = cv.copyMakeBorder(img, 20, 20, 0, 0, cv.BORDER_CONSTANT, value=255)
+    return cv.cvtColor(img, cv.COLOR_GRAY2BGR)
+
+
+def make_model(boxes):
+    """Mock YOLO model returning one box per (class id, xyxy)."""
+    model = MagicMock()
+    model.names = {0: 'asset', 1: 'lot', 2: 'barcode'}
+    mock_boxes = []
+    for cls_id, xyxy in boxes:
+        box = MagicMock()
+        box.cls = [MagicMock(item=MagicMock(return_value=cls_id))]
+        box.xyxy = [MagicMock(tolist=MagicMock(return_value=list(xyxy)))]
+        mock_boxes.append(box)
+    result = MagicMock()
+    result.boxes = mock_boxes
+    model.return_value = [result]
+    return model
+
+
+def test_decode_qr_code():
+    """Test that QR codes are decoded offline."""
+    assert decode_barcode(make_qr('LOT:AB12345;ASSET:99887')) == ['LOT:AB12345;ASSET:99887']
+
+
+def test_decode_code128():
+    """Test that 1D Code 128 label barcodes are decoded offline."""
+    assert decode_barcode(make_code128('LOT:AB12345')) == ['LOT:AB12345']
+    assert decode_barcode(cv.rotate(make_code128('ASSET:A0042', module=1), cv.ROTATE_180)) == ['ASSET:A0042']
+    # 'A' in code set B, switch to code set C, '0042'
+    assert decode_barcode(make_code128('', values=[33, 99, 0, 42])) == ['A0042']
+
+
+def test_decode_empty_crop():
+    """Test that a crop without barcode decodes to nothing."""
+    assert decode_barcode(np.full((60, 200, 3), 255, dtype=np.uint8)) == []
+    assert decode_barcode(None) == []
+
+
+def test_parse_payloads(monkeypatch):
+    """Test that payloads are mapped to label fields."""
+    assert parse_payloads(['LOT:AB12345;ASSET:99887']) == {'lot': 'AB12345', 'asset': '99887'}
+    assert parse_payloads(['Lot No. 777']) == {'lot': '777'}
+    assert parse_payloads(['A0042']) == {}  # bare payloads are ignored by default
+    monkeypatch.setitem(get_settings()['barcode'], 'bare_field', 'asset')
+    assert parse_payloads(['A0042']) == {'asset': 'A0042'}
+    assert parse_payloads(['https://vendor.example/p/42']) == {}  # fails the asset rules
+
+
+def test_identification_stats_report():
+    """Test the per-field report of identification paths."""
+    stats = IdentificationStats()
+    stats.record('lot', 'barcode', 2.0)
+    stats.record('lot', 'ocr', 100.0)
+    stats.record('asset', 'missing')
+
+    report = stats.report()
+    assert 'lot: barcode: 1 (50%), ocr: 1 (50%)' in report
+    assert 'asset: missing: 1 (100%)' in report
+    assert 'barcode mean latency: 2.0ms' in report
+
+
+def test_barcode_first_skips_ocr(mocker):
+    """Test that OCR only runs for fields the barcode did not provide."""
+    img = np.full((400, 400, 3), 255, dtype=np.uint8)
+    qr = make_qr('LOT:AB12345')
+    img[0: qr.shape[0], 0: qr.shape[1]] = qr
+    model = make_model([(2, (2, 2, qr.shape[1] - 2, qr.shape[0] - 2)), (1, (300, 300, 350, 320)),
+                        (0, (300, 350, 350, 370))])
+    process_lot = mocker.patch.object(detection_functions, 'process_lot_number', return_value='OCRLOT')
+    process_asset = mocker.patch.object(detection_functions, 'process_asset_number', return_value='OCRASSET')
+
+    sources = {}
+    lot, asset = detection_functions.detect_lot_asset_barcode(img, model, sources)
+
+    assert (lot, asset) == ('AB12345', 'OCRASSET')
+    assert sources == {'lot': 'barcode', 'asset': 'ocr'}
+    process_lot.assert_not_called()
+    process_asset.assert_called_once()
+
+
+def test_missing_lot_raises(mocker):
+    """Test that a lot found neither in the barcode nor by OCR raises LotNumberNotFoundException."""
+    img = np.full((400, 400, 3), 255, dtype=np.uint8)
+    model = make_model([(0, (300, 350, 350, 370))])
+    mocker.patch.object(detection_functions, 'process_asset_number', return_value='A1')
+
+    sources = {}
+    with pytest.raises(LotNumberNotFoundException):
+        detection_functions.detect_lot_asset_barcode(img, model, sources)
+    assert sources['lot'] == 'missing'
+
+
+def test_invalid_barcode_without_crop(mocker):
+    """Test that a barcode value failing validation, without crop to read by OCR, is reported missing."""
+    img = np.full((400, 400, 3), 255, dtype=np.uint8)
+    qr = make_qr('LOT:AB12345;ASSET:9')  # asset shorter than its minimum length
+    img[0: qr.shape[0], 0: qr.shape[1]] = qr
+    model = make_model([(2, (2, 2, qr.shape[1] - 2, qr.shape[0] - 2)), (1, (300, 300, 350, 320))])
+    mocker.patch.object(detection_functions, 'process_lot_number', return_value='OCRLOT')
+
+    sources = {}
+    with pytest.raises(AssetNumberNotFoundException):
+        detection_functions.detect_lot_asset_barcode(img, model, sources)
+    assert sources == {'lot': 'barcode', 'asset': 'missing'}
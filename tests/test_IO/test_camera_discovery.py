@@ -0,0 +1,103 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+
+import threading
+import time
+import pytest
+from interfaces import camera_discovery
+from interfaces.camera_discovery import CameraDiscovery, get_camera_discovery
+from interfaces.camera_sources import SyntheticSource
+
+
+class HangingSource(SyntheticSource):
+    """Source whose open() blocks like a driver waiting for a missing device."""
+    def open(self):
+        time.sleep(0.5)
+        return False
+
+
+def make_factory(live, hanging=()):
+    def factory(port):
+        if port in hanging:
+            return HangingSource(port, {})
+        source = SyntheticSource(port, {'width': 32, 'height': 24, 'fps': 1000})
+        if port not in live:
+            source.open = lambda: False
+        return source
+    return factory
+
+
+def test_discover_probes_in_parallel_with_timeout():
+    """Test that hanging ports are reported missing once the timeout expires."""
+    discovery = CameraDiscovery([1, 2, 3, 4], timeout=0.2, source_factory=make_factory({1, 3}, hanging={2, 4}))
+
+    start = time.monotonic()
+    devices = discovery.discover()
+
+    assert time.monotonic() - start < 0.4
+    assert sorted(devices) == [1, 3]
+    assert devices[1]['width'] == 32
+
+
+def test_device_map_cached(tmp_path):
+    cache_file = str(tmp_path / 'camera_map.json')
+    CameraDiscovery([1, 2], cache_file=cache_file, source_factory=make_factory({2})).discover()
+
+    calls = []
+    discovery = CameraDiscovery([1, 2], cache_file=cache_file, source_factory=lambda port: calls.append(port))
+    assert discovery.live_ports() == [2]
+    assert calls == []
+
+
+def test_busy_ports_not_probed():
+    """Test that ports opened by the application keep their entry without being probed."""
+    discovery = CameraDiscovery([1, 2], source_factory=make_factory({1, 2}))
+    discovery.discover()
+    discovery.source_factory = make_factory(set())
+
+    assert sorted(discovery.discover(skip={2})) == [2]
+
+
+def test_port_not_opened_while_probed():
+    """Test that the application and a probe never open the same device at once."""
+    opened = set()
+    discovery = CameraDiscovery([1, 2], timeout=0.1, source_factory=make_factory({2}, hanging={1}))
+    discovery.discover(skip=lambda: opened)  # the probe of port 1 keeps hanging for 0.5s
+
+    def open_device(port):
+        opened.add(port)
+        return port
+
+    assert discovery.open_port(1, open_device) is None
+    assert discovery.open_port(2, open_device) == 2
+    time.sleep(0.6)  # the hanging probe returns
+    assert discovery.open_port(1, open_device) == 1
+    discovery.source_factory = lambda port: pytest.fail(f'port {port} probed while opened')
+    assert sorted(discovery.discover(skip=lambda: opened)) == [2]
+
+
+def test_monitor_reports_hot_plug():
+    live = {1}
+    changes = []
+    changed = threading.Event()
+    discovery = CameraDiscovery([1, 2], source_factory=lambda port: make_factory(live)(port))
+    discovery.discover()
+
+    live.add(2)
+    discovery.start_monitor(0.01, on_change=lambda devices: (changes.append(sorted(devices)), changed.set()))
+    try:
+        assert changed.wait(2.0)
+    finally:
+        discovery.stop()
+    assert changes[0] == [1, 2]
+
+
+def test_device_map_rooted_at_project(monkeypatch, tmp_path):
+    """Test that the device map of the settings is found from the project root, whatever the working directory."""
+    monkeypatch.setattr(camera_discovery, '_discovery', None)
+    monkeypatch.chdir(tmp_path)
+    discovery = get_camera_discovery()
+    assert discovery.cache_file == os.path.join(project_root, 'dataset', 'camera_map.json')
@@ -0,0 +1,49 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+
+from interfaces.camera_sources import create_source
+from interfaces.camera_process import ProcessSource
+
+CONFIG = {'backend': 'synthetic', 'process': True, 'width': 64, 'height': 48, 'fps': 100,
+          'max_resolution': [128, 96], 'ring_slots': 4, 'read_timeout': 1.0, 'max_restarts': 1}
+
+
+def test_frames_from_camera_process():
+    """Test that frames decoded in the camera process are read from shared memory."""
+    source = create_source(1, CONFIG)
+    assert isinstance(source, ProcessSource)
+    try:
+        assert source.open()
+        ret, frame = source.read()
+        assert ret and frame.shape == (48, 64, 3)
+        assert source.capabilities()['backend'] == 'process/synthetic'
+        assert source.apply_profile({'width': 128, 'height': 96}) == (128, 96)
+    finally:
+        source.release()
+    assert not source.is_opened()
+
+
+def test_crashed_process_restarted():
+    """Test that a killed camera process is restarted, then given up once the restarts are exhausted."""
+    source = create_source(2, CONFIG)
+    try:
+        assert source.open()
+        source.process.kill()
+        source.process.join()
+        ret, _ = source.read()
+        assert ret and source.restarts == 1
+
+        source.process.kill()
+        source.process.join()
+        assert source.read() == (False, None)
+    finally:
+        source.release()
+
+
+def test_process_failing_to_open():
+    source = create_source(3, dict(CONFIG, backend='file', path='does/not/exist'))
+    assert not source.open()
+    assert source.ring is None
@@ -0,0 +1,100 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+
+from unittest.mock import patch
+import cv2 as cv
+import numpy as np
+import pytest
+from interfaces.camera_sources import (create_source, camera_config, SyntheticSource, FileSource, V4L2Source,
+                                       DirectShowSource)
+from interfaces.settings import get_settings
+
+
+def test_create_source_by_backend():
+    assert isinstance(create_source(1, {'backend': 'synthetic'}), SyntheticSource)
+    assert isinstance(create_source(1, {'backend': 'v4l2'}), V4L2Source)
+    assert isinstance(create_source(1, {'backend': 'dshow'}), DirectShowSource)
+    with pytest.raises(ValueError):
+        create_source(1, {'backend': 'firewire'})
+
+
+def test_camera_config_port_override():
+    """Test that port overrides are merged over the default camera settings."""
+    cameras = get_settings()['cameras']
+    cameras['overrides']['3'] = {'backend': 'synthetic', 'width': 320}
+    try:
+        config = camera_config(3)
+        assert config['backend'] == 'synthetic'
+        assert config['width'] == 320
+        assert config['buffer_size'] == cameras['default']['buffer_size']
+        assert camera_config(1)['backend'] == cameras['default']['backend']
+    finally:
+        del cameras['overrides']['3']
+
+
+def test_synthetic_source_is_deterministic():
+    config = {'backend': 'synthetic', 'width': 160, 'height': 120, 'fps': 1000}
+    first, second = create_source(2, config), create_source(2, config)
+    first.open()
+    second.open()
+
+    frames = [first.read()[1] for _ in range(3)]
+    assert all(frame.shape == (120, 160, 3) for frame in frames)
+    assert not np.array_equal(frames[0], frames[1])
+    assert np.array_equal(frames[2], second.frame(2))
+    assert first.capabilities()['width'] == 160
+
+
+def test_synthetic_source_paced_to_fps():
+    source = create_source(1, {'backend': 'synthetic', 'width': 32, 'height': 32, 'fps': 50})
+    source.open()
+    source.read()
+    start = cv.getTickCount()
+    for _ in range(3):
+        source.read()
+    elapsed = (cv.getTickCount() - start) / cv.getTickFrequency()
+    assert elapsed >= 0.05
+
+
+def test_file_source_loops_over_image_folder(tmp_path):
+    for i in range(2):
+        cv.imwrite(str(tmp_path / f'{i}.png'), np.full((8, 8, 3), i * 100, dtype=np.uint8))
+    source = FileSource(1, {'path': str(tmp_path), 'fps': 1000})
+
+    assert source.open()
+    values = [int(source.read()[1][0, 0, 0]) for _ in range(3)]
+    assert values == [0, 100, 0]
+    source.release()
+    assert source.read() == (False, None)
+
+
+def test_file_source_missing_path():
+    assert not FileSource(1, {'path': 'does/not/exist'}).open()
+
+
+def test_v4l2_negotiates_mjpg_and_resolution():
+    """Test that V4L2 requests MJPG, resolution, fps and buffer size from the driver."""
+    with patch('interfaces.camera_sources.cv.VideoCapture') as video_capture:
+        cap = video_capture.return_value
+        cap.isOpened.return_value = True
+        source = V4L2Source(0, {'width': 1920, 'height': 1080, 'fps': 30, 'buffer_size': 1})
+        assert source.open()
+
+    video_capture.assert_called_once_with(0, cv.CAP_V4L2)
+    requested = {call.args[0]: call.args[1] for call in cap.set.call_args_list}
+    assert requested[cv.CAP_PROP_FOURCC] == cv.VideoWriter_fourcc(*'MJPG')
+    assert requested[cv.CAP_PROP_FRAME_WIDTH] == 1920
+    assert requested[cv.CAP_PROP_FRAME_HEIGHT] == 1080
+    assert requested[cv.CAP_PROP_FPS] == 30
+    assert requested[cv.CAP_PROP_BUFFERSIZE] == 1
+
+
+def test_synthetic_source_apply_profile():
+    source = create_source(1, {'backend': 'synthetic', 'width': 64, 'height': 48, 'fps': 1000})
+    source.open()
+    assert source.apply_profile({'width': 320, 'height': 240}) == (320, 240)
+    assert source.read()[1].shape == (240, 320, 3)
+    assert FileSource(1, {}).apply_profile({'width': 320, 'height': 240}) is None
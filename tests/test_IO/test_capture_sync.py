@@ -0,0 +1,75 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+import threading
+import time
+import numpy as np
+from interfaces.frame_buffer import FrameBuffer
+from interfaces.capture_sync import synchronized_snapshot
+
+
+def fill(buffer, timestamps, value=0):
+    for ts in timestamps:
+        buffer.push(np.full((2, 2), value, dtype=np.uint8), timestamp=ts)
+
+
+def test_selects_frames_closest_to_trigger():
+    """Test that each camera contributes the frame closest to the common trigger time."""
+    buffers = {1: FrameBuffer(), 2: FrameBuffer()}
+    fill(buffers[1], [9.90, 9.93, 9.97, 10.00, 10.03])
+    fill(buffers[2], [9.91, 9.95, 9.99, 10.02, 10.06])
+
+    snapshot = synchronized_snapshot(buffers, trigger=10.0, timeout=0)
+
+    assert snapshot.frames[1].timestamp == 10.00
+    assert snapshot.frames[2].timestamp == 9.99
+    assert round(snapshot.skew_ms, 3) == 10.0
+    assert snapshot.stale_ports == []
+    assert [port for _, port in snapshot.images()] == [1, 2]
+
+
+def test_waits_for_frames_after_trigger():
+    """Test that cameras that have not delivered a frame after the trigger yet are waited for."""
+    buffers = {1: FrameBuffer(), 2: FrameBuffer()}
+    trigger = time.monotonic()
+    fill(buffers[1], [trigger - 0.5])
+    fill(buffers[2], [trigger - 0.5])
+    fill(buffers[1], [trigger + 0.001])
+    threading.Timer(0.02, lambda: buffers[2].push(np.ones((2, 2)))).start()
+
+    snapshot = synchronized_snapshot(buffers, trigger=trigger, timeout=1.0)
+
+    assert snapshot.frames[2].image[0, 0] == 1
+    assert snapshot.skew_ms < 500
+
+
+def test_reports_stale_cameras():
+    """Test that a camera delivering no frame after the trigger is reported but still used."""
+    buffers = {1: FrameBuffer(), 3: FrameBuffer(), 4: FrameBuffer()}
+    trigger = time.monotonic()
+    fill(buffers[1], [trigger + 0.001])
+    fill(buffers[3], [trigger - 1.0])
+
+    snapshot = synchronized_snapshot(buffers, trigger=trigger, timeout=0.01)
+
+    assert snapshot.stale_ports == [3, 4]
+    assert sorted(snapshot.frames) == [1, 3]
+
+
+def test_burst_selects_sharpest_frame_after_trigger():
+    """Test that with a burst, the sharpest of the frames after the trigger is selected."""
+    buffer = FrameBuffer()
+    blurred = np.full((32, 32), 128, dtype=np.uint8)
+    sharp = np.indices((32, 32)).sum(axis=0).astype(np.uint8) % 2 * 255
+    buffer.push(sharp, timestamp=9.99)  # before the trigger, ignored
+    buffer.push(blurred, timestamp=10.01)
+    buffer.push(sharp, timestamp=10.02)
+    buffer.push(blurred, timestamp=10.03)
+
+    snapshot = synchronized_snapshot({1: buffer}, trigger=10.0, timeout=0, burst=3)
+
+    assert snapshot.frames[1].timestamp == 10.02
+    selected, scores = snapshot.bursts[1]
+    assert selected == 1 and len(scores) == 3
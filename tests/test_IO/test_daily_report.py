@@ -0,0 +1,107 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+from datetime import date, datetime
+import numpy as np
+from interfaces.classes import Defect
+from interfaces.daily_report import aggregate, write_html, write_pdf
+from interfaces.inspection_log import InspectionLog, inspection_record
+from interfaces.inspection_store import InspectionStore
+
+
+def _record(day, grade='A', defects=None, ocr_failed=(), stage_ms=None):
+    return {'time': f'{day}T10:00:00', 'job': 1, 'model': 'Apple', 'lot': 'LOT1', 'serial': 'SERIAL1',
+            'grade': grade, 'defects': defects or {}, 'ocr_failed': list(ocr_failed),
+            'stage_ms': stage_ms or {}, 'mode': 'full'}
+
+
+def test_inspection_record():
+    """Test that a record counts the defect classes, grades the laptop and lists the fields not read."""
+    image = np.zeros((10, 10, 3), dtype=np.uint8)
+    features = {'job': 3, 'logo': 'Apple', 'lot': 'LOT1', 'serial': 'Serial_Not_Found',
+                'detected_info': [((11, 0), 1), ((1, 2), 2)], 'stage_ms': {'segment': 812.345}}
+    defects_list = [([Defect(image, 'scratch', (0, 0, 1, 1))] * 2, 1), ([Defect(image, 'stain', (0, 0, 1, 1))], 2)]
+    record = inspection_record(features, defects_list, when=datetime(2026, 10, 19, 9, 30))
+    assert record['time'] == '2026-10-19T09:30:00'
+    assert record['grade'] == 'C'
+    assert record['defects'] == {'scratch': 2, 'stain': 1}
+    assert record['ocr_failed'] == ['serial']
+    assert record['stage_ms'] == {'segment': 812.3}
+
+
+def test_iter_records_date_range(tmp_path):
+    """Test that the log streams back the records of a date range and skips a truncated line."""
+    log = InspectionLog(str(tmp_path / 'log' / 'inspections.jsonl'))
+    for day in ('2026-10-01', '2026-10-02', '2026-10-03'):
+        log.append(_record(day))
+    with open(log.path, 'a', encoding='utf-8') as f:
+        f.write('{"time": "2026-10-02T11:00:00", "gra')
+    days = [record['time'][:10] for record in log.iter_records('2026-10-02', '2026-10-03')]
+    assert days == ['2026-10-02', '2026-10-03']
+    assert len(list(log.iter_records())) == 3
+
+
+def test_aggregate_per_day():
+    """Test the counters of every day, independent of the chunk size."""
+    records = [
+        _record('2026-10-01', 'A', {'scratch': 2}, stage_ms={'segment': 1000}),
+        _record('2026-10-01', 'C', {'scratch': 1, 'stain': 4}, ['lot'], {'segment': 3000, 'identify_top': 500}),
+        _record('2026-10-03', 'A', ocr_failed=['serial'], stage_ms={'segment': 2000}),
+        _record('2026-11-01', 'A'),  # out of range
+    ]
+    for chunk_size in (1, 3, 100):
+        summary = aggregate(iter(records), date(2026, 10, 1), date(2026, 10, 3), chunk_size=chunk_size)
+        rows = summary.rows()
+        assert [row['day'] for row in rows] == ['2026-10-01', '2026-10-03']
+        assert rows[0]['inspections'] == 2
+        assert rows[0]['grades'] == {'A': 1, 'C': 1}
+        assert rows[0]['defects'] == {'scratch': 3, 'stain': 4}
+        assert rows[0]['ocr_failed'] == {'lot': 0.5, 'serial': 0.0}
+        assert rows[0]['stage_ms'] == {'identify_top': 500.0, 'segment': 2000.0}
+        assert rows[1]['stage_ms'] == {'segment': 2000.0}
+        stages = {stage: (runs, mean) for stage, runs, mean, _, _ in summary.stages()}
+        assert stages == {'identify_top': (1, 500.0), 'segment': (3, 2000.0)}
+
+
+def test_grades_saved_by_operator(tmp_path):
+    """Test that the grades of the summary are replaced by the grades of the inspection store."""
+    records = [_record('2026-10-01', 'C'), _record('2026-10-01', 'C'), _record('2026-10-02', 'A')]
+    store = InspectionStore(str(tmp_path / 'inspections.db'), flush_interval=0.01)
+    for day, grade in (('2026-10-01', 'A'), ('2026-10-01', 'C'), ('2026-10-02', 'A'), ('2026-10-05', 'C')):
+        store.add({'time': f'{day}T10:00:00', 'serial': 'SERIAL1', 'grade': grade})
+    store.flush()
+    summary = aggregate(records, date(2026, 10, 1), date(2026, 10, 3))
+    summary.set_grades(store.grades_per_day('2026-10-01', '2026-10-03'))
+    store.close()
+
+    rows = summary.rows()
+    assert rows[0]['inspections'] == 2
+    assert rows[0]['grades'] == {'A': 1, 'C': 1}
+    assert rows[1]['grades'] == {'A': 1, 'C': 0}
+
+
+def test_percentile_within_bin():
+    """Test that the percentiles from the histograms are close to the exact ones."""
+    durations = np.random.default_rng(0).lognormal(7, 0.5, 5000)
+    records = [_record('2026-10-01', stage_ms={'segment': float(ms)}) for ms in durations]
+    summary = aggregate(records, date(2026, 10, 1), date(2026, 10, 1))
+    for q in (50, 95):
+        assert abs(summary.percentile('segment', q) / np.percentile(durations, q) - 1) < 0.06
+
+
+def test_write_summary(tmp_path):
+    """Test that the summary is written as HTML and PDF."""
+    records = [_record('2026-10-01', 'A', {'scratch': 2}, stage_ms={'segment': 1000}),
+               _record('2026-10-02', 'C', {'stain': 1}, ['lot'], {'segment': 3000})]
+    summary = aggregate(records, date(2026, 10, 1), date(2026, 10, 2))
+    html_path, pdf_path = str(tmp_path / 'daily.html'), str(tmp_path / 'daily.pdf')
+    write_html(summary, html_path)
+    write_pdf(summary, pdf_path)
+    with open(html_path, encoding='utf-8') as f:
+        page = f.read()
+    assert '2026-10-02: 1 laptops' in page
+    assert '<td>segment</td>' in page
+    with open(pdf_path, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
@@ -0,0 +1,64 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+import numpy as np
+import pytest
+from interfaces import debug_sink
+from interfaces.debug_sink import DebugSink, DiskDebugSink, QtDebugSink, configure_debug_sink, get_debug_sink
+
+
+@pytest.fixture(autouse=True)
+def reset_sink():
+    yield
+    configure_debug_sink('off')
+
+
+def test_off_sink_is_default():
+    """Test that the pipeline sink discards images unless configured otherwise."""
+    debug_sink._debug_sink = None
+    sink = get_debug_sink()
+
+    assert type(sink) is DebugSink
+    sink.record('lot', np.zeros((10, 10), dtype=np.uint8))
+
+
+def test_disk_sink_writes_images(tmp_path):
+    """Test that the disk sink writes recorded images in the background."""
+    sink = configure_debug_sink('disk', directory=str(tmp_path), capacity=8)
+    image = np.zeros((10, 10), dtype=np.uint8)
+    sink.record('lot', image)
+    sink.record('serial', image)
+    sink.close()
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert len(files) == 2
+    assert files[0].endswith('_lot.png') and files[1].endswith('_serial.png')
+
+
+def test_disk_sink_drops_oldest_when_full(tmp_path):
+    """Test that recording never blocks when the writer falls behind."""
+    sink = DiskDebugSink(str(tmp_path), capacity=2)
+    image = np.zeros((10, 10), dtype=np.uint8)
+    with sink._condition:  # keep the writer from draining the buffer
+        for name in ('a', 'b', 'c'):
+            sink.record(name, image)
+        assert [item[2] for item in sink._buffer] == ['b', 'c']
+    sink.close()
+
+    assert sink.dropped == 1
+    assert sink.written == 2
+
+
+def test_record_copies_image():
+    """Test that the recorded image is not affected by later drawing on the original."""
+    sink = QtDebugSink()
+    received = []
+    sink.image_recorded.connect(lambda name, image: received.append((name, image)))
+    image = np.zeros((4, 4), dtype=np.uint8)
+    sink.record('asset', image)
+    image[:] = 255
+
+    assert received[0][0] == 'asset'
+    assert received[0][1].max() == 0
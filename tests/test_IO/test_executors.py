@@ -0,0 +1,51 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+import threading
+import time
+import pytest
+from interfaces import executors
+from interfaces.executors import InstrumentedExecutor, get_executor, executor_metrics, shutdown_executors
+from interfaces.settings import get_settings
+
+
+def test_metrics_show_saturation():
+    """Test that tasks waiting for a busy pool are counted as queued, and their waiting time recorded."""
+    executor = InstrumentedExecutor('test', 1)
+    release = threading.Event()
+    try:
+        futures = [executor.submit(release.wait, 2.0) for _ in range(3)]
+        time.sleep(0.1)
+        metrics = executor.metrics()
+        assert metrics['running'] == 1
+        assert metrics['queued'] == 2
+        assert metrics['max_queued'] >= 2
+
+        release.set()
+        assert all(future.result(timeout=2.0) for future in futures)
+        metrics = executor.metrics()
+        assert metrics['completed'] == 3 and metrics['queued'] == 0 and metrics['running'] == 0
+        assert 0 < metrics['utilization'] <= 1
+        assert metrics['mean_wait_ms'] > 0
+    finally:
+        executor.shutdown()
+
+
+def test_pools_sized_from_settings(monkeypatch):
+    """Test that every kind of work gets its own pool, sized by the settings or the defaults."""
+    shutdown_executors()
+    monkeypatch.setitem(get_settings()['executors'], 'io_workers', 3)
+    monkeypatch.setitem(get_settings()['executors'], 'ocr_workers', 0)
+    monkeypatch.setattr(executors, 'physical_cores', lambda: 2)
+    try:
+        assert get_executor('cpu').workers == 2
+        assert get_executor('io').workers == 3
+        assert get_executor('ocr').workers == get_settings()['ocr']['pool_size']
+        assert get_executor('io') is get_executor('io')
+        assert set(executor_metrics()) == {'cpu', 'io', 'ocr'}
+        with pytest.raises(ValueError):
+            get_executor('gpu')
+    finally:
+        shutdown_executors()
@@ -0,0 +1,51 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+import pytest
+from interfaces import settings
+from interfaces.fields import normalize_field, validate_field
+
+
+@pytest.fixture
+def field_rules(monkeypatch):
+    """Override the rules of the serial field for one test."""
+    rules = settings.get_settings()['fields']
+
+    def set_rules(**kwargs):
+        monkeypatch.setitem(rules, 'serial', dict(rules['serial'], **kwargs))
+    return set_rules
+
+
+def test_normalize_field():
+    assert normalize_field(' ab 12\n\x0c') == 'AB12'
+    assert normalize_field(None) == ''
+
+
+def test_default_rules():
+    assert validate_field('lot', 'AB-1234')
+    assert not validate_field('lot', 'AB')  # too short
+    assert not validate_field('serial', 'ABC-12345')  # '-' not allowed in serials
+    assert not validate_field('serial', '')
+    assert validate_field('unknown', 'anything')
+
+
+def test_pattern_rule(field_rules):
+    field_rules(pattern=r'[A-Z]{2}\d{6}')
+    assert validate_field('serial', 'AB123456')
+    assert not validate_field('serial', '12AB3456')
+
+
+def test_check_digit_rules(field_rules):
+    field_rules(check_digit='luhn')
+    assert validate_field('serial', '79927398713')
+    assert not validate_field('serial', '79927398714')
+
+    field_rules(check_digit='gs1')
+    assert validate_field('serial', '4006381333931')
+    assert not validate_field('serial', '4006381333932')
+
+    field_rules(check_digit='crc')
+    with pytest.raises(ValueError):
+        validate_field('serial', '4006381333931')
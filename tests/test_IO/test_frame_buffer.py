@@ -0,0 +1,50 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+import threading
+import time
+import numpy as np
+from interfaces.frame_buffer import FrameBuffer
+
+
+def test_ring_buffer_keeps_most_recent_frames():
+    """Test that the buffer drops the oldest frames when full."""
+    buffer = FrameBuffer(capacity=3)
+    for i in range(5):
+        buffer.push(np.full((2, 2), i, dtype=np.uint8), timestamp=float(i))
+
+    assert len(buffer) == 3
+    assert [f.seq for f in buffer.snapshot()] == [3, 4, 5]
+    assert buffer.latest().image[0, 0] == 4
+
+
+def test_latest_on_empty_buffer():
+    assert FrameBuffer().latest() is None
+
+
+def test_wait_newer_returns_buffered_frame():
+    """Test that the first frame newer than the trigger is returned without waiting."""
+    buffer = FrameBuffer()
+    for ts in (1.0, 2.0, 3.0):
+        buffer.push(np.zeros((2, 2)), timestamp=ts)
+
+    assert buffer.wait_newer(1.5, timeout=0).timestamp == 2.0
+
+
+def test_wait_newer_waits_for_next_frame():
+    """Test that a capture triggered now waits for the next frame pushed by the camera thread."""
+    buffer = FrameBuffer()
+    buffer.push(np.zeros((2, 2)))
+    trigger = time.monotonic()
+    threading.Timer(0.05, lambda: buffer.push(np.ones((2, 2)))).start()
+
+    frame = buffer.wait_newer(trigger, timeout=1.0)
+    assert frame is not None and frame.image[0, 0] == 1
+
+
+def test_wait_newer_timeout():
+    buffer = FrameBuffer()
+    buffer.push(np.zeros((2, 2)))
+    assert buffer.wait_newer(time.monotonic(), timeout=0.01) is None
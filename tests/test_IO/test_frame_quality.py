@@ -0,0 +1,35 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+
+import cv2 as cv
+import numpy as np
+from interfaces.frame_quality import sharpness_scores, select_sharpest, BurstStats
+
+
+def make_label(blur=0):
+    image = np.full((240, 320, 3), 255, dtype=np.uint8)
+    cv.putText(image, 'LOT 12345', (20, 130), cv.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 0), 3)
+    return cv.GaussianBlur(image, (0, 0), blur) if blur else image
+
+
+def test_sharpness_decreases_with_blur():
+    scores = sharpness_scores([make_label(), make_label(1.5), make_label(4)])
+    assert scores[0] > scores[1] > scores[2]
+
+
+def test_select_sharpest_across_sizes():
+    """Test that frames of different resolutions are compared at the same downsampled size."""
+    images = [make_label(3), cv.resize(make_label(), (640, 480)), make_label(2)]
+    selected, scores = select_sharpest(images)
+    assert selected == 1
+    assert len(scores) == 3
+
+
+def test_burst_stats_report():
+    stats = BurstStats()
+    stats.record({1: (1, [10.0, 20.0, 15.0]), 2: (0, [30.0, 10.0])}, capture_ms=80.0)
+    assert stats.bursts == 2 and stats.frames == 5 and stats.improved == 1
+    assert 'x1.50' in stats.report()
@@ -0,0 +1,59 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+import time
+from interfaces.inspection_budget import StageCosts, InspectionBudget
+
+SEGMENT = ['segment/full', 'segment/reduced', 'segment/minimal']
+PRIORS = {'segment/full': 400, 'segment/reduced': 150, 'segment/minimal': 80, 'report': 50}
+
+
+def test_costs_moving_average():
+    """Test that measurements replace the prior and are averaged with the alpha weight."""
+    costs = StageCosts(alpha=0.5, priors={'segment/full': 400})
+    assert costs.estimate('segment/full') == 400
+    assert costs.estimate('skip') == 0
+
+    costs.record('segment/full', 100)
+    assert costs.estimate('segment/full') == 100
+    costs.record('segment/full', 200)
+    assert costs.estimate('segment/full') == 150
+
+
+def test_no_budget_keeps_full_inspection():
+    budget = InspectionBudget(0, StageCosts(priors=PRIORS))
+    assert budget.choose('segment 1', SEGMENT, [SEGMENT] * 5) == 'segment/full'
+    assert not budget.reduced
+
+
+def test_budget_degrades_to_fit():
+    """Test that each stage takes the most thorough option leaving time for the cheapest later stages."""
+    budget = InspectionBudget(600, StageCosts(priors=PRIORS))
+
+    # 600 - (80 + 50) reserved: full (400) fits
+    assert budget.choose('segment 1', SEGMENT, [SEGMENT, ['report']]) == 'segment/full'
+    # 600 - (80 + 80 + 50) reserved: reduced (150) fits, full does not
+    assert budget.choose('segment 1', SEGMENT, [SEGMENT, SEGMENT, ['report']]) == 'segment/reduced'
+    assert budget.degradations == ['segment 1: reduced']
+    assert budget.reduced
+
+
+def test_budget_skips_optional_stage_when_nothing_fits():
+    budget = InspectionBudget(100, StageCosts(priors=PRIORS), start=time.perf_counter() - 0.09)
+
+    assert budget.choose('segment 4', SEGMENT + ['skip'], [['report']]) == 'skip'
+    # a mandatory stage falls back to its cheapest option
+    assert budget.choose('segment 1', SEGMENT, [['report']]) == 'segment/minimal'
+    assert budget.degradations == ['segment 4: skip', 'segment 1: minimal']
+
+
+def test_run_updates_costs():
+    """Test that running an option feeds its measured duration to the cost model."""
+    costs = StageCosts(priors=PRIORS)
+    budget = InspectionBudget(1000, costs)
+
+    assert budget.run('segment/full', lambda x: x * 2, 21) == 42
+    assert costs.estimate('segment/full') < 50
+    assert 'segment/full' in costs.measured()
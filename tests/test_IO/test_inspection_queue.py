@@ -0,0 +1,73 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+import threading
+from interfaces.inspection_queue import InspectionJob, InspectionQueue
+
+
+def test_jobs_processed_in_capture_order():
+    """Test that a single worker processes the jobs in submission order."""
+    processed = []
+    jobs = InspectionQueue(lambda job: processed.append(job.id), max_depth=4)
+    submitted = [InspectionJob([]) for _ in range(4)]
+    for job in submitted:
+        assert jobs.submit(job)
+
+    assert jobs.join(timeout=5)
+    assert processed == [job.id for job in submitted]
+    assert jobs.status()['done'] == 4
+    jobs.stop()
+
+
+def test_full_queue_refuses_jobs():
+    """Test the backpressure: once max_depth jobs wait, submit returns False until a worker takes one."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def process(job):
+        started.set()
+        release.wait(5)
+
+    jobs = InspectionQueue(process, max_depth=1)
+    assert jobs.submit(InspectionJob([]))
+    assert started.wait(5)  # the first job is running, the queue is empty again
+    assert jobs.submit(InspectionJob([]))
+    assert jobs.full()
+    assert not jobs.submit(InspectionJob([]))
+    assert not jobs.submit(InspectionJob([]), timeout=0.05)
+    assert jobs.status()['pending'] == 1 and jobs.status()['running'] == 1
+
+    release.set()
+    assert jobs.join(timeout=5)
+    jobs.stop()
+
+
+def test_failed_job_does_not_stop_the_worker():
+    """Test that an exception is counted and the next job still runs."""
+    def process(job):
+        if job.metadata.get('fail'):
+            raise RuntimeError('detection failed')
+
+    states = []
+    jobs = InspectionQueue(process, on_change=states.append)
+    jobs.submit(InspectionJob([], {'fail': True}))
+    jobs.submit(InspectionJob([]))
+
+    assert jobs.join(timeout=5)
+    assert jobs.status()['failed'] == 1 and jobs.status()['done'] == 1
+    assert states[-1]['failed'] == 1
+    jobs.stop()
+
+
+def test_stop_processes_queued_jobs():
+    """Test that stop lets the queued jobs finish and refuses new ones."""
+    processed = []
+    jobs = InspectionQueue(lambda job: processed.append(job.id), max_depth=3)
+    for _ in range(3):
+        jobs.submit(InspectionJob([]))
+    jobs.stop(timeout=5)
+
+    assert len(processed) == 3
+    assert not jobs.submit(InspectionJob([]))
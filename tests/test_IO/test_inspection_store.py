@@ -0,0 +1,119 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+import csv
+import pytest
+from interfaces import inspection_store
+from interfaces.inspection_store import InspectionStore
+from interfaces.settings import get_settings
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = InspectionStore(str(tmp_path / 'dataset' / 'inspections.db'), flush_interval=0.01)
+    yield store
+    store.close()
+
+
+def _laptop(serial, lot='LOT1', model='Apple', grade='A', time='2026-10-19T10:00:00'):
+    return {'time': time, 'model': model, 'serial': serial, 'lot': lot, 'grade': grade, 'scratch': '2', 'stain': 0}
+
+
+def test_laptop_linked_to_files_and_defects(store):
+    """Test that a laptop is written with its files and defects."""
+    store.add(_laptop('SERIAL1'),
+              images=[('report', 'dataset/LOT1.pdf'), ('top', 'dataset/reports/LOT1_top.jpg')],
+              defects=[('top', 'scratch', (1, 2, 30, 40)), ('bottom', 'stain', [5, 6, 7, 8])])
+    store.flush()
+    [row] = store.find(serial='SERIAL1')
+    assert row['scratch'] == 2
+    laptop = store.get(row['id'])
+    assert laptop['images'] == [{'surface': 'report', 'path': 'dataset/LOT1.pdf'},
+                                {'surface': 'top', 'path': 'dataset/reports/LOT1_top.jpg'}]
+    assert laptop['defects'][0] == {'surface': 'top', 'cls': 'scratch', 'x1': 1, 'y1': 2, 'x2': 30, 'y2': 40}
+    assert store.get(row['id'] + 1) is None
+
+
+def test_batched_writes_and_filters(store):
+    """Test that queued laptops are committed in batches and found by every indexed column."""
+    for i in range(600):
+        store.add(_laptop(f'SERIAL{i}', lot=f'LOT{i % 10}', model='Dell' if i % 3 else 'Apple',
+                          grade='C' if i % 5 == 0 else 'A', time=f'2026-10-{1 + i % 30:02d}T10:00:00'))
+    store.flush()
+    assert store.count() == 600
+    assert store.find(serial='SERIAL42')[0]['lot'] == 'LOT2'
+    assert store.count(lot='LOT3') == 60
+    assert store.count(model='Apple', grade='C') == 40
+    assert store.count(start='2026-10-01', end='2026-10-02') == 40
+    assert len(store.find(lot='LOT3', limit=5)) == 5
+    assert store.find(lot='LOT3', limit=1)[0]['serial'] == 'SERIAL593'
+
+
+def test_bad_laptop_isolated(store):
+    """Test that a laptop failing to be written does not discard its batch nor stop the writer."""
+    store.add(_laptop('SERIAL1'))
+    store.add(_laptop('SERIAL2'), defects=[('top', 'scratch', (1, None, 3, 4))])
+    store.add(_laptop('SERIAL3'))
+    store.flush()
+    assert [row['serial'] for row in store.find()] == ['SERIAL3', 'SERIAL1']
+    assert [laptop['serial'] for laptop, _ in store.failed] == ['SERIAL2']
+    assert store.count(serial='SERIAL2') == 0  # its row is rolled back with its defects
+    store.add(_laptop('SERIAL4'))
+    store.flush()
+    assert store.count(serial='SERIAL4') == 1
+
+
+def test_wal_mode_and_indexes(store):
+    """Test that the database runs in WAL mode and the lookups use the indexes."""
+    with store._reader_lock:
+        assert store._reader.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        for column in ('serial', 'lot', 'model', 'grade', 'time'):
+            plan = ' '.join(row[-1] for row in store._reader.execute(
+                f'EXPLAIN QUERY PLAN SELECT * FROM laptops WHERE {column} = ?', ('x',)))
+            assert f'laptops_{column}' in plan
+
+
+def test_import_csv_once(store, tmp_path):
+    """Test that a legacy dataset.csv is imported once."""
+    csv_path = tmp_path / 'dataset.csv'
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['model', 'serial number', 'lot number', 'grade', 'stain', 'scratch'])
+        writer.writeheader()
+        writer.writerow({'model': 'Apple', 'serial number': 'S1', 'lot number': 'L1', 'grade': 'A', 'stain': '1',
+                         'scratch': '3'})
+        writer.writerow({'model': 'Dell', 'serial number': 'S2', 'lot number': 'L1', 'grade': 'C', 'stain': '12',
+                         'scratch': '0'})
+    assert store.import_csv(str(csv_path), chunk_size=1) == 2
+    assert store.import_csv(str(csv_path)) == 0
+    assert store.import_csv(str(tmp_path / 'missing.csv')) == 0
+    [row] = store.find(serial='S2')
+    assert (row['lot'], row['stain'], row['source'], row['time']) == ('L1', 12, 'csv', None)
+    assert store.count(lot='L1') == 2
+
+
+def test_legacy_csv_imported_in_background(store, tmp_path, monkeypatch):
+    """Test that the control panel imports the legacy CSV dataset into the store in the I/O pool."""
+    from widgets.panel import init_dataset
+    csv_path = tmp_path / 'dataset.csv'
+    csv_path.write_text('model,serial number,lot number,grade,stain,scratch\nTestModel,Serial1,Lot1,A,0,1\n',
+                        encoding='utf-8')
+    monkeypatch.setattr(inspection_store, '_inspection_store', store)
+    monkeypatch.setitem(get_settings()['inspection_store'], 'legacy_csv', str(csv_path))
+
+    assert init_dataset().result(timeout=10) == 1
+    assert store.find(serial='Serial1')[0]['lot'] == 'Lot1'
+
+
+def test_closed_store(tmp_path):
+    """Test that the queued laptops are written on closing and a closed store refuses new ones."""
+    path = str(tmp_path / 'inspections.db')
+    store = InspectionStore(path, flush_interval=10)
+    store.add(_laptop('SERIAL1'))
+    store.close()
+    with pytest.raises(RuntimeError):
+        store.add(_laptop('SERIAL2'))
+    reopened = InspectionStore(path)
+    assert reopened.count(serial='SERIAL1') == 1
+    reopened.close()
@@ -0,0 +1,62 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+
+import numpy as np
+from interfaces.motion import StabilityDetector
+
+EMPTY = np.full((120, 160, 3), 60, dtype=np.uint8)
+
+
+def laptop(x):
+    """Scene with a bright laptop whose left edge is at ``x``."""
+    frame = EMPTY.copy()
+    frame[30:90, x:x + 80] = 220
+    return frame
+
+
+def feed(detector, frames):
+    return [detector.feed(frame) for frame in frames]
+
+
+def test_fires_once_after_settling():
+    """Test that the detector fires when a placed laptop has been still for settle_frames."""
+    detector = StabilityDetector(settle_frames=3, clear_frames=2)
+    feed(detector, [EMPTY] * 3)
+
+    moving = feed(detector, [laptop(x) for x in (0, 20, 40)])
+    assert not any(moving)
+    assert feed(detector, [laptop(40)] * 3) == [False, False, True]
+    # same laptop stays in place: no second capture
+    assert not any(feed(detector, [laptop(40)] * 10))
+    assert detector.state == StabilityDetector.CAPTURED
+
+
+def test_rearms_after_scene_cleared():
+    detector = StabilityDetector(settle_frames=2, clear_frames=2)
+    feed(detector, [EMPTY, laptop(40), laptop(40), laptop(40)])
+    assert detector.state == StabilityDetector.CAPTURED
+
+    feed(detector, [EMPTY, EMPTY])
+    assert detector.state == StabilityDetector.EMPTY
+    assert feed(detector, [laptop(10), laptop(10), laptop(10)])[-1]
+
+
+def test_hysteresis_ignores_partial_removal():
+    """Test that a scene only partly cleared does not re-arm the detector."""
+    detector = StabilityDetector(settle_frames=2, clear_frames=2, presence_threshold=12.0)
+    feed(detector, [EMPTY, laptop(40), laptop(40), laptop(40)])
+
+    half = EMPTY.copy()
+    half[30:90, 40:55] = 220  # presence between half the threshold and the threshold
+    feed(detector, [half] * 5)
+    assert detector.state == StabilityDetector.CAPTURED
+
+
+def test_mark_captured():
+    detector = StabilityDetector(settle_frames=2)
+    feed(detector, [EMPTY, laptop(40)])
+    detector.mark_captured()
+    assert not any(feed(detector, [laptop(40)] * 5))
@@ -0,0 +1,187 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+import threading
+import time
+import cv2 as cv
+import numpy as np
+import pytest
+from interfaces.ocr import OCRService, OCRCache, FIELD_CONFIGS, decode_buffer, read_field
+
+
+class FakeEngine:
+    """Engine recording its calls instead of running Tesseract."""
+    created = 0
+    lock = threading.Lock()
+
+    def __init__(self):
+        with FakeEngine.lock:
+            FakeEngine.created += 1
+        self.calls = []
+        self.closed = False
+
+    def read(self, image, config):
+        self.calls.append((image.shape, config))
+        time.sleep(0.01)
+        return ' LOT123\n\x0c'
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def service():
+    FakeEngine.created = 0
+    return OCRService(pool_size=2, engine_factory=FakeEngine)
+
+
+def test_read_strips_text_and_uses_field_config(service):
+    """Test that read returns stripped text and passes the configuration of the field."""
+    text = service.read(np.zeros((20, 60), dtype=np.uint8), 'lot')
+
+    assert text == 'LOT123'
+    engine = service._engines[0]
+    assert engine.calls[0][1] is FIELD_CONFIGS['lot']
+
+
+def test_read_accepts_encoded_buffers(service):
+    """Test that read accepts crops encoded in memory."""
+    _, buffer = cv.imencode('.png', np.zeros((20, 60), dtype=np.uint8))
+
+    assert service.read(buffer.tobytes(), 'serial') == 'LOT123'
+    assert service._engines[0].calls[0][0] == (20, 60)
+
+
+def test_pool_never_exceeds_pool_size(service):
+    """Test that concurrent reads reuse at most pool_size engines."""
+    threads = [threading.Thread(target=service.read, args=(np.zeros((20, 60), dtype=np.uint8), 'asset'))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert FakeEngine.created == 2
+    assert sum(len(e.calls) for e in service._engines) == 8
+
+
+def test_close_releases_engines(service):
+    """Test that close releases every engine."""
+    service.read(np.zeros((20, 60), dtype=np.uint8))
+    engine = service._engines[0]
+    service.close()
+
+    assert engine.closed
+    assert service._engines == []
+
+
+def test_decode_buffer_rejects_invalid_input():
+    """Test that invalid inputs raise a ValueError."""
+    with pytest.raises(ValueError):
+        decode_buffer(b'not an image')
+    with pytest.raises(ValueError):
+        decode_buffer('path.png')
+
+
+def test_field_config_cli():
+    """Test the command line options built for the subprocess engine."""
+    assert FIELD_CONFIGS['serial'].to_cli().startswith('--psm 7 -c tessedit_char_whitelist=')
+    assert FIELD_CONFIGS['text'].to_cli() == '--psm 3'
+
+
+def test_read_field_exits_early_on_valid_value():
+    """Test that read_field skips the remaining variants once a value is valid."""
+    calls = []
+    variants = [('first', lambda img: calls.append('first') or img),
+                ('second', lambda img: calls.append('second') or img)]
+    service = OCRService(pool_size=1, engine_factory=FakeEngine)
+    cache = OCRCache(capacity=4)
+
+    assert read_field(np.zeros((20, 60), dtype=np.uint8), 'lot', variants, service, cache) == 'LOT123'
+    assert calls == ['first']
+    assert cache.early_exits == 1 and cache.variants_skipped == 1
+
+
+def test_read_field_tries_every_variant_when_invalid():
+    """Test that invalid values fall through to the next variant and the first non-empty one is returned."""
+    texts = iter(['ab', 'c d'])
+
+    class ShortEngine(FakeEngine):
+        def read(self, image, config):
+            return next(texts)
+
+    service = OCRService(pool_size=1, engine_factory=ShortEngine)
+    cache = OCRCache(capacity=4)
+    variants = [('first', lambda img: img), ('second', lambda img: img)]
+
+    assert read_field(np.zeros((20, 60), dtype=np.uint8), 'lot', variants, service, cache) == 'AB'
+    assert cache.early_exits == 0
+
+
+def test_read_field_uses_cache():
+    """Test that the same crop is only OCR'd once and the saved time is accounted."""
+    service = OCRService(pool_size=1, engine_factory=FakeEngine)
+    cache = OCRCache(capacity=4)
+    crop = np.random.default_rng(0).integers(0, 255, (20, 60), dtype=np.uint8)
+    variants = [('fixed', lambda img: img)]
+
+    read_field(crop, 'serial', variants, service, cache)
+    read_field(crop.copy(), 'serial', variants, service, cache)
+    read_field(crop, 'lot', variants, service, cache)  # other field, other key
+
+    assert len(service._engines[0].calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.time_saved_ms > 0
+    assert 'OCR cache: 1 hits / 2 misses (33%)' in cache.report()
+
+
+def test_cache_evicts_least_recently_used():
+    """Test the LRU eviction of the cache."""
+    cache = OCRCache(capacity=2)
+    cache.put('a', 'A', True, 1.0)
+    cache.put('b', 'B', True, 1.0)
+    cache.get('a')
+    cache.put('c', 'C', True, 1.0)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == ('A', True)
+
+
+def test_read_field_votes_between_candidates():
+    """Test that candidate variants are read concurrently and the most agreed valid value wins."""
+    texts = {1: 'x', 2: 'LOT999', 3: 'LOT123', 4: 'LOT123', 5: ''}
+
+    class ValueEngine(FakeEngine):
+        def read(self, image, config):
+            return texts[int(image[0, 0])]
+
+    service = OCRService(pool_size=3, engine_factory=ValueEngine)
+    cache = OCRCache(capacity=4)
+    variants = [('fixed', lambda img: np.full_like(img, 1))]
+    candidates = lambda img: [(f'v{i}', np.full_like(img, i)) for i in (2, 3, 4, 5)]
+
+    assert read_field(np.zeros((20, 60), dtype=np.uint8), 'lot', variants, service, cache, candidates) == 'LOT123'
+    service.close()
+
+
+def test_invalid_read_not_cached():
+    """Test that an invalid fast read does not keep a later thorough read of the crop from voting."""
+    texts = {1: 'x', 2: 'LOT123'}
+
+    class ValueEngine(FakeEngine):
+        def read(self, image, config):
+            return texts[int(image[0, 0])]
+
+    service = OCRService(pool_size=1, engine_factory=ValueEngine)
+    cache = OCRCache(capacity=4)
+    crop = np.zeros((20, 60), dtype=np.uint8)
+    variants = [('fixed', lambda img: np.full_like(img, 1))]
+    candidates = lambda img: [('v2', np.full_like(img, 2))]
+
+    assert read_field(crop, 'lot', variants, service, cache) == 'X'
+    assert read_field(crop, 'lot', variants, service, cache, candidates) == 'LOT123'
+    assert read_field(crop, 'lot', variants, service, cache) == 'LOT123'
+    assert cache.hits == 1
+    service.close()
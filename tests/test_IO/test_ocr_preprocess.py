@@ -0,0 +1,50 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+import cv2 as cv
+import numpy as np
+import pytest
+from interfaces.ocr_preprocess import build_variants, VARIANT_NAMES, _skew_angle
+
+
+def make_label(angle=0.0):
+    img = np.full((80, 400), 255, dtype=np.uint8)
+    cv.putText(img, 'LOT 123456', (20, 55), cv.FONT_HERSHEY_SIMPLEX, 1.2, 0, 3)
+    if angle:
+        rotation = cv.getRotationMatrix2D((200, 40), angle, 1.0)
+        img = cv.warpAffine(img, rotation, (400, 80), borderValue=255)
+    return img
+
+
+def test_build_every_variant():
+    """Test that every variant is a binary image built from the grayscale crop."""
+    variants = build_variants(make_label())
+
+    assert [name for name, _ in variants] == list(VARIANT_NAMES)
+    for name, image in variants:
+        assert image.dtype == np.uint8
+        assert set(np.unique(image)) <= {0, 255}, name
+    assert dict(variants)['upscaled'].shape == (160, 800)
+
+
+def test_build_subset_in_requested_order():
+    variants = build_variants(make_label(), names=('deskewed', 'otsu'))
+    assert [name for name, _ in variants] == ['deskewed', 'otsu']
+
+
+def test_unknown_variant():
+    with pytest.raises(ValueError):
+        build_variants(make_label(), names=('otsu', 'magic'))
+
+
+@pytest.mark.parametrize('angle', [6, -6])
+def test_deskew_straightens_text(angle):
+    """Test that the deskewed variant brings a rotated text line back to horizontal."""
+    label = make_label(angle=angle)
+    _, otsu = cv.threshold(label, 0, 255, cv.THRESH_BINARY + cv.THRESH_OTSU)
+    assert abs(_skew_angle(otsu)) > 3
+
+    deskewed = dict(build_variants(label, names=('deskewed',)))['deskewed']
+    assert abs(_skew_angle(deskewed)) < 1.5
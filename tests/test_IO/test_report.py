@@ -0,0 +1,131 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+from concurrent.futures import ThreadPoolExecutor
+import json
+import numpy as np
+from interfaces.classes import Defect
+from interfaces.report import IncrementalReport, pdf_from_record, print_image, render_pdf_report, write_html_report
+from interfaces.saver import ImageSaver
+
+
+def _surfaces(ports=range(1, 7)):
+    rng = np.random.default_rng(0)
+    detected_imgs, defects_list = [], []
+    for port in ports:
+        image = rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8)
+        detected_imgs.append((image, port))
+        defects_list.append(([Defect(image[100:300, 200:900], 'scratch', (200, 100, 900, 300))], port))
+    return detected_imgs, defects_list
+
+
+def test_print_image_downscaled_to_print_resolution():
+    """Test that an image wider than its print resolution is downscaled and encoded as JPEG."""
+    image = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    reader = print_image(image, display_width=500, dpi=144)
+    assert reader.getSize() == (1000, 562)
+    assert reader.jpeg_fh() is not None
+
+    small = print_image(np.zeros((20, 30, 3), dtype=np.uint8), display_width=30, dpi=150)
+    assert small.getSize() == (30, 20)
+
+
+def test_report_embeds_jpeg(tmp_path):
+    """Test that a six-surface report embeds its images as JPEG and stays small."""
+    path = str(tmp_path / 'report.pdf')
+    detected_imgs, defects_list = _surfaces()
+    render_pdf_report(path, detected_imgs, defects_list, notes=['Reduced inspection: segment 3: reduced'],
+                      dpi=100, quality=70)
+
+    with open(path, 'rb') as f:
+        content = f.read()
+    assert content.startswith(b'%PDF')
+    assert content.count(b'/DCTDecode') == 12
+    assert len(content) < 6 * 1920 * 1080 * 3 // 10
+
+
+def test_report_skips_surfaces_without_image(tmp_path):
+    path = str(tmp_path / 'report.pdf')
+    detected_imgs, defects_list = _surfaces(ports=[1, 2])
+    render_pdf_report(path, detected_imgs[:1], defects_list)
+    with open(path, 'rb') as f:
+        assert f.read().count(b'/DCTDecode') == 3  # surface 1 with its defect, the defect of surface 2
+
+
+def test_incremental_report_keeps_partial_report(tmp_path):
+    """Test that every surface added rewrites the partial report, which is replaced by the final one."""
+    partial, final = str(tmp_path / 'partial' / 'laptop.pdf'), str(tmp_path / 'lot.pdf')
+    detected_imgs, defects_list = _surfaces(ports=[1, 2, 3])
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        report = IncrementalReport(partial, executor, dpi=72)
+        report.add_surface(1, detected_imgs[0][0], defects_list[0][0])
+        executor.submit(lambda: None).result()  # the first surface is encoded
+        with open(partial, 'rb') as f:
+            assert f.read().count(b'/DCTDecode') == 2
+
+        for (image, port), (defects, _) in zip(detected_imgs[1:], defects_list[1:]):
+            report.add_surface(port, image, defects)
+        assert report.finish(final, ['note']).result(timeout=10) == final
+
+    with open(final, 'rb') as f:
+        assert f.read().count(b'/DCTDecode') == 6
+    assert not os.path.exists(partial)
+    assert report.assemble_ms is not None
+
+
+def test_no_partial_report_after_final(tmp_path):
+    """Test that a partial write racing the end of the assembly does not write the partial report again."""
+    partial, final = str(tmp_path / 'partial.pdf'), str(tmp_path / 'lot.pdf')
+    detected_imgs, defects_list = _surfaces(ports=[1])
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        report = IncrementalReport(partial, executor, dpi=72)
+        set_result = report._done.set_result
+
+        def late_partial(path):  # a surface thread writing its partial report before the future is resolved
+            report._write_partial()
+            set_result(path)
+
+        report._done.set_result = late_partial
+        report.add_surface(1, detected_imgs[0][0], defects_list[0][0])
+        report.finish(final).result(timeout=10)
+
+    assert os.path.exists(final)
+    assert not os.path.exists(partial)
+
+
+def test_incremental_report_without_failed_surface(tmp_path):
+    """Test that a surface failing to render is left out and the other surfaces are reported."""
+    final = str(tmp_path / 'lot.pdf')
+    detected_imgs, defects_list = _surfaces(ports=[1, 2])
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        report = IncrementalReport(str(tmp_path / 'partial.pdf'), executor, dpi=72)
+        report.add_surface(1, detected_imgs[0][0], defects_list[0][0])
+        report.add_surface(2, 'not an image', defects_list[1][0])
+        report.finish(final).result(timeout=10)
+
+    assert report.failed_ports == [2]
+    with open(final, 'rb') as f:
+        assert f.read().count(b'/DCTDecode') == 2
+
+
+def test_html_report_and_pdf_on_demand(tmp_path):
+    """Test that the html report references the images saved once, and that its PDF can be rendered later."""
+    detected_imgs, defects_list = _surfaces(ports=[1, 3])
+    surfaces = ImageSaver(save_directory=str(tmp_path)).save_report_images('reports', 'LOT1', detected_imgs,
+                                                                            defects_list, width=640)
+    assert [surface['surface'] for surface in surfaces] == ['top', 'keyboard']
+    record_path = write_html_report(str(tmp_path / 'reports'), 'LOT1', surfaces,
+                                    {'lot': 'LOT1', 'score': np.float32(0.5)}, ['note'])
+
+    with open(record_path, encoding='utf-8') as f:
+        record = json.load(f)
+    assert record['features'] == {'lot': 'LOT1', 'score': 0.5}
+    page = (tmp_path / 'reports' / 'LOT1.html').read_text(encoding='utf-8')
+    assert 'src="LOT1_top.jpg"' in page and 'src="LOT1_keyboard_defect1.jpg"' in page
+    assert (tmp_path / 'reports' / 'LOT1_top.jpg').exists()
+
+    pdf_path = pdf_from_record(record_path, dpi=72)
+    with open(pdf_path, 'rb') as f:
+        assert f.read().count(b'/DCTDecode') == 4
@@ -0,0 +1,62 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+import cv2 as cv
+from interfaces import resource_governor
+from interfaces.resource_governor import ResourceGovernor, limit_inference_threads
+
+
+class FakeCamera:
+    def __init__(self):
+        self.throttles = []
+
+    def set_throttle(self, fps):
+        self.throttles.append(fps)
+
+
+def test_cameras_throttled_during_inference():
+    """Test that the cameras are throttled while an inference runs and restored afterwards."""
+    cameras = [FakeCamera(), FakeCamera()]
+    governor = ResourceGovernor(lambda: cameras, 'throttle', throttled_fps=2)
+    assert governor.throttle_fps() is None
+
+    with governor.inference():
+        assert governor.throttle_fps() == 2
+    assert all(camera.throttles == [2, None] for camera in cameras)
+
+
+def test_capture_lifts_throttle():
+    """Test that a capture runs the cameras at full rate even while another laptop is detected."""
+    camera = FakeCamera()
+    governor = ResourceGovernor(lambda: [camera], 'freeze')
+    with governor.inference():
+        assert governor.throttle_fps() == 0
+        with governor.capture():
+            assert governor.throttle_fps() is None
+        with governor.inference():  # second worker
+            pass
+        assert governor.throttle_fps() == 0
+    assert camera.throttles == [0, None, 0, 0, 0, None]
+
+
+def test_off_mode_never_throttles():
+    camera = FakeCamera()
+    governor = ResourceGovernor(lambda: [camera], 'off')
+    with governor.inference():
+        assert governor.throttle_fps() is None
+    assert camera.throttles == [None, None]
+
+
+def test_limit_inference_threads(monkeypatch):
+    """Test that the physical cores are shared between the inference workers unless the counts are configured."""
+    monkeypatch.setattr(resource_governor, 'physical_cores', lambda: 6)
+    previous = cv.getNumThreads()
+    try:
+        assert limit_inference_threads(workers=2)['opencv'] == 3
+        assert cv.getNumThreads() == 3
+        assert limit_inference_threads(workers=8)['opencv'] == 1
+        assert limit_inference_threads(opencv_threads=3, workers=2)['opencv'] == 3
+    finally:
+        cv.setNumThreads(previous)
@@ -0,0 +1,69 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+
+import numpy as np
+import pytest
+from interfaces.shared_frames import SharedFrameRing, SharedFrameBuffer
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing(slots=4, capacity=4 * 4 * 3, create=True)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+def frame(value, shape=(4, 4, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+def test_read_latest_without_copy(ring):
+    """Test that readers get a view of the newest slot, valid until the writer wraps around."""
+    assert ring.read() is None
+    ring.write(frame(1), timestamp=1.0)
+    ring.write(frame(2, (2, 4)), timestamp=2.0)
+
+    latest = ring.read()
+    assert latest.seq == 2 and latest.timestamp == 2.0
+    assert latest.image.shape == (2, 4) and latest.image[0, 0] == 2
+    assert not latest.image.flags.owndata
+
+    for value in range(3, 6):
+        ring.write(frame(value))
+    assert ring.is_current(latest)
+    ring.write(frame(6))
+    assert not ring.is_current(latest)
+    assert ring.read_seq(2) is None
+
+
+def test_attach_from_name(ring):
+    reader = SharedFrameRing(ring.name, slots=4, capacity=ring.capacity)
+    ring.write(frame(7))
+    assert reader.read(copy=True).image[0, 0, 0] == 7
+    reader.close()
+
+
+def test_frame_too_large(ring):
+    with pytest.raises(ValueError):
+        ring.write(frame(0, (8, 8, 3)))
+
+
+def test_shared_frame_buffer(ring):
+    """Test the FrameBuffer interface over the ring used by the capture code."""
+    buffer = SharedFrameBuffer(ring)
+    for i in range(1, 6):
+        ring.write(frame(i), timestamp=float(i))
+
+    assert [f.seq for f in buffer.snapshot()] == [3, 4, 5]
+    assert buffer.latest().seq == 5
+    assert buffer.wait_newer(3.5, timeout=0).seq == 4
+    assert buffer.wait_newer(5.0, timeout=0.01) is None
+
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.latest() is None
+    ring.write(frame(9), timestamp=9.0)
+    assert [f.seq for f in buffer.snapshot()] == [6]
@@ -1,10 +1,11 @@
 import os
 import pytest
-import csv
+import sqlite3
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication, QMainWindow
 from application.control import Controller, init_models, check_dataset
+from interfaces.settings import get_settings
 from UI.UI import Ui_MainWindow
 from unittest.mock import MagicMock
 
@@ -43,7 +44,7 @@ def test_check_dataset(tmp_path, monkeypatch):
     check_dataset()
 
     dataset_dir = tmp_path / 'Dataset'
-    dataset_file = dataset_dir / 'dataset.csv'
+    dataset_file = dataset_dir / 'inspections.db'
 
     assert dataset_dir.exists(), 'Dataset directory should be created.'
     assert dataset_dir.is_dir(), 'Dataset should be a directory.'
@@ -51,11 +52,20 @@ def test_check_dataset(tmp_path, monkeypatch):
     assert dataset_file.exists(), 'Dataset file should be created.'
     assert dataset_file.is_file(), 'Dataset file should be a file.'
 
-    with open(dataset_file, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        header = next(reader)
-        assert header == ["model", "serial number", "lot number", "grade", "stain", "scratch"], \
-            'CSV header should match the expected fields.'
+    with sqlite3.connect(dataset_file) as conn:
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(laptops)')]
+    assert columns == ['id', 'time', 'job', 'model', 'serial', 'lot', 'grade', 'scratch', 'stain', 'source'], \
+        'Laptops table should match the expected fields.'
+
+
+def test_check_dataset_store_path(tmp_path, monkeypatch):
+    monkeypatch.setattr('application.control._APP_DIR', str(tmp_path / 'mock_root'))
+    monkeypatch.setitem(get_settings()['inspection_store'], 'path', 'stores/station.db')
+
+    check_dataset()
+
+    assert (tmp_path / 'stores' / 'station.db').is_file(), 'Store should be created at the settings path.'
+    assert not (tmp_path / 'dataset' / 'inspections.db').exists(), 'No store should be created at the default path.'
 
 
 def test_controller_initialization(controller):
@@ -0,0 +1,63 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+
+import time
+from unittest.mock import patch
+import pytest
+from interfaces.camera_sources import SyntheticSource
+from widgets.camera_sessions import CameraSessionManager
+
+
+@pytest.fixture
+def sources(qapp):
+    """Patch the camera threads to read synthetic sources, returning the created sources."""
+    created = []
+
+    def factory(port):
+        created.append(SyntheticSource(port, {'width': 32, 'height': 24, 'fps': 200}))
+        return created[-1]
+
+    with patch('widgets.video_thread.create_source', side_effect=factory):
+        yield created
+
+
+def test_park_and_resume_keep_device_open(sources):
+    """Test that stopping parks the thread and starting again resumes it without re-opening the source."""
+    manager = CameraSessionManager()
+    try:
+        thread, created = manager.acquire(1)
+        assert created
+        assert thread.frame_buffer.wait_newer(time.monotonic(), 2.0) is not None
+
+        manager.park_all()
+        assert thread.parked
+        time.sleep(0.05)
+        assert len(thread.frame_buffer) <= 1  # at most the frame being read when parked
+
+        resumed, created = manager.acquire(1)
+        assert resumed is thread and not created
+        assert thread.frame_buffer.wait_newer(time.monotonic(), 2.0) is not None
+        assert len(sources) == 1 and sources[0].is_opened()
+    finally:
+        manager.release_all()
+    assert not sources[0].is_opened()
+    assert manager.open_ports() == set()
+
+
+def test_idle_timeout_releases_device(sources):
+    manager = CameraSessionManager(idle_timeout=0.05)
+    try:
+        thread, _ = manager.acquire(2)
+        assert thread.frame_buffer.wait_newer(time.monotonic(), 2.0) is not None
+        manager.park_all()
+        assert thread.wait(2000)
+        assert not sources[0].is_opened()
+        assert manager.open_ports() == set()
+
+        _, created = manager.acquire(2)
+        assert created
+    finally:
+        manager.release_all()
@@ -5,11 +5,11 @@ project_root = os.path.abspath(os.path.join(current_dir, '../../'))
 sys.path.append(project_root)
 import os
 import pytest
-import csv
 from unittest.mock import MagicMock
 from PyQt5.QtWidgets import QLineEdit, QPushButton
 from IO.defect import Defect
 from widgets.panel import save_to_pdf, PanelBase
+from interfaces.inspection_store import close_inspection_store, get_inspection_store
 import numpy as np
 import shutil
 from pathlib import Path
@@ -34,6 +34,7 @@ def panel_base_setup():
     }
 
     dataset_dir = os.path.join(project_root, 'dataset')
+    close_inspection_store()
     if os.path.exists(dataset_dir):
         # Remove all files and subdirectories in the dataset directory
         shutil.rmtree(dataset_dir)
@@ -47,7 +48,7 @@ def panel_base_setup():
 
 
 def test_save_to_dataset(panel_base_setup):
-    """Test that save_to_dataset writes correct data to CSV."""
+    """Test that save_to_dataset writes correct data to the inspection store."""
     panel, input_lines, _, dataset_dir = panel_base_setup
 
     # Mock input text
@@ -61,23 +62,20 @@ def test_save_to_dataset(panel_base_setup):
     # Save data
     panel.save_to_dataset()
 
-    # Verify CSV content
-    dataset_file = os.path.join(dataset_dir, 'dataset.csv')
-    assert os.path.exists(dataset_file), "Dataset CSV file should exist."
+    # Verify store content
+    store = get_inspection_store()
+    store.flush()
+    rows = store.find()
 
-    with open(dataset_file, 'r', encoding='utf-8') as csv_file:
-        reader = csv.DictReader(csv_file)
-        rows = list(reader)
-
-    assert len(rows) == 1, "CSV should contain one row."
-    assert rows[0] == {
+    assert len(rows) == 1, "Store should contain one laptop."
+    assert {key: rows[0][key] for key in ('model', 'lot', 'serial', 'scratch', 'stain', 'grade')} == {
         'model': "TestModel",
-        'lot number': "Lot123",
-        'serial number': "Serial456",
-        'scratch': "5",
-        'stain': "3",
+        'lot': "Lot123",
+        'serial': "Serial456",
+        'scratch': 5,
+        'stain': 3,
         'grade': "A"
-    }, "CSV row data does not match expected values."
+    }, "Laptop data does not match expected values."
 
 
 def test_clear_all_inputs(panel_base_setup):
@@ -147,12 +145,8 @@ def test_save_handles_empty_images(panel_base_setup):
     # Call save_to_dataset
     panel.save_to_dataset()
 
-    # Verify the CSV file exists but contains only the header
-    dataset_file = os.path.join(dataset_dir, 'dataset.csv')
-    assert os.path.exists(dataset_file), "Dataset CSV file should exist."
-
-    with open(dataset_file, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    # Expect only one line (header row) in the CSV file
-    assert len(lines) == 1, "No data should be saved for empty input fields."
+    # Verify the store exists but contains no laptop
+    assert os.path.exists(os.path.join(dataset_dir, 'inspections.db')), "Inspection store should exist."
+    store = get_inspection_store()
+    store.flush()
+    assert store.count() == 0, "No data should be saved for empty input fields."
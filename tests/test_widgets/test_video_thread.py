@@ -41,3 +41,195 @@
 #         mock_video_capture.return_value.read.return_value = (True, mock_frame)
 #
 #         video_thread = VideoThread(camera_port=0)
+
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../../'))
+sys.path.append(project_root)
+
+import time
+from unittest.mock import MagicMock, patch
+import numpy as np
+from interfaces.camera_sources import SyntheticSource
+from widgets.video_thread import VideoThread
+
+
+def test_capture_reads_ring_buffer_not_device():
+    """Test that capture returns the newest buffered frame without reading the device."""
+    video_thread = VideoThread(camera_port=1)
+    video_thread.source = MagicMock()
+    video_thread.frame_buffer.push(np.zeros((4, 4, 3), dtype=np.uint8))
+    newest = np.ones((4, 4, 3), dtype=np.uint8)
+    video_thread.frame_buffer.push(newest)
+
+    assert video_thread.capture() is newest
+    video_thread.source.read.assert_not_called()
+
+
+def test_capture_when_stopped():
+    video_thread = VideoThread(camera_port=1)
+    video_thread.frame_buffer.push(np.zeros((4, 4, 3), dtype=np.uint8))
+    video_thread.stop()
+
+    assert video_thread.capture() is None
+
+
+def test_preview_downscaled_to_label():
+    """Test that previews are resized in the camera thread to fit the label."""
+    video_thread = VideoThread(camera_port=1, max_fps=0)
+    video_thread.set_preview_size(320, 240)
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+
+    image = video_thread.preview(frame, now=10.0)
+
+    assert (image.width(), image.height()) == (320, 180)
+
+
+def test_preview_throttled_to_max_fps():
+    """Test that at most max_fps previews per second are emitted."""
+    video_thread = VideoThread(camera_port=1, max_fps=10)
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    assert video_thread.preview(frame, now=10.0) is not None
+    video_thread.frame_consumed()
+    assert video_thread.preview(frame, now=10.05) is None
+    assert video_thread.preview(frame, now=10.11) is not None
+
+
+def test_preview_dropped_until_consumed():
+    """Test that frames are dropped while the GUI has not consumed the previous preview."""
+    video_thread = VideoThread(camera_port=1, max_fps=0)
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    assert video_thread.preview(frame, now=10.0) is not None
+    assert video_thread.preview(frame, now=10.1) is None
+    video_thread.frame_consumed(160, 120)
+    assert video_thread.preview(frame, now=10.2) is not None
+    assert video_thread.preview_size == (160, 120)
+    # a preview never consumed is considered lost after PREVIEW_STALE_AFTER seconds
+    assert video_thread.preview(frame, now=10.2 + VideoThread.PREVIEW_STALE_AFTER) is not None
+
+
+def test_run_with_synthetic_source():
+    """Test that the camera thread fills its ring buffer from the configured frame source."""
+    video_thread = VideoThread(camera_port=1, max_fps=0)
+    source = MagicMock()
+    source.open.return_value = True
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+    source.read.side_effect = [(True, frame), (True, frame), (False, None)]
+
+    with patch('widgets.video_thread.create_source', return_value=source):
+        video_thread.run()
+
+    assert len(video_thread.frame_buffer) == 2
+    source.release.assert_called_once()
+
+
+def test_request_still_switches_profile(qapp):
+    """Test that a still is taken at the still profile and previews go back to the preview profile."""
+    config = {'fps': 200, 'profiles': {'preview': {'width': 64, 'height': 36}, 'still': {'width': 320, 'height': 180}}}
+    video_thread = VideoThread(camera_port=1, max_fps=0)
+    with patch('widgets.video_thread.create_source', return_value=SyntheticSource(1, config)):
+        video_thread.start()
+        try:
+            assert video_thread.frame_buffer.wait_newer(0, 2.0).image.shape == (36, 64, 3)
+            assert video_thread.has_still_profile()
+
+            still = video_thread.request_still().result(timeout=2.0)
+
+            assert still.image.shape == (180, 320, 3)
+            assert video_thread.last_switch_ms is not None
+            assert video_thread.frame_buffer.wait_newer(still.timestamp, 2.0).image.shape == (36, 64, 3)
+        finally:
+            video_thread.stop()
+            video_thread.wait(2000)
+
+
+def test_request_still_without_profile(qapp):
+    video_thread = VideoThread(camera_port=1, max_fps=0)
+    with patch('widgets.video_thread.create_source', return_value=SyntheticSource(1, {'width': 48, 'height': 32})):
+        video_thread.start()
+        try:
+            assert video_thread.request_still().result(timeout=2.0).image.shape == (32, 48, 3)
+        finally:
+            video_thread.stop()
+            video_thread.wait(2000)
+    assert video_thread.request_still().result(timeout=0) is None
+
+
+def test_camera_process_frames_read_from_shared_ring(qapp):
+    """Test that a camera thread backed by a camera process exposes the shared ring as its frame buffer."""
+    from interfaces.camera_process import ProcessSource
+    config = {'backend': 'synthetic', 'width': 64, 'height': 48, 'fps': 100, 'max_resolution': [64, 48]}
+    video_thread = VideoThread(camera_port=1, max_fps=0)
+    with patch('widgets.video_thread.create_source', return_value=ProcessSource(1, config)):
+        video_thread.start()
+        try:
+            deadline = time.monotonic() + 20
+            while video_thread.frame_buffer.latest() is None and time.monotonic() < deadline:
+                time.sleep(0.05)
+            frame = video_thread.frame_buffer.latest()
+            assert frame.image.shape == (48, 64, 3)
+            assert not frame.image.flags.owndata  # view of the shared memory
+            assert video_thread.capture().shape == (48, 64, 3)
+        finally:
+            video_thread.stop()
+            video_thread.wait(5000)
+
+
+def test_throttle_limits_frames_read(qapp):
+    """Test that a throttled camera reads frames at the throttled rate, and none once frozen."""
+    video_thread = VideoThread(camera_port=1, max_fps=0)
+    with patch('widgets.video_thread.create_source', return_value=SyntheticSource(1, {'width': 32, 'height': 24})):
+        video_thread.start()
+        try:
+            video_thread.frame_buffer.wait_newer(0, 2.0)
+            video_thread.set_throttle(5)
+            time.sleep(0.1)
+            start = video_thread.frame_buffer.latest().seq
+            time.sleep(1.0)
+            assert video_thread.frame_buffer.latest().seq - start <= 7
+
+            video_thread.set_throttle(0)
+            time.sleep(0.3)
+            frozen = video_thread.frame_buffer.latest().seq
+            time.sleep(0.5)
+            assert video_thread.frame_buffer.latest().seq == frozen
+
+            video_thread.set_throttle(None)
+            assert video_thread.frame_buffer.wait_newer(time.monotonic(), 2.0) is not None
+        finally:
+            video_thread.stop()
+            video_thread.wait(2000)
+
+
+def test_motion_detector_fed_while_frozen(qapp):
+    """Test that the auto-capture detector keeps its rate while the previews are throttled or frozen."""
+    class CountingDetector:
+        fps = 20
+
+        def __init__(self):
+            self.fed = 0
+
+        def feed(self, frame):
+            self.fed += 1
+            return False
+
+    video_thread = VideoThread(camera_port=1, max_fps=0)
+    previews = []
+    video_thread.change_pixmap_signal.connect(lambda image: (previews.append(image), video_thread.frame_consumed()))
+    video_thread.motion_detector = detector = CountingDetector()
+    with patch('widgets.video_thread.create_source', return_value=SyntheticSource(1, {'width': 32, 'height': 24})):
+        video_thread.start()
+        try:
+            video_thread.frame_buffer.wait_newer(0, 2.0)
+            video_thread.set_throttle(0)
+            time.sleep(0.1)
+            fed, shown = detector.fed, len(previews)
+            time.sleep(1.0)
+            assert 10 <= detector.fed - fed <= 22
+            assert len(previews) == shown
+        finally:
+            video_thread.stop()
+            video_thread.wait(2000)
@@ -4,10 +4,16 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(current_dir, '../../'))
 sys.path.append(project_root)
 
+import time
 from unittest.mock import patch, MagicMock
 import numpy as np
+from PyQt5.QtCore import QTimer
+from widgets import video_window
 from widgets.video_window import save_to_pdf, VideoBase
 from interfaces.classes import Defect
+from interfaces.capture_sync import Snapshot
+from interfaces.frame_buffer import Frame
+from interfaces.inspection_budget import InspectionBudget, StageCosts
 
 
 def test_save_to_pdf():
@@ -103,6 +109,157 @@ def test_detect_images(mocker):
     assert len(detected_imgs) == 1
     assert detected_features["detected_info"] == [[1, 0]]
     assert len(defects_list) == 1
+
+
+def _inspection_base(mocker, detection_seconds, capture_seconds=0.1):
+    """VideoBase capturing two cameras in ``capture_seconds``, detecting each image in ``detection_seconds``."""
+    buttons = {"detect_button": MagicMock(), "capture_button": MagicMock(), "stop_button": MagicMock()}
+    models = {name: MagicMock() for name in ("top_bottom", "lot_asset_barcode", "logo", "lot", "serial_region",
+                                             "serial", "barcode", "keyboard", "screen")}
+    image = np.zeros((48, 64, 3), dtype=np.uint8)
+    snapshot = Snapshot(time.monotonic(), {3: Frame(image, 1.0, 1), 4: Frame(image, 1.0, 1)}, [])
+
+    def slow_snapshot(*args, **kwargs):
+        time.sleep(capture_seconds)
+        return snapshot
+
+    mocker.patch("widgets.video_window.synchronized_snapshot", side_effect=slow_snapshot)
+
+    def slow_detection(img, *args):
+        time.sleep(detection_seconds)
+        return img, [0, 0], []
+
+    mocker.patch("widgets.video_window.segment_with_sahi", side_effect=slow_detection)
+    mocker.patch("widgets.video_window.IncrementalReport")
+    mocker.patch("widgets.video_window.get_inspection_log")
+    return VideoBase(thread_labels=[], buttons=buttons, models=models)
+
+
+def _process_events(app, condition, timeout):
+    """Run the GUI event loop by hand until ``condition()`` holds (other tests quit the shared application)."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.002)
+
+
+def test_camera_discovery_off_gui_thread(qapp, mocker):
+    """The first camera discovery runs in the io pool and the cameras are started from its result."""
+    video_base = _inspection_base(mocker, detection_seconds=0)
+    video_base.thread_labels = [MagicMock() for _ in range(6)]
+    discovery = MagicMock(devices=None)
+
+    def slow_discover(skip):
+        time.sleep(0.3)
+        discovery.devices = {2: {}}
+        return discovery.devices
+
+    discovery.discover.side_effect = slow_discover
+    discovery.live_ports.side_effect = lambda: sorted(discovery.devices)
+    video_base.camera_discovery = discovery
+    started = []
+    mocker.patch.object(video_base, 'start_camera', side_effect=lambda port: started.append(port) or True)
+
+    start = time.monotonic()
+    video_base.start_detection()
+    video_base.start_detection()  # clicked again during the discovery
+    assert time.monotonic() - start < 0.1
+    assert started == []
+    _process_events(qapp, lambda: started, timeout=5)
+    video_base.inspection_queue.stop()
+    video_base.async_runner.stop()
+
+    assert started == [2]
+    assert discovery.discover.call_count == 1
+
+
+def test_inspection_does_not_block_gui(qapp, mocker):
+    """The Qt event loop keeps running while the inspection runs on the background loop."""
+    video_base = _inspection_base(mocker, detection_seconds=0.3)
+    results, statuses, ticks = [], [], []
+    video_base.laptop_info.connect(results.append)
+    video_base.inspection_finished.connect(statuses.append)
+    timer = QTimer()
+    timer.timeout.connect(lambda: ticks.append(time.monotonic()))
+    timer.start(10)
+
+    video_base.capture_images_button_clicked()
+    assert video_base.capturing
+    _process_events(qapp, lambda: results, timeout=5)
+    timer.stop()
+    video_base.inspection_queue.stop()
+    video_base.async_runner.stop()
+
+    assert statuses == ['finished']
+    assert len(results) == 1
+    assert not video_base.capturing
+    gaps = np.diff(ticks) * 1000
+    assert len(gaps) > 20
+    assert gaps.max() < 100
+
+
+def test_cancel_inspection(qapp, mocker):
+    """Clicking the capture button again cancels the inspection, no result is emitted."""
+    video_base = _inspection_base(mocker, detection_seconds=0.2)
+    results, statuses = [], []
+    video_base.laptop_info.connect(results.append)
+    video_base.inspection_finished.connect(statuses.append)
+
+    video_base.capture_images_button_clicked()
+    video_base.capture_images_button_clicked()
+    _process_events(qapp, lambda: statuses, timeout=5)
+    _process_events(qapp, lambda: False, timeout=0.5)
+    video_base.inspection_queue.stop()
+    video_base.async_runner.stop()
+
+    assert statuses == ['cancelled']
+    assert not video_base.capturing
+    assert results == []
+
+
+def test_next_laptop_captured_while_previous_processed(qapp, mocker):
+    """The capture returns once the laptop is queued, the next one can be captured during its detection."""
+    video_base = _inspection_base(mocker, detection_seconds=0.3)
+    results, statuses, queue_states = [], [], []
+    video_base.laptop_info.connect(results.append)
+    video_base.inspection_finished.connect(statuses.append)
+    video_base.queue_changed.connect(queue_states.append)
+
+    video_base.capture_images_button_clicked()
+    _process_events(qapp, lambda: statuses, timeout=5)
+    video_base.capture_images_button_clicked()
+    _process_events(qapp, lambda: len(statuses) == 2, timeout=5)
+    assert statuses == ['finished', 'finished']
+    assert results == []
+
+    _process_events(qapp, lambda: len(results) == 2, timeout=5)
+    video_base.inspection_queue.stop()
+    video_base.async_runner.stop()
+    _process_events(qapp, lambda: queue_states[-1]['done'] == 2, timeout=5)  # status emitted by the workers
+
+    assert results[0]['job'] < results[1]['job']
+    assert any(state['running'] == 1 and state['pending'] == 1 for state in queue_states)
+    assert queue_states[-1]['done'] == 2
+
+
+def test_reduced_inspection_within_budget(qapp, mocker):
+    """A tight budget makes the detection use fewer SAHI slices and records it in the results."""
+    video_base = _inspection_base(mocker, detection_seconds=0.01)
+    mocker.patch.object(video_base, 'identify_top', return_value=('Apple', 'LOT1', 'A1', {}))
+    costs = StageCosts(priors={'segment/full': 400, 'segment/reduced': 150, 'segment/minimal': 80, 'report': 10})
+    image = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    detected_imgs, features, _ = video_base.async_runner.submit(
+        video_base.detect_images([(image, 3), (image, 1)], InspectionBudget(300, costs))).result(timeout=5)
+    video_base.inspection_queue.stop()
+    video_base.async_runner.stop()
+
+    # camera 3 is segmented with a single slice instead of 2x2 to leave time for camera 1
+    assert video_window.segment_with_sahi.call_args_list[0].args[1] == 1
+    assert features['inspection_mode'] == 'reduced'
+    assert features['degradations'][0] == 'segment 3: reduced'
+    assert [port for _, port in detected_imgs] == [3, 1]
+
 #
 #
 # def test_capture_images(mocker):
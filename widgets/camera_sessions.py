@@ -0,0 +1,69 @@
+"""
+Model Name: camera_sessions.py
+Description: keep camera threads and their opened devices alive across stop/start of the detection.
+
+Re-opening a DirectShow or V4L2 device re-negotiates its format, which is slow and sometimes fails. Stopping the
+detection therefore parks the camera threads (device opened, no frame read or emitted), and starting it again
+resumes them. Devices are released when the application exits or when a thread stays parked longer than the idle
+timeout.
+
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+from .video_thread import VideoThread
+
+
+class CameraSessionManager:
+    """
+    Owns one VideoThread per camera port.
+
+    Attributes:
+        idle_timeout (float): Seconds a parked thread keeps its device before releasing it, 0 to keep it forever.
+        sessions (dict): Camera port mapped to its VideoThread.
+    """
+    def __init__(self, idle_timeout=0, thread_factory=VideoThread):
+        self.idle_timeout = idle_timeout
+        self.thread_factory = thread_factory
+        self.sessions = {}
+
+    def acquire(self, port):
+        """
+        Get a running camera thread for a port, resuming a parked one or starting a new one.
+
+        Args:
+            port (int): Camera port.
+
+        Returns:
+            tuple: (VideoThread, bool) the thread and whether it was just created (its signals must be connected).
+        """
+        thread = self.sessions.get(port)
+        if thread is not None and thread.running and thread.isRunning():
+            thread.resume()
+            return thread, False
+
+        thread = self.thread_factory(port, idle_timeout=self.idle_timeout)
+        self.sessions[port] = thread
+        thread.start()
+        return thread, True
+
+    def park_all(self):
+        """Park every camera thread, their devices stay opened."""
+        for thread in self.sessions.values():
+            thread.park()
+
+    def open_ports(self):
+        """Ports whose device is held by a running or parked thread, safe to call from other threads."""
+        return {port for port, thread in list(self.sessions.items()) if thread.running}
+
+    def release_all(self, timeout=2000):
+        """
+        Stop every camera thread and release its device.
+
+        Args:
+            timeout (int): Maximum waiting time per thread, in milliseconds.
+        """
+        for thread in self.sessions.values():
+            thread.stop()
+        for thread in self.sessions.values():
+            thread.wait(timeout)
+        self.sessions = {}
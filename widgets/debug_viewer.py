@@ -0,0 +1,61 @@
+"""
+Model Name: debug_viewer.py
+Description: Non-modal window showing the latest debug image recorded by the detection pipeline for each name.
+Author: Kun
+Last Modified: 19 Oct 2026
+"""
+import cv2 as cv
+import numpy as np
+from PyQt5.QtCore import Qt, pyqtSlot
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QWidget, QGridLayout, QLabel
+
+
+def convert_debug_image(image):
+    """Convert a grayscale or BGR image into a QImage owning its pixels."""
+    if image.ndim == 2:
+        image = np.ascontiguousarray(image)
+        h, w = image.shape
+        return QImage(image.data, w, h, w, QImage.Format_Grayscale8).copy()
+    rgb_image = cv.cvtColor(image, cv.COLOR_BGR2RGB)
+    h, w, ch = rgb_image.shape
+    return QImage(rgb_image.data, w, h, ch * w, QImage.Format_RGB888).copy()
+
+
+class DebugViewer(QWidget):
+    """
+    Window with one tile per debug image name, each tile showing the most recent image.
+
+    Connect ``interfaces.debug_sink.QtDebugSink.image_recorded`` to ``show_image``.
+    """
+    COLUMNS = 3
+    TILE_SIZE = 320
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('Detection Debug')
+        self.setWindowFlags(Qt.Window | Qt.WindowStaysOnTopHint)
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.layout = QGridLayout(self)
+        self.tiles = {}
+
+    def _tile(self, name):
+        if name not in self.tiles:
+            idx = len(self.tiles)
+            title = QLabel(name)
+            image_label = QLabel()
+            image_label.setFixedSize(self.TILE_SIZE, self.TILE_SIZE // 2)
+            image_label.setAlignment(Qt.AlignCenter)
+            row, col = divmod(idx, self.COLUMNS)
+            self.layout.addWidget(title, row * 2, col)
+            self.layout.addWidget(image_label, row * 2 + 1, col)
+            self.tiles[name] = image_label
+        return self.tiles[name]
+
+    @pyqtSlot(str, object)
+    def show_image(self, name, image):
+        label = self._tile(name)
+        label.setPixmap(QPixmap.fromImage(convert_debug_image(image))
+                        .scaled(label.size(), Qt.KeepAspectRatio))
+        if not self.isVisible():
+            self.show()
@@ -10,6 +10,7 @@ Classes:
 Structure:
 - File:
     - Open (connect with action actionOpenFile): open file in folder
+    - Report as PDF (connect with action actionReportPdf): render the PDF of an html report
     - Exit (connect with action actionExitApp): exit app
 - Database:
     - Open (connect with action actionOpenDatabase): open database to review data
@@ -26,10 +27,16 @@ Functions:
 Author: Kun
 Last Modified: 26 Aug 2024
 """
+import os
 from interfaces.export import ExportFile
+from interfaces.executors import get_executor
+from interfaces.report import pdf_from_record
+from interfaces.settings import get_settings
 from typing import Optional
 from PyQt5.QtCore import pyqtSlot, QObject, QCoreApplication
-from PyQt5.QtWidgets import QApplication
+from PyQt5.QtWidgets import QApplication, QFileDialog
+
+_widget_dir = os.path.dirname(os.path.abspath(__file__))
 
 
 def get_app() -> Optional[QCoreApplication]:
@@ -48,6 +55,8 @@ class BarBase(QObject):
         actionOpenFile.triggered.connect(self.open_file)
         actionExitApp = self.actionDict['exitApp']
         actionExitApp.triggered.connect(self.exit_app)
+        actionReportPdf = self.actionDict['reportPdf']
+        actionReportPdf.triggered.connect(self.report_as_pdf)
         actionOpenDatabase = self.actionDict['openDatabase']
         actionOpenDatabase.triggered.connect(self.open_database)
         actionExportData = self.actionDict['exportData']
@@ -69,6 +78,20 @@ class BarBase(QObject):
         print('action connected')
         pass
 
+    @pyqtSlot()
+    def report_as_pdf(self):
+        """Render the PDF of an html report chosen by the operator, in the I/O pool."""
+        settings = get_settings()['report']
+        directory = os.path.join(_widget_dir, '../dataset', settings['html_folder'])
+        record_path, _ = QFileDialog.getOpenFileName(None, 'Report as PDF', directory, 'Reports (*.json)')
+        if not record_path:
+            return
+        future = get_executor('io').submit(pdf_from_record, record_path, None, settings['dpi'],
+                                           settings['jpeg_quality'])
+        future.add_done_callback(
+            lambda f: print(f'PDF has saved to {f.result()}' if f.exception() is None
+                            else f'PDF of {record_path} failed: {f.exception()!r}'))
+
     @pyqtSlot()
     def open_database(self):
         pass
@@ -2,19 +2,20 @@
 Control Panel for Device Management
 
 This script provides a GUI control panel using PyQt5 for entering and saving device information,
-such as serial numbers and device models. The information is saved to a CSV file named 'dataset.csv'
-in the 'Dataset' directory.
+such as serial numbers and device models. The information is saved to the inspection store (an SQLite database in
+the 'dataset' directory, see interfaces.inspection_store), linked to the report and defects of the laptop.
 
 Classes:
 - PanelBase: A QObject-based class that creates the control panel logic.
 
 Functions:
-- init_dataset(): Initializes the dataset by creating the CSV file if it doesn't already exist.
+- init_dataset(): Opens the inspection store, importing the legacy 'dataset.csv' once in the I/O pool.
 - handle_signal(): Connects button signals to their respective slot functions.
-- save_to_dataset(): Handles the save button click event to save the input data to the CSV file.
+- save_to_dataset(): Handles the save button click event to save the input data to the inspection store.
 - clear_all_inputs(): Clears all input fields.
 - set_detected_features(): Updates input fields with detected information from the detection process.
 - grade(): Sets a grade based on detected defects.
+- set_queue_status(): Shows the laptops waiting in the inspection queue.
 
 Widgets (Input Lines):
 - model_input
@@ -31,8 +32,11 @@ import os
 
 import cv2 as cv
 from PyQt5.QtCore import Qt, QObject, pyqtSlot
-import csv
 from interfaces.classes import Defect
+from interfaces.inspection_log import grade_laptop
+from interfaces.executors import get_executor
+from interfaces.inspection_store import get_inspection_store
+from interfaces.settings import get_settings
 
 
 _widget_dir = os.path.dirname(os.path.abspath(__file__))
@@ -40,38 +44,39 @@ _widget_dir = os.path.dirname(os.path.abspath(__file__))
 
 def init_dataset():
     """
-    Initializes the dataset directory and CSV file. Creates the directory and file with headers if they don't exist.
-    """
-    root_path = os.path.abspath(os.path.join(_widget_dir, '..'))
-    dataset_dir_path = os.path.join(root_path, 'dataset')
-    if not os.path.exists(dataset_dir_path):
-        os.makedirs(dataset_dir_path)
+    Opens the inspection store (creating the dataset directory and the database if they don't exist) and imports the
+    laptops of the legacy CSV dataset once, in the I/O pool.
 
-    dataset_file = os.path.join(dataset_dir_path, 'dataset.csv')
-    if not os.path.exists(dataset_file):
-        fieldnames = ['model', 'serial number', 'lot number', 'grade', 'stain', 'scratch']
-        with open(dataset_file, 'a', newline='', encoding='utf-8') as dataset:
-            writer = csv.DictWriter(dataset, fieldnames=fieldnames)
-            writer.writeheader()
+    Returns:
+        Future: Number of laptops imported, None without legacy CSV.
+    """
+    store = get_inspection_store()
+    legacy_csv = get_settings()['inspection_store']['legacy_csv']
+    if not legacy_csv:
+        return None
+    return get_executor('io').submit(store.import_csv, os.path.join(_widget_dir, '..', legacy_csv))
 
 
 class PanelBase(QObject):
     """
     The control panel class that manages user input, saves data to the dataset, and updates fields based on detection results.
     """
-    def __init__(self, input_lines, panel_buttons):
+    def __init__(self, input_lines, panel_buttons, queue_label=None):
         """
         Initializes the PanelBase class.
 
         Args:
             input_lines (dict): A dictionary mapping input line names to their corresponding input widgets.
             panel_buttons (dict): A dictionary mapping button names to their corresponding button widgets.
+            queue_label (QLabel): Label showing the inspection queue, optional.
         """
         super(PanelBase, self).__init__()
         self.input_lines = input_lines
         self.panel_buttons = panel_buttons
+        self.queue_label = queue_label
+        self.detected_features = None  # features of the laptop shown, linked to it when saved
         self.handle_signal()
-        init_dataset()
+        self.dataset_import = init_dataset()  # future of the legacy CSV import
 
     def handle_signal(self):
         """
@@ -85,7 +90,6 @@ class PanelBase(QObject):
 
     def save_to_dataset(self):
         saving_info = {}
-        dataset_file = os.path.join(_widget_dir, '../dataset/dataset.csv')
         for name, input_line in self.input_lines.items():
             name = name[:-6].replace('_', ' ')
             saving_info[name] = input_line.text()
@@ -95,18 +99,19 @@ class PanelBase(QObject):
             print("No data to save. Skipping...")
             return
 
-        # Add information into dataset
-        fieldnames = ['model', 'serial number', 'lot number', 'grade', 'stain', 'scratch']
-        with open(dataset_file, 'a', newline='', encoding='utf-8') as dataset:
-            writer = csv.DictWriter(dataset, fieldnames=fieldnames)
-            if os.path.getsize(filename=dataset_file) == 0:
-                writer.writeheader()
-            # writer.writerow([i for i in saving_info.values()])
-            writer.writerow(saving_info)
+        # Add information into dataset: only queued here, the writer thread of the store commits it (no disk I/O on
+        # the GUI thread)
+        features = self.detected_features or {}
+        laptop = {'model': saving_info.get('model'), 'serial': saving_info.get('serial number'),
+                  'lot': saving_info.get('lot number'), 'grade': saving_info.get('grade'),
+                  'scratch': saving_info.get('scratch'), 'stain': saving_info.get('stain'),
+                  'job': features.get('job'), 'source': 'detection' if features else 'manual'}
+        get_inspection_store().add(laptop, features.get('files', ()), features.get('defect_boxes', ()))
 
         self.clear_all_inputs()
 
     def clear_all_inputs(self):
+        self.detected_features = None
         for input_line in self.input_lines.values():
             input_line.clear()
         print('Clear Info Successful')
@@ -135,11 +140,27 @@ class PanelBase(QObject):
         self.input_lines['stain_input'].setText(str(stain_counts))
 
         grade_info = {'scratch': scratch_counts, 'stain': stain_counts}
+        self.detected_features = detected_features
         print('Info Update Successful')
 
         self.grade(grade_info)
         # self.save_to_dataset()
 
+    @pyqtSlot(dict)
+    def set_queue_status(self, status):
+        """
+        Shows the inspection queue.
+
+        Args:
+            status (dict): Status of the inspection queue, see InspectionQueue.status().
+        """
+        if self.queue_label is None:
+            return
+        text = f"Queue: {status['pending']}/{status['max_depth']} waiting, {status['running']} processing"
+        if status['failed']:
+            text += f", {status['failed']} failed"
+        self.queue_label.setText(text)
+
     def grade(self, grade_info):
         """
         Sets a grade based on the defect counts.
@@ -150,10 +171,7 @@ class PanelBase(QObject):
         """
         scratch_count, stain_count = grade_info['scratch'], grade_info['stain']
 
-        # Basic grading logic (can be expanded as needed)
-        if scratch_count > 10 or stain_count > 10:
-            self.input_lines['grade_input'].setText('C')
-        else:
-            self.input_lines['grade_input'].setText('A')
+        # Basic grading logic (can be expanded as needed), shared with the inspection log
+        self.input_lines['grade_input'].setText(grade_laptop(scratch_count, stain_count))
 
 
@@ -2,15 +2,24 @@
 Model Name: VideoThread.py
 Description: load video for each camera.
 Author: Kun
-Last Modified: 03 Jul 2024
+Last Modified: 19 Oct 2026
 """
 from PyQt5.QtCore import pyqtSlot
 # from IO.detection_functions import *
-from PyQt5.QtGui import QImage, QPixmap
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtGui import QImage
+from PyQt5.QtCore import QThread, pyqtSignal
+from interfaces.camera_process import ProcessSource
+from interfaces.camera_sources import create_source
+from interfaces.frame_buffer import Frame, FrameBuffer
+from interfaces.frame_quality import select_sharpest
+from interfaces.shared_frames import SharedFrameBuffer
+from interfaces.settings import get_settings
 import cv2 as cv
 import numpy as np
+import queue
 import threading
+import time
+from concurrent.futures import Future
 
 
 def convert_cv_qt(cv_img):
@@ -22,40 +31,324 @@ def convert_cv_qt(cv_img):
     return convert_to_Qt_format
 
 
+def make_preview(cv_img, size):
+    """
+    Downscale a BGR frame to fit a label and wrap it in a QImage without converting colours.
+
+    Args:
+        cv_img (numpy.ndarray): BGR frame.
+        size (tuple[int, int]): (width, height) of the label, None to keep the frame size.
+
+    Returns:
+        tuple: (QImage, numpy.ndarray) the image and the array owning its pixels, which must be kept alive
+        until the image has been consumed.
+    """
+    h, w = cv_img.shape[:2]
+    if size is not None and size[0] > 0 and size[1] > 0:
+        scale = min(size[0] / w, size[1] / h)
+        if scale < 1:
+            cv_img = cv.resize(cv_img, (max(1, int(w * scale)), max(1, int(h * scale))),
+                               interpolation=cv.INTER_AREA)
+    if cv_img.base is not None:  # view of a frame owned by someone else (e.g. a shared ring), keep a copy
+        cv_img = cv_img.copy()
+    cv_img = np.ascontiguousarray(cv_img)
+    h, w, ch = cv_img.shape
+    if hasattr(QImage, 'Format_BGR888'):  # Qt >= 5.14
+        return QImage(cv_img.data, w, h, ch * w, QImage.Format_BGR888), cv_img
+    rgb_image = cv.cvtColor(cv_img, cv.COLOR_BGR2RGB)
+    return QImage(rgb_image.data, w, h, ch * w, QImage.Format_RGB888), rgb_image
+
+
 class VideoThread(QThread):
+    """
+    Camera thread: the only reader of its frame source (see interfaces.camera_sources).
+
+    Every decoded frame is pushed into ``frame_buffer`` (a small ring buffer with timestamps) before being
+    emitted for the preview, so capture() never reads from the device concurrently with run().
+
+    Previews are downscaled here to the size of the label, emitted at most ``max_fps`` times per second, and
+    skipped while the GUI has not consumed the previous one (see frame_consumed()).
+
+    A parked thread keeps its source opened but neither reads nor emits frames, so resume() restarts the preview
+    without re-opening and re-negotiating the device. A thread parked longer than ``idle_timeout`` seconds releases
+    its source and finishes.
+
+    When the camera has a ``preview`` and a ``still`` profile (see the ``profiles`` camera setting), previews stream
+    at the preview resolution and request_still() switches the device to the still resolution for a short burst, the
+    sharpest frame of which is returned.
+
+    set_throttle() lowers the rate at which frames are read and decoded (or stops reading, the preview staying on the
+    last frame) to leave the CPU to the inference, see interfaces.resource_governor. The motion detector of the
+    auto-capture mode is fed at its own rate from the decoded frames, which keep being read at that rate (the previews
+    staying throttled) so that a laptop placed during an inference is still captured.
+    """
     change_pixmap_signal = pyqtSignal(QImage)
+    settled = pyqtSignal(int, float)  # camera port and time (time.monotonic) of a placed object that stopped moving
+
+    # a preview not consumed after this many seconds is considered lost (e.g. hidden label)
+    PREVIEW_STALE_AFTER = 1.0
+    # frames read at most after a profile switch to get one at the still resolution
+    STILL_ATTEMPTS = 10
 
-    def __init__(self, camera_port=0):
+    def __init__(self, camera_port=0, buffer_size=8, max_fps=None, idle_timeout=0):
         super().__init__()
         self.camera_port = camera_port
         self.running = True
-        self.cap = None
+        self.source = None
+        self.idle_timeout = idle_timeout
+        self.buffer_size = buffer_size
+        self._active = threading.Event()
+        self._active.set()
+        self._still_requests = queue.Queue()
+        self._wake = threading.Event()  # interrupts the wait of a throttled thread
+        self.throttle_fps = None  # frames read per second while throttled, 0 when frozen, None for no throttle
+        self._last_read = 0.0
+        self.last_switch_ms = None  # duration of the last still capture, profile switches included
+        self.burst_size = max(1, get_settings()['capture']['burst_size'])
+        self.last_burst = None  # (selected index, sharpness scores) of the last still burst
+        self.motion_detector = None  # StabilityDetector fed with the decoded frames in auto-capture mode
+        self._last_motion = 0.0
+        self.frame_buffer = FrameBuffer(buffer_size)
+
+        self.max_fps = get_settings()['preview']['max_fps'] if max_fps is None else max_fps
+        self.preview_size = None
+        self._preview_frame = None  # keeps the pixels of the emitted QImage alive
+        self._preview_pending = False
+        self._last_preview = 0.0
 
     def run(self):
-        self.cap = cv.VideoCapture(self.camera_port, cv.CAP_DSHOW)
-        if not self.cap.isOpened():
+        try:
+            self.source = create_source(self.camera_port)
+        except ValueError as e:
+            print(f'Cannot init camera {self.camera_port}: {e}')
+            self.running = False
+            return
+        if not self.source.open():
             print(f'Cannot init camera {self.camera_port}, please make sure the camera is installed correctly.')
             self.running = False
             return
+        profiles = self.source.config.get('profiles', {})
+        if profiles.get('preview'):
+            self.source.apply_profile(profiles['preview'])
+        print(f'Camera {self.camera_port} opened: {self.source.capabilities()}')
+        # a camera process already keeps its recent frames in shared memory, read them from there
+        shared = isinstance(self.source, ProcessSource)
+        if shared:
+            self.frame_buffer = SharedFrameBuffer(self.source.ring)
+            if self.throttle_fps is not None:  # throttled before the source was opened
+                self.source.set_throttle(self._read_fps())
 
         while self.running:
-            ret, frame = self.cap.read()
+            if not self._active.is_set():
+                if not self._active.wait(self.idle_timeout or None):
+                    print(f'Camera {self.camera_port} parked for {self.idle_timeout}s, releasing it')
+                    self.running = False
+                continue
+            if not self._still_requests.empty():
+                self.take_still(profiles)
+                continue
+            if self._throttled():
+                continue
+            ret, frame = self.source.read()
+            self._last_read = time.monotonic()
             if ret:
-                qt_image = convert_cv_qt(frame)
-                self.change_pixmap_signal.emit(qt_image)
+                if not shared:
+                    self.frame_buffer.push(frame)
+                now = time.monotonic()
+                qt_image = self.preview(frame, now)
+                if qt_image is not None:
+                    self.change_pixmap_signal.emit(qt_image)
+                self._detect_motion(frame, now)
             else:
                 print(f'Failed to capture image from camera {self.camera_port}')
                 self.running = False
 
-        self.cap.release()
+        if shared:
+            self.frame_buffer = FrameBuffer(self.buffer_size)
+        self.source.release()
+        self._answer_still_requests(None)
+
+    def _detect_motion(self, frame, now):
+        detector = self.motion_detector
+        if detector is None or now - self._last_motion < 1.0 / detector.fps:
+            return
+        self._last_motion = now
+        if detector.feed(frame):
+            self.settled.emit(self.camera_port, now)
+
+    def _read_fps(self):
+        """Frames read per second, the motion detector keeps its rate while the thread is throttled or frozen."""
+        fps, detector = self.throttle_fps, self.motion_detector
+        if fps is not None and detector is not None:
+            fps = max(fps, detector.fps)
+        return fps
+
+    def _throttled(self):
+        """Wait while the thread is throttled, return True if no frame should be read yet."""
+        fps = self._read_fps()
+        if fps is None:
+            return False
+        wait = 0.5 if fps == 0 else self._last_read + 1.0 / fps - time.monotonic()
+        if wait <= 0:
+            return False
+        self._wake.wait(wait)
+        self._wake.clear()
+        return True
+
+    def set_throttle(self, fps):
+        """
+        Limit the frames read and decoded, and the previews emitted.
+
+        Args:
+            fps (float): Frames per second, 0 to stop reading (the preview keeps the last frame), None to restore
+                the normal rate. Frames are still read at the rate of the motion detector, if any.
+        """
+        self.throttle_fps = fps
+        if isinstance(self.source, ProcessSource):  # the camera process decodes the frames
+            self.source.set_throttle(self._read_fps())
+        self._wake.set()
+
+    def take_still(self, profiles):
+        """
+        Read a burst of frames at the still profile, keep the sharpest one and switch back to the preview profile,
+        in the camera thread.
+
+        Args:
+            profiles (dict): The ``profiles`` camera setting.
+        """
+        start = time.perf_counter()
+        still_size = self.source.apply_profile(profiles['still']) if profiles.get('still') else None
 
-    def capture(self):
-        if not self.running or not self.cap.isOpened():
+        burst = []
+        for _ in range(self.burst_size + (self.STILL_ATTEMPTS if still_size else 0)):
+            ret, image = self.source.read()
+            if not ret:
+                break
+            # frames queued before the switch still have the preview resolution
+            if still_size is None or (image.shape[1], image.shape[0]) == still_size:
+                burst.append(Frame(image, time.monotonic(), 0))
+                if len(burst) == self.burst_size:
+                    break
+
+        if still_size is not None and profiles.get('preview'):
+            self.source.apply_profile(profiles['preview'])
+
+        still = None
+        self.last_burst = None
+        if burst:
+            selected, scores = select_sharpest([frame.image for frame in burst])
+            still = burst[selected]
+            if not still.image.flags.owndata:  # view of the ring of a camera process
+                still = still._replace(image=still.image.copy())
+            self.last_burst = (selected, scores)
+        self.last_switch_ms = (time.perf_counter() - start) * 1000
+        self._answer_still_requests(still)
+
+    def _answer_still_requests(self, still):
+        while not self._still_requests.empty():
+            self._still_requests.get_nowait().set_result(still)
+
+    def has_still_profile(self):
+        return self.source is not None and bool(self.source.config.get('profiles', {}).get('still'))
+
+    def request_still(self):
+        """
+        Ask the camera thread for a full resolution frame.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the still Frame, None if the camera failed or stopped.
+        """
+        future = Future()
+        if not self.running:
+            future.set_result(None)
+            return future
+        self._still_requests.put(future)
+        self._wake.set()
+        return future
+
+    def preview(self, frame, now):
+        """
+        Build the preview of a frame if one is due.
+
+        Args:
+            frame (numpy.ndarray): BGR frame.
+            now (float): Current time (time.monotonic).
+
+        Returns:
+            QImage: The preview, None if the frame is dropped.
+        """
+        max_fps = self.max_fps
+        if self.throttle_fps is not None:  # frames may be read faster for the motion detector
+            if self.throttle_fps == 0:
+                return None
+            max_fps = min(max_fps, self.throttle_fps) if max_fps else self.throttle_fps
+        if max_fps and now - self._last_preview < 1.0 / max_fps:
             return None
+        if self._preview_pending and now - self._last_preview < self.PREVIEW_STALE_AFTER:
+            return None
+
+        qt_image, pixels = make_preview(frame, self.preview_size)
+        if self._preview_pending:
+            # the previous preview may still be queued and reference the old pixels, emit an owning copy
+            qt_image = qt_image.copy()
+        else:
+            self._preview_frame = pixels
+        self._preview_pending = True
+        self._last_preview = now
+        return qt_image
+
+    def set_preview_size(self, width, height):
+        self.preview_size = (width, height)
+
+    def frame_consumed(self, width=None, height=None):
+        """
+        Called by the GUI once the last preview has been drawn.
+
+        Args:
+            width (int): Current width of the label, optional.
+            height (int): Current height of the label, optional.
+        """
+        if width and height:
+            self.preview_size = (width, height)
+        self._preview_pending = False
+
+    def capture(self, after=None, timeout=1.0):
+        """
+        Take a frame from the ring buffer without touching the device.
+
+        Args:
+            after (float): Trigger time (time.monotonic). If given, wait for the first frame captured after it.
+            timeout (float): Maximum waiting time in seconds when ``after`` is given.
+
+        Returns:
+            numpy.ndarray: The frame, None if the camera is not running or no frame is available.
+        """
+        if not self.running:
+            return None
+
+        if after is None:
+            frame = self.frame_buffer.latest()
+        else:
+            frame = self.frame_buffer.wait_newer(after, timeout)
+        return frame.image if frame is not None else None
+
+    @property
+    def parked(self):
+        return not self._active.is_set()
+
+    def park(self):
+        """Stop reading and emitting frames, keeping the source opened."""
+        self._active.clear()
+        self.frame_buffer.clear()
 
-        ret, frame = self.cap.read()
-        return frame if ret else None
+    def resume(self):
+        """Restart reading and emitting frames after park()."""
+        self.frame_buffer.clear()
+        self._preview_pending = False
+        self._active.set()
 
     def stop(self):
         self.running = False
+        self._active.set()  # wake up a parked thread so that it releases its source
+        self._wake.set()
         # self.wait()
@@ -4,119 +4,68 @@ Description: create a window widget to present camera information.
 Author: Kun
 Last Modified: 03 Jul 2024
 """
-from PyQt5.QtCore import QObject, pyqtSlot, Qt, pyqtSignal, QThread, QEventLoop
+from PyQt5.QtCore import QObject, pyqtSlot, Qt, pyqtSignal, QThread, QEventLoop, QTimer
 from PyQt5.QtGui import QImage, QPixmap
 from PyQt5.QtWidgets import QFileDialog
 # from exceptions.detection_exceptions import DetectionException
 from interfaces.saver import ImageSaver
 from interfaces.detection_functions import *
+from interfaces.barcode import identification_stats
+from interfaces.ocr import get_ocr_cache
+from interfaces.capture_sync import synchronized_snapshot
+from interfaces.camera_discovery import get_camera_discovery
+from interfaces.motion import StabilityDetector
+from interfaces.frame_quality import burst_stats
+from interfaces.settings import get_settings
+from interfaces.async_runner import AsyncRunner
+from interfaces.inspection_queue import InspectionJob, InspectionQueue
+from interfaces.inspection_budget import SEGMENT_OPTIONS, InspectionBudget, get_stage_costs
+from interfaces.resource_governor import ResourceGovernor, limit_inference_threads
+from interfaces.executors import get_executor, executors_report
+from interfaces.report import SURFACES, IncrementalReport, render_pdf_report, write_html_report
+from interfaces.inspection_log import get_inspection_log, inspection_record
 from .video_thread import VideoThread
+from .camera_sessions import CameraSessionManager
 import cv2 as cv
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-from PIL import Image
 import numpy as np
 import asyncio
+import functools
+import time
 from asyncio import events
-from concurrent.futures import ThreadPoolExecutor
 
 _widget_dir = os.path.dirname(os.path.abspath(__file__))
 
-TRANSFER = {0: 'top', 1: 'bottom', 2: 'keyboard', 3: 'screen', 4: 'left', 5: 'right'}
 
-def save_to_pdf(detected_imgs: list[tuple], defects_list: list[tuple[list[Defect], int]], name: str):
+def report_path(name: str) -> str:
+    """Path of the PDF report of a laptop named after its lot number."""
+    name = name.strip('\n')
+    return os.path.join(_widget_dir, f'../dataset/{name}.pdf')
+
+
+def save_to_pdf(detected_imgs: list[tuple], defects_list: list[tuple[list[Defect], int]], name: str,
+                notes: list[str] = None):
     """
-    Generates a PDF report summarizing the detected defects and includes full detected images.
+    Generates a PDF report summarizing the detected defects and includes the detected images, downscaled to print
+    resolution and embedded as JPEG (see interfaces.report and the ``report`` settings).
 
     Args:
         detected_imgs (list[tuple]): List of detected images and their associated camera ports.
         defects_list (list[tuple[list[Defect], int]]): Detected defects grouped by camera port.
         name (str): Name of the PDF file.
+        notes (list[str]): Lines written at the top of the report, e.g. the degradations of a reduced inspection.
     """
-    name = name.strip('\n')
-    pdf_name = os.path.join(_widget_dir, f'../dataset/{name}.pdf')
-    c = canvas.Canvas(pdf_name, pagesize=letter)
-    width, height = letter
-
-    y_position = height - 50
-    idx = 0
-
-    for defects, camera_port in defects_list:
-        detected_img = None
-        for img, port in detected_imgs:
-            if port == camera_port:
-                detected_img = img
-
-        # Insert detected_img at the beginning
-        if detected_img is not None:
-            if isinstance(detected_img, np.ndarray):
-                pil_detected_img = Image.fromarray(detected_img)  # Convert NumPy array to PIL image
-            else:
-                raise ValueError("Detected image must be a NumPy array")
-
-            detected_img_reader = ImageReader(pil_detected_img)  # Use PIL image directly
-            original_width, original_height = pil_detected_img.size
-            aspect_ratio = original_width / original_height
-            display_width = 500
-            display_height = display_width / aspect_ratio
-            if y_position - display_height < 100:  # end of page
-                c.showPage()
-                y_position = height - 50
-            # title 
-            c.drawString(50, y_position, f'Surface: {TRANSFER[port]}')
-            y_position -= 20
-            # image
-            c.drawImage(detected_img_reader, 50, y_position - display_height, width=display_width, height=display_height)
-            y_position -= (display_height + 20)
-
-            if y_position < 100:  # Check for end of page
-                c.showPage()
-                y_position = height - 50
-                
-        # idx of defect
-        for d in defects:
-            c.drawString(50, y_position, f'Defect {idx + 1}: {d.cls}')
-            idx += 1
-            y_position -= 20
-
-            # xyxy of defect
-            x1, y1, x2, y2 = d.xyxy
-            # bbox_info = f'bbox: ({x1}, {y1}), ({x2}, {y1}), ({x1}, {y2}), ({x2}, {y2})'
-            # c.drawString(50, y_position, bbox_info)
-            # y_position -= 20
-
-            # Process image directly in memory
-            if isinstance(d.image, np.ndarray):
-                pil_image = Image.fromarray(d.image)  # Convert NumPy array to PIL image
-            else:
-                raise ValueError("Image must be a NumPy array")
-
-            img_reader = ImageReader(pil_image)  # Use PIL image directly
-
-            # Calculate display size based on aspect ratio
-            original_width, original_height = pil_image.size
-
-            if original_width < 500:
-                c.drawImage(img_reader, 50, y_position - original_height, width=original_width, height=original_height)
-                y_position -= (original_height + 20)
-            else:
-                aspect_ratio = original_width / original_height
-                display_width = 500
-                display_height = display_width / aspect_ratio
-                c.drawImage(img_reader, 50, y_position - display_height, width=display_width, height=display_height)
-                y_position -= (display_height + 20)
-
-            if y_position < 100:  # end of page
-                c.showPage()
-                y_position = height - 50
-
-    c.save()
+    pdf_name = report_path(name)
+    settings = get_settings()['report']
+    render_pdf_report(pdf_name, detected_imgs, defects_list, notes, settings['dpi'], settings['jpeg_quality'])
     print(f'PDF has saved to {pdf_name}')
 
 
 class VideoBase(QObject):
     laptop_info = pyqtSignal(dict)  # Signal to emit detection results
+    cameras_changed = pyqtSignal(dict)  # Live camera ports changed (emitted by the discovery monitor thread)
+    inspection_progress = pyqtSignal(str, int)  # stage and percentage of the running inspection
+    inspection_finished = pyqtSignal(str)  # 'finished', 'cancelled' or 'failed'
+    queue_changed = pyqtSignal(dict)  # status of the inspection queue (emitted by the queue threads)
 
     def __init__(self, thread_labels=None, buttons=None, models=None):
         """
@@ -128,7 +77,27 @@ class VideoBase(QObject):
             models (dict): Dictionary of detection models.
         """
         super().__init__()
-        self.threads = []
+        self.threads = []  # VideoThreads of the running detection
+        self.preview_threads = {}  # label index -> VideoThread feeding it
+        self.detecting = False
+        self.camera_discovery = get_camera_discovery()
+        self._discovering = None  # concurrent.futures.Future of the first discovery, run in the io pool
+        self.camera_sessions = CameraSessionManager(idle_timeout=get_settings()['cameras']['idle_timeout'])
+        self.auto_capture = get_settings()['auto_capture']['enabled']
+        self.capturing = False
+        self._last_capture_end = 0.0
+        self._capture_text = ''
+        self.inspection = None  # concurrent.futures.Future of the running inspection
+        self.async_runner = AsyncRunner()
+        queue_settings = get_settings()['inspection_queue']
+        self.inspection_queue = InspectionQueue(self.process_job, max_depth=queue_settings['max_depth'],
+                                                workers=queue_settings['workers'], on_change=self.queue_changed.emit)
+        # previews are throttled while the detection runs, the inference threads share the cores
+        self.governor = ResourceGovernor.from_settings(lambda: list(self.threads))
+        resources = get_settings()['resources']
+        threads = limit_inference_threads(resources['torch_threads'], resources['opencv_threads'],
+                                          queue_settings['workers'])
+        print(f'Inference threads: {threads}')
         self.thread_labels = thread_labels
         self.buttons = buttons
         # self.models = models
@@ -139,10 +108,14 @@ class VideoBase(QObject):
         self.buttons['detect_button'].clicked.connect(self.start_detection)
         self.buttons['capture_button'].clicked.connect(self.capture_images_button_clicked)
         # self.buttons['capture_button'].clicked.connect(self.capture_images)
-        # self.buttons['capture_button'].clicked.connect(self.capture_selected_images)
         self.buttons['stop_button'].clicked.connect(self.stop_detection)
-        
-        self.executor = ThreadPoolExecutor()
+        self.cameras_changed.connect(self.on_cameras_changed)
+        self.inspection_finished.connect(self.on_inspection_finished)
+        self.inspection_progress.connect(self.on_inspection_progress)
+
+        # model calls and blocking I/O run in separate pools, see interfaces.executors
+        self.cpu_executor = get_executor('cpu')
+        self.io_executor = get_executor('io')
 
     def init_models(self, models):
         self.top_bottom_model = models['top_bottom']
@@ -156,113 +129,313 @@ class VideoBase(QObject):
         self.screen_model = models['screen']
 
     def start_detection(self):
-        for i in range(1, 7):
-            thread = VideoThread(i)
-            
-            if not thread.running:
-                continue
-            qThread = QThread()
-            thread.moveToThread(qThread)
-            thread.change_pixmap_signal.connect(getattr(self, f'set_image{i - 1}'))
-            thread.start()
-            self.threads.append((thread, qThread))
+        self.detecting = True
+        if self.camera_discovery.devices is None:
+            # probing the ports blocks up to the probe timeout, the cameras are started once it is done
+            if self._discovering is None:
+                self._discovering = self.io_executor.submit(self.camera_discovery.discover,
+                                                            self.camera_sessions.open_ports)
+                self._discovering.add_done_callback(self._discovery_done)
+            return
+        running = self.running_ports()
+        probed = [port for port in self.camera_discovery.live_ports()
+                  if port not in running and 1 <= port <= len(self.thread_labels) and not self.start_camera(port)]
+        if probed:  # the monitor is probing these ports, try again once their probes have timed out
+            QTimer.singleShot(int(self.camera_discovery.timeout * 1000), self._restart_detection)
         # ------------------------------------------------------------------------------ #
         # self.select_images()
 
+    def _discovery_done(self, future):
+        # called in an io thread, the signal is queued to the GUI thread
+        self._discovering = None
+        if future.exception() is not None:
+            print(f'Camera discovery failed: {future.exception()!r}')
+        else:
+            self.cameras_changed.emit(future.result())
+
+    def _restart_detection(self):
+        if self.detecting:
+            self.start_detection()
+
+    def start_camera(self, port):
+        """
+        Start or resume the camera thread of a port.
+
+        Returns:
+            bool: False if the port is being probed by the camera discovery and was not opened.
+        """
+        session = self.camera_discovery.open_port(port, self.camera_sessions.acquire)
+        if session is None:
+            return False
+        thread, created = session
+        if created:
+            thread.change_pixmap_signal.connect(getattr(self, f'set_image{port - 1}'))
+            thread.settled.connect(self.on_camera_settled)
+        thread.motion_detector = StabilityDetector.from_settings() if self.auto_capture else None
+        label = self.thread_labels[port - 1]
+        thread.set_preview_size(label.width(), label.height())
+        thread.set_throttle(self.governor.throttle_fps())
+        self.preview_threads[port - 1] = thread
+        self.threads.append(thread)
+        return True
+
+    def running_ports(self):
+        """Ports of the camera threads of the running detection."""
+        return {thread.camera_port for thread in self.threads if thread.running}
+
+    def start_camera_monitor(self):
+        """Refresh the camera map in the background, see interfaces.camera_discovery."""
+        interval = get_settings()['cameras']['refresh_interval']
+        if interval:
+            self.camera_discovery.start_monitor(interval, on_change=self.cameras_changed.emit,
+                                                busy_ports=self.camera_sessions.open_ports)
+
+    @pyqtSlot(dict)
+    def on_cameras_changed(self, devices):
+        print(f'Live cameras: {sorted(devices)}')
+        self._restart_detection()
+
+    def set_auto_capture(self, enabled):
+        """Enable or disable the capture triggered when a laptop has been placed and the scene is still."""
+        self.auto_capture = enabled
+        for thread in self.threads:
+            thread.motion_detector = StabilityDetector.from_settings() if enabled else None
+            thread.set_throttle(thread.throttle_fps)  # a throttled camera reads the frames of the detector
+
+    @pyqtSlot(int, float)
+    def on_camera_settled(self, port, settled_at):
+        # signals queued while the previous capture was running refer to the device already captured
+        if not self.auto_capture or self.capturing or settled_at < self._last_capture_end:
+            return
+        print(f'Auto capture: scene settled on camera {port}')
+        for thread in self.threads:
+            if thread.motion_detector is not None:
+                thread.motion_detector.mark_captured()
+        self.start_inspection()
+
     def capture_images_button_clicked(self):
-        loop = events.new_event_loop()
-        events.set_event_loop(loop)
-        loop.run_until_complete(self.capture_images())
-        loop.close()
+        # the capture button cancels the running inspection
+        if self.capturing:
+            self.cancel_inspection()
+        else:
+            self.start_inspection()
+
+    def start_inspection(self):
+        """
+        Capture a laptop on the background event loop and queue it for detection and reporting, the GUI keeps running
+        meanwhile. Progress is reported by inspection_progress, the end of the capture by inspection_finished and the
+        results by laptop_info once the laptop has been processed.
+        """
+        if self.capturing:
+            return
+        self.capturing = True
+        self._capture_text = self.buttons['capture_button'].text()
+        self.buttons['capture_button'].setText('Cancel')
+        self.inspection = self.async_runner.submit(self.capture_images())
+        self.inspection.add_done_callback(self._inspection_done)
+
+    def cancel_inspection(self):
+        """Cancel the running inspection at its next step, no result is emitted."""
+        if self.inspection is not None:
+            print('Cancelling the inspection')
+            self.inspection.cancel()
+
+    def _inspection_done(self, future):
+        # called in the event loop thread, the signal is queued to the GUI thread
+        if future.cancelled():
+            self.inspection_finished.emit('cancelled')
+        elif future.exception() is not None:
+            print(f'Inspection failed: {future.exception()!r}')
+            self.inspection_finished.emit('failed')
+        else:
+            self.inspection_finished.emit('finished')
+
+    @pyqtSlot(str)
+    def on_inspection_finished(self, status):
+        print(f'Inspection {status}')
+        self.capturing = False
+        self.inspection = None
+        self._last_capture_end = time.monotonic()
+        self.buttons['capture_button'].setText(self._capture_text)
+
+    @pyqtSlot(str, int)
+    def on_inspection_progress(self, stage, percent):
+        print(f'Inspection {percent}%: {stage}')
+
+    def identify_top(self, img, thorough_ocr=True):
+        """
+        Detect the logo, lot and asset numbers on the top image.
+
+        Args:
+            img (numpy.ndarray): Image of camera 1.
+            thorough_ocr (bool): Fall back to the candidate OCR variants when the first variant fails.
 
-    async def detect_images(self, original_imgs: list) -> object:
+        Returns:
+            tuple: (logo, lot, asset, sources) where sources tells how each field was read.
+        """
+        try:
+            logo = detect_logo(img, self.logo_model)
+        except LogoNotFoundException as e:
+            print(f'On port 1 -> {e}')
+            logo = 'Logo_Not_Found'
+
+        # Detect lot number, barcode first and OCR as fallback
+        sources = {}
+        try:
+            lot, asset = detect_lot_asset_barcode(img, self.lot_asset_barcode_model, sources, thorough_ocr)
+        except LotNumberNotFoundException as e:
+            print(f'On port 1 -> {e}')
+            lot = 'Lot_Not_Found'
+            asset = 'Asset_Not_Found'
+        except AssetNumberNotFoundException as e:
+            print(f'On port 1 -> {e}')
+            lot = None
+            asset = 'Asset_Not_Found'
+        return logo, lot, asset, sources
+
+    def identify_serial(self, img, thorough_ocr=True):
+        try:
+            serial = detect_serial(img, self.serial_region_model, self.serial_model, thorough_ocr)
+            print(f'Serial Number: {serial}')
+        except SerialNumberNotFoundException as e:
+            print(f'On port 2 -> {e}')
+            serial = 'Serial_Not_Found'
+        return serial
+
+    async def detect_images(self, original_imgs: list, budget=None, on_surface=None) -> object:
         """
         Performs detection on the captured images.
 
         Args:
             original_imgs (list): List of original images captured by cameras.
+            budget (InspectionBudget): Time budget choosing the option of every stage, defaults to the station budget.
+            on_surface (callable): Called with the camera port, the detected image and the defects of every surface as
+                soon as it is detected, e.g. IncrementalReport.add_surface.
 
         Returns:
             tuple: Detected images, features, and defect lists.
         """
-        loop = asyncio.get_event_loop()
-        logo, lot, serial = '', '', ''
+        loop = asyncio.get_running_loop()
+        deadline = get_settings()['deadline']
+        if budget is None:
+            budget = InspectionBudget(deadline['budget_ms'], get_stage_costs())
         detected_imgs = []
         detected_features = {}
         # detected_img = None
         detected_info = []
         defects_list = []
         models_list = [self.top_bottom_model, self.top_bottom_model, self.keyboard_model, self.screen_model]
+        # stages of the inspection with their options, most thorough first
+        stages = []
         for img, camera_port in original_imgs:
-            # camera_port += 1
             if img is None:
                 continue
-            # cv.imshow(f"image", img)
-            # cv.waitKey()
-            # cv.destroyAllWindows()
-            print(f"detect_images running in thread: {threading.current_thread().name}")
             if camera_port == 1:  # detect logo and lot number
-                logo, lot, asset = None, None, None  # Initialize variables
-                # Detect logo
-                try:
-                    logo = detect_logo(img, self.logo_model)
-                except LogoNotFoundException as e:
-                    print(f'On port {camera_port} -> {e}')
-                    logo = 'Logo_Not_Found'
+                stages.append((f'identification {camera_port}', ['identify_top', 'identify_top/fast'],
+                               img, camera_port))
+            if camera_port == 2:  # detect serial number
+                stages.append((f'identification {camera_port}', ['identify_serial', 'identify_serial/fast'],
+                               img, camera_port))
+            options = [f'segment/{level}' for level in SEGMENT_OPTIONS]
+            if camera_port in deadline['optional_ports']:
+                options.append('skip')
+            stages.append((f'segment {camera_port}', options, img, camera_port))
+
+        stage_ms = {}  # duration of every stage run, e.g. 'segment 3'
+
+        async def run_stage(stage, option, fn, *args):
+            start = time.perf_counter()
+            result = await loop.run_in_executor(self.cpu_executor, budget.run, option, fn, *args)
+            stage_ms[stage] = (time.perf_counter() - start) * 1000
+            return result
+
+        for done, (stage, options, img, camera_port) in enumerate(stages):
+            self.inspection_progress.emit(f'Detecting camera {camera_port}', 10 + 80 * done // len(stages))
+            later = [stage_options for _, stage_options, _, _ in stages[done + 1:]] + [['report']]
+            option = budget.choose(stage, options, later)
+            if option == 'skip':
+                continue
+            thorough = '/' not in option
 
-                # Detect lot number
-                try:
-                    lot, asset = detect_lot_asset_barcode(img, self.lot_asset_barcode_model)
-                except LotNumberNotFoundException as e:
-                    print(f'On port {camera_port} -> {e}')
-                    lot = 'Lot_Not_Found'
-                    asset = 'Asset_Not_Found'
-                except AssetNumberNotFoundException as e:
-                    print(f'On port {camera_port} -> {e}')
-                    asset = 'Asset_Not_Found'
-                
+            if option.startswith('identify_top'):
+                logo, lot, asset, sources = await run_stage(stage, option, self.identify_top, img, thorough)
                 detected_features['logo'], detected_features['lot'], detected_features['asset'] = \
                     logo, lot, asset
+                detected_features['sources'] = sources
                 print(f'Logo: {logo}, Lot Number: {lot}')
+                continue
 
-            if camera_port == 2:  # detect serial number
-                try:
-                    serial = detect_serial(img, self.serial_region_model, self.serial_model)
-                    print(f'Serial Number: {serial}')
-
-                except SerialNumberNotFoundException as e:
-                    print(f'On port {camera_port} -> {e}')
-                    serial = 'Serial_Not_Found'
-
-                finally:
-                    detected_features['serial'] = serial
+            if option.startswith('identify_serial'):
+                detected_features['serial'] = await run_stage(stage, option, self.identify_serial, img, thorough)
+                continue
 
             # if camera_port == 2:
             #     detected_img, defects_counts = detect_keyboard(img, models_list[camera_port])
             # else:
-            detected_img, defects_counts, defects = await loop.run_in_executor(
-                self.executor,
-                lambda: segment_with_sahi(img, 2, models_list[camera_port - 1])
-            ) 
+            segment = SEGMENT_OPTIONS[option.split('/')[1]]
+            detected_img, defects_counts, defects = await run_stage(
+                stage, option, segment_with_sahi, img, segment['num_blocks'], models_list[camera_port - 1],
+                segment['image_size'])
             # segment_with_sahi(img, 2, models_list[camera_port - 1])
             if defects_counts is not None:
                 detected_info.append((defects_counts, camera_port))
             if defects is not None:
                 defects_list.append((defects, camera_port))
             detected_imgs.append((np.copy(detected_img), camera_port))
-
+            if on_surface is not None and defects is not None:
+                on_surface(camera_port, detected_imgs[-1][0], defects)
+
+        detected_features['inspection_mode'] = 'reduced' if budget.reduced else 'full'
+        detected_features['stage_ms'] = stage_ms
+        detected_features['degradations'] = budget.degradations
+        if budget.reduced:
+            print(f'Reduced inspection to meet the {budget.budget_ms:.0f}ms budget: {", ".join(budget.degradations)}')
         detected_features['detected_info'] = detected_info
         return detected_imgs, detected_features, defects_list
 
     async def capture_images(self):
-        original_imgs = []
-
-        # set default logo capture camera as 0
-        for thread, _ in self.threads:
-            # if thread.running and thread.camera_port == 1: # on port 0
-            if thread.running:
-                original_img = thread.capture()  # original image
-                original_imgs.append((np.copy(original_img), thread.camera_port))
+        """
+        Capture coroutine run on the background event loop (see start_inspection): select the frames of every camera
+        and submit them to the inspection queue, waiting while it is full. Without queue, detect and report before
+        returning. Blocking steps run in the I/O pool, cancelling stops at the next step.
+        """
+        loop = asyncio.get_running_loop()
+        self.inspection_progress.emit('Capturing', 0)
+        capture_start = time.perf_counter()
+        # the cameras read at full rate during the capture, even while other laptops are detected
+        with self.governor.capture():
+            running = [thread for thread in self.threads if thread.running]
+            # cameras with a still profile switch to full resolution for a burst, all of them in parallel
+            stills = {thread: thread.request_still() for thread in running if thread.has_still_profile()}
+            # take the sharpest of the frames of every other camera delivered after one common trigger time
+            capture_settings = get_settings()['capture']
+            sync_timeout = capture_settings['sync_timeout']
+            snapshot = await loop.run_in_executor(
+                self.io_executor, functools.partial(
+                    synchronized_snapshot, {thread.camera_port: thread.frame_buffer
+                                            for thread in running if thread not in stills},
+                    timeout=sync_timeout, burst=capture_settings['burst_size']))
+            switch_ms = []
+            for thread, future in stills.items():
+                try:
+                    still = await asyncio.wait_for(asyncio.wrap_future(future), sync_timeout + 2.0)
+                except asyncio.TimeoutError:
+                    still = None
+                if still is None:
+                    snapshot.stale_ports.append(thread.camera_port)
+                else:
+                    snapshot.frames[thread.camera_port] = still
+                    switch_ms.append(thread.last_switch_ms)
+                    if thread.last_burst is not None:
+                        snapshot.bursts[thread.camera_port] = thread.last_burst
+        capture_ms = (time.perf_counter() - capture_start) * 1000
+        burst_stats.record(snapshot.bursts, capture_ms)
+        if switch_ms:
+            print(f'Still capture with profile switch: max {max(switch_ms):.1f}ms')
+        print(f'Capture skew between cameras: {snapshot.skew_ms:.1f}ms, capture {capture_ms:.1f}ms')
+        if snapshot.stale_ports:
+            print(f'No new frame after the trigger on ports {snapshot.stale_ports}')
+        original_imgs = [(np.copy(img), port) for img, port in snapshot.images()]
 
         # self.top_image_path = r'C:\Users\Kun\Desktop\demo\20240919124333_top.jpg'
         # self.bottom_image_path = r'C:\Users\Kun\Desktop\demo\009A9537.JPG'
@@ -288,24 +461,120 @@ class VideoBase(QObject):
              
             One bad thing is that it is not automatic.
         """
-        detected_imgs, detected_features, defects_list = await self.detect_images(
-                [(np.copy(img), port) for img, port in original_imgs]
-            )
+        metadata = {'capture_skew_ms': snapshot.skew_ms, 'capture_ms': capture_ms,
+                    'bursts': {port: {'size': len(scores), 'selected': selected, 'scores': scores}
+                               for port, (selected, scores) in snapshot.bursts.items()}}
+        if switch_ms:
+            metadata['still_switch_ms'] = max(switch_ms)
+        job = InspectionJob(original_imgs, metadata)
+        if not get_settings()['inspection_queue']['enabled']:
+            await self.process_inspection(job)
+            return
+        # backpressure: the capture waits (and can be cancelled) while the queue is full
+        self.inspection_progress.emit(f'Laptop {job.id} captured, waiting for the queue', 10)
+        while not self.inspection_queue.submit(job):
+            await asyncio.sleep(0.05)
+        self.inspection_progress.emit(f'Laptop {job.id} queued', 100)
+
+    def process_job(self, job):
+        """Run the detection and the report of a queued laptop, in an inspection queue worker."""
+        self.async_runner.submit(self.process_inspection(job)).result()
+
+    async def process_inspection(self, job):
+        """
+        Detect, emit laptop_info and render the report in the I/O pool for a captured laptop.
+
+        Args:
+            job (InspectionJob): Frames and capture metadata of the laptop.
+        """
+        budget = InspectionBudget(get_settings()['deadline']['budget_ms'], get_stage_costs())
+        settings = get_settings()['report']
+        report = None
+        if settings['format'] == 'pdf':
+            # every surface is added to the report as soon as it is detected, a partial report is kept until the end
+            partial = os.path.join(_widget_dir, '..', settings['partial_directory'],
+                                   f'{time.strftime("%Y%m%d_%H%M%S")}_laptop_{job.id}.pdf')
+            report = IncrementalReport(partial, self.io_executor, settings['dpi'], settings['jpeg_quality'])
+        with self.governor.inference():
+            detected_imgs, detected_features, defects_list = await self.detect_images(
+                    [(np.copy(img), port) for img, port in job.frames], budget,
+                    on_surface=report.add_surface if report is not None else None
+                )
         # detected_imgs, detected_features, defects_list = self.detect_images([np.copy(imgs), port] for imgs, port in original_imgs)
-        lot = detected_features['lot']
+        detected_features.update(job.metadata)
+        detected_features['job'] = job.id
+        lot = detected_features.get('lot', 'Lot_Not_Found')
 
         # self.save_raw_info(folder_name='original', imgs=original_imgs)
         # # cv_folder = lot + '_cv'
         # self.save_raw_info(folder_name='detected', imgs=detected_imgs)
-        save_to_pdf(detected_imgs, defects_list, lot)
+        # the report is assembled in the background, the results are shown and the next laptop detected meanwhile
+        notes = [f'Reduced inspection: {", ".join(budget.degradations)}'] if budget.reduced else None
+        # linked to the laptop in the inspection store when the operator saves it, see PanelBase.save_to_dataset
+        detected_features['files'] = self.laptop_files(lot, detected_imgs, defects_list, html=report is None)
+        detected_features['defect_boxes'] = [(SURFACES.get(port, f'camera{port}'), d.cls, [int(v) for v in d.xyxy])
+                                             for defects, port in defects_list for d in defects]
+        if report is None:
+            done = self.io_executor.submit(budget.run, 'report', self.save_html_report, detected_imgs, defects_list,
+                                           lot, detected_features, notes)
+        else:
+            done = report.finish(report_path(lot), notes)
+        done.add_done_callback(functools.partial(self._report_done, job.id, report, budget.costs))
+        # one record per laptop for the daily report, see interfaces.daily_report
+        self.io_executor.submit(get_inspection_log().append, inspection_record(detected_features, defects_list))
         self.laptop_info.emit(detected_features)
+        self.inspection_progress.emit(f'Laptop {job.id}: done', 100)
+        print(f'Identification paths:\n{identification_stats.report()}')
+        print(get_ocr_cache().report())
+        print(burst_stats.report())
+        print(executors_report())
+
+    @staticmethod
+    def _report_done(job_id, report, costs, future):
+        if future.exception() is not None:
+            partial = f', partial report: {report.partial_path}' if report is not None else ''
+            print(f'Report of laptop {job_id} failed: {future.exception()!r}{partial}')
+            return
+        if report is not None:  # the html reports are measured by InspectionBudget.run
+            costs.record('report', report.assemble_ms)
+        print(f'Report has saved to {future.result()}')
+
+    def laptop_files(self, name, detected_imgs, defects_list, html=False):
+        """
+        Files of the report of a laptop.
+
+        Returns:
+            list[tuple]: (surface, path) of the report ('report' surface, the PDF or the JSON record of the HTML
+            report) and of the surface images of the HTML report.
+        """
+        name = name.strip('\n')
+        if not html:
+            return [('report', os.path.abspath(report_path(name)))]
+        directory = os.path.join(self.image_saver.save_directory, get_settings()['report']['html_folder'])
+        ports = {port for _, port in detected_imgs}
+        return [('report', os.path.join(directory, f'{name}.json'))] + \
+            [(SURFACES.get(port, f'camera{port}'), os.path.join(directory, ImageSaver.surface_file_name(name, port)))
+             for _, port in defects_list if port in ports]
+
+    def save_html_report(self, detected_imgs, defects_list, name, features=None, notes=None):
+        """
+        Save the report images once and write the JSON record and the HTML page of a laptop, see interfaces.report.
+
+        Returns:
+            str: Path of the JSON record.
+        """
+        settings = get_settings()['report']
+        name = name.strip('\n')
+        surfaces = self.image_saver.save_report_images(settings['html_folder'], name, detected_imgs, defects_list,
+                                                       settings['image_width'], settings['jpeg_quality'])
+        return write_html_report(os.path.join(self.image_saver.save_directory, settings['html_folder']), name,
+                                 surfaces, features, notes)
 
     def stop_detection(self):
-        for thread, qThread in self.threads:
-            thread.stop()
-            qThread.quit()
-            qThread.wait()
+        self.detecting = False
+        self.camera_sessions.park_all()
         self.threads = []
+        self.preview_threads = {}
         for label in self.thread_labels:
             label.clear()
 
@@ -317,39 +586,53 @@ class VideoBase(QObject):
         """save original images"""
         self.image_saver.save_raw_imgs(folder_name=folder_name, imgs=imgs)
 
+    def show_preview(self, idx, image):
+        """
+        Draw a preview frame on its label. Frames are already downscaled by the camera thread, the thread is then
+        told the frame was consumed so that it can emit the next one.
+
+        Args:
+            idx (int): Index of the label.
+            image (QImage): Preview frame.
+        """
+        label = self.thread_labels[idx]
+        label.setPixmap(QPixmap.fromImage(image))
+        thread = self.preview_threads.get(idx)
+        if thread is not None:
+            thread.frame_consumed(label.width(), label.height())
+
     @pyqtSlot(QImage)
     def set_image0(self, image):
         """Update thread labels based on the returned frame from thread.run()"""
-        self.thread_labels[0].setPixmap(QPixmap.fromImage(image)
-                                        .scaled(self.thread_labels[0].size(), Qt.KeepAspectRatio))
+        self.show_preview(0, image)
 
     @pyqtSlot(QImage)
     def set_image1(self, image):
-        self.thread_labels[1].setPixmap(QPixmap.fromImage(image)
-                                        .scaled(self.thread_labels[1].size(), Qt.KeepAspectRatio))
+        self.show_preview(1, image)
 
     @pyqtSlot(QImage)
     def set_image2(self, image):
-        self.thread_labels[2].setPixmap(QPixmap.fromImage(image)
-                                        .scaled(self.thread_labels[2].size(), Qt.KeepAspectRatio))
+        self.show_preview(2, image)
 
     @pyqtSlot(QImage)
     def set_image3(self, image):
-        self.thread_labels[3].setPixmap(QPixmap.fromImage(image)
-                                        .scaled(self.thread_labels[3].size(), Qt.KeepAspectRatio))
+        self.show_preview(3, image)
 
     @pyqtSlot(QImage)
     def set_image4(self, image):
-        self.thread_labels[4].setPixmap(QPixmap.fromImage(image)
-                                        .scaled(self.thread_labels[4].size(), Qt.KeepAspectRatio))
+        self.show_preview(4, image)
 
     @pyqtSlot(QImage)
     def set_image5(self, image):
-        self.thread_labels[5].setPixmap(QPixmap.fromImage(image)
-                                        .scaled(self.thread_labels[5].size(), Qt.KeepAspectRatio))
+        self.show_preview(5, image)
 
-    def closeEvent(self, event):
+    def release_cameras(self):
+        """Stop the detection and release every camera device."""
         self.stop_detection()
+        self.camera_sessions.release_all()
+
+    def closeEvent(self, event):
+        self.release_cameras()
 
 # ----------------------------------- test ----------------------------------------------------------------- #  
     def display_image_on_label(self, image_path, label):
@@ -396,24 +679,6 @@ class VideoBase(QObject):
         # # if self.screen_image_path:
         #     self.display_image_on_label(self.screen_image_path, self.thread_labels[3])
         
-    def capture_selected_images(self):
-        logo, lot, serial = '', '', ''
-        detected_imgs = []
-        detected_features = {}
-        detected_features['defects'] = []
-        original_imgs = []
-        models_list = [self.top_bottom_model, self.top_bottom_model, self.keyboard_model, self.screen_model]
-        for i, img in enumerate(self.imgs):
-            original_imgs.append((img, i + 1))
-            
-        detected_imgs, detected_features, defects_list= self.detect_images([np.copy(imgs), port] for imgs, port in original_imgs)
-        lot = detected_features['lot']
-
-        # self.save_raw_info(folder_name='original', imgs=original_imgs)
-        # # cv_folder = lot + '_cv'
-        # self.save_raw_info(folder_name='detected', imgs=detected_imgs)
-        save_to_pdf(detected_imgs, defects_list, lot)
-        self.laptop_info.emit(detected_features)
 
 
 if __name__ == '__main__':